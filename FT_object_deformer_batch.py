@@ -0,0 +1,314 @@
+"""複数シーンに同じ接続レシピを適用するバッチランナー。
+
+シーンの一覧を mayapy のワーカープロセスに分配し、各ワーカーがシーンを
+開いて接続レシピを適用・保存する。シーンごとの結果 (処理時間、作成・
+失敗したペア) を JSON で集計する。
+
+    python FT_object_deformer_batch.py --recipe recipe.json \\
+        --workers 8 --output results.json shot010.ma shot020.ma
+
+シーン一覧は引数に直接並べるか、@scenes.txt のように1行1シーンの
+テキストファイルで指定する。ランナー側は Maya を必要としない。
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+
+# ワーカーが結果行の先頭に付ける目印 (Maya のログと区別するため)
+RESULT_PREFIX = 'FT_CONNECT_DEFORMER_RESULT '
+
+# 1つのワーカープロセスに渡す最大シーン数の既定値
+DEFAULT_SCENES_PER_WORKER = 8
+
+
+def default_worker_command(mayapy=None):
+    """既定のワーカーコマンドを返す。
+
+    Args:
+        mayapy (str, optional): mayapy のパス。省略時は環境変数 MAYAPY、
+            それもなければ PATH 上の mayapy。
+
+    Returns:
+        list: コマンドライン
+    """
+    mayapy = mayapy or os.environ.get('MAYAPY', 'mayapy')
+    return [mayapy, os.path.abspath(__file__), '--worker']
+
+
+def split_batches(scenes, workers, scenes_per_worker=DEFAULT_SCENES_PER_WORKER):
+    """シーンをワーカープロセスごとのバッチに分割する。
+
+    mayapy の起動コストを抑えつつ負荷を均等にするため、バッチの大きさは
+    ワーカー数で均等割りした数と scenes_per_worker の小さい方にする。
+
+    Args:
+        scenes (list): シーンファイルのリスト
+        workers (int): 同時に実行するワーカー数
+        scenes_per_worker (int, optional): 1プロセスで処理する最大シーン数
+
+    Returns:
+        list: シーンのリストのリスト
+    """
+    if not scenes:
+        return []
+    workers = max(1, workers)
+    per_batch = -(-len(scenes) // workers)
+    per_batch = max(1, min(per_batch, scenes_per_worker))
+    return [scenes[i:i + per_batch] for i in range(0, len(scenes), per_batch)]
+
+
+def run_worker_batch(command, recipe, scenes, save=True, timeout=None):
+    """ワーカープロセスを1つ起動し、シーンのバッチを処理させる。
+
+    タイムアウトした場合も、それまでにワーカーが書き出した結果行は
+    そのまま使い、結果のないシーンだけをタイムアウトとして扱う。
+
+    Args:
+        command (list): ワーカーコマンド (シーンなどの引数は後ろに追加される)
+        recipe (str): レシピファイルのパス
+        scenes (list): 処理するシーンファイル
+        save (bool, optional): 適用後にシーンを保存するかどうか
+        timeout (float, optional): プロセスのタイムアウト秒数
+
+    Returns:
+        list: シーンごとの結果の辞書のリスト
+    """
+    args = list(command) + ['--recipe', recipe]
+    if not save:
+        args.append('--no-save')
+    args.extend(scenes)
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(
+            args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            timeout=timeout, universal_newlines=True)
+    except OSError as e:
+        return [_failed_result(scene, f"ワーカーの実行に失敗しました: {e}")
+                for scene in scenes]
+    except subprocess.TimeoutExpired as e:
+        results = parse_results(e.stdout)
+        elapsed = time.perf_counter() - start
+        return [
+            results.get(scene) or _failed_result(
+                scene, f"ワーカーが {timeout} 秒でタイムアウトしました", elapsed)
+            for scene in scenes
+        ]
+
+    results = parse_results(process.stdout)
+
+    # 結果を返さなかったシーン (ワーカーの異常終了など) は失敗として扱う
+    elapsed = time.perf_counter() - start
+    message = (process.stderr.strip().splitlines() or [''])[-1]
+    return [
+        results.get(scene) or _failed_result(
+            scene,
+            f"ワーカーが結果を返しませんでした "
+            f"(終了コード {process.returncode}): {message}",
+            elapsed)
+        for scene in scenes
+    ]
+
+
+def parse_results(output):
+    """ワーカーの標準出力から結果行を読み取る。
+
+    タイムアウトで途中までしか読めなかった出力 (TimeoutExpired.stdout は
+    テキストモードでもバイト列になる) も受け付け、書きかけの行は無視する。
+
+    Args:
+        output (str or bytes): ワーカーの標準出力。None の場合は空とみなす。
+
+    Returns:
+        dict: シーンファイルから結果の辞書への辞書
+    """
+    if isinstance(output, bytes):
+        output = output.decode('utf-8', errors='replace')
+    results = {}
+    for line in (output or '').splitlines():
+        if not line.startswith(RESULT_PREFIX):
+            continue
+        try:
+            result = json.loads(line[len(RESULT_PREFIX):])
+        except ValueError:
+            continue
+        results[result['scene']] = result
+    return results
+
+
+def _failed_result(scene, error, seconds=0.0):
+    """失敗したシーンの結果を作成する。"""
+    return {
+        'scene': scene,
+        'ok': False,
+        'seconds': seconds,
+        'created': 0,
+        'present': 0,
+        'failed': [],
+        'rejected': [],
+        'error': error
+    }
+
+
+def run_batch(scenes, recipe, workers=None, command=None, save=True,
+              scenes_per_worker=DEFAULT_SCENES_PER_WORKER, timeout=None):
+    """シーンの一覧をワーカープロセスのプールで処理する。
+
+    Args:
+        scenes (list): シーンファイルのリスト
+        recipe (str): レシピファイルのパス
+        workers (int, optional): 同時に実行するワーカー数。省略時は CPU コア数。
+        command (list, optional): ワーカーコマンド。省略時は mayapy。
+        save (bool, optional): 適用後にシーンを保存するかどうか
+        scenes_per_worker (int, optional): 1プロセスで処理する最大シーン数
+        timeout (float, optional): ワーカープロセスごとのタイムアウト秒数
+
+    Returns:
+        list: シーンごとの結果の辞書のリスト (入力と同じ順序)
+    """
+    workers = workers or os.cpu_count() or 1
+    command = command or default_worker_command()
+    recipe = os.path.abspath(recipe)
+    batches = split_batches(scenes, workers, scenes_per_worker)
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_worker_batch, command, recipe, batch, save, timeout)
+            for batch in batches
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            for result in future.result():
+                results[result['scene']] = result
+                status = "OK" if result['ok'] else "NG"
+                print(f"[{status}] {result['scene']} "
+                      f"({result['seconds']:.1f}秒, 作成 {result['created']}, "
+                      f"失敗 {len(result['failed'])})")
+    return [results[scene] for scene in scenes]
+
+
+def process_scene(scene, recipe, save=True):
+    """mayapy 内で1つのシーンを開き、レシピを適用して保存する。
+
+    Args:
+        scene (str): シーンファイルのパス
+        recipe (dict): load_recipe で読み込んだレシピ
+        save (bool, optional): 適用後にシーンを保存するかどうか
+
+    Returns:
+        dict: シーンの結果
+    """
+    import maya.cmds as cmds
+    import FT_object_deformer_core as core
+
+    start = time.perf_counter()
+    try:
+        cmds.file(scene, open=True, force=True)
+        # 名前はシーンを1回走査して作った索引で解決する
+        result = core.apply_recipe(recipe, fast=True)
+        if save:
+            cmds.file(save=True, force=True)
+    except Exception as e:
+        return _failed_result(scene, str(e), time.perf_counter() - start)
+    return {
+        'scene': scene,
+        'ok': True,
+        'seconds': time.perf_counter() - start,
+        'created': result['created'],
+        'present': result['present'],
+        'failed': [
+            [deformer, str(obj), str(error)]
+            for deformer, obj, error in result['failed']
+        ],
+        'rejected': [
+            [deformer, str(obj), reason]
+            for deformer, obj, reason in result['rejected']
+        ],
+        'error': None
+    }
+
+
+def worker_main(recipe_path, scenes, save=True):
+    """ワーカープロセスの処理。シーンごとに結果行を標準出力に書き出す。"""
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    try:
+        # レシピの読み込みはコアモジュールに任せる
+        import FT_object_deformer_core as core
+        recipe = core.load_recipe(recipe_path)
+        for scene in scenes:
+            result = process_scene(scene, recipe, save)
+            sys.stdout.write(RESULT_PREFIX + json.dumps(result) + '\n')
+            sys.stdout.flush()
+    finally:
+        maya.standalone.uninitialize()
+
+
+def read_scene_list(arguments):
+    """引数からシーンの一覧を作る。@file は1行1シーンのリストとして展開する。"""
+    scenes = []
+    for argument in arguments:
+        if argument.startswith('@'):
+            with open(argument[1:], encoding='utf-8') as f:
+                scenes.extend(line.strip() for line in f if line.strip())
+        else:
+            scenes.append(argument)
+    return scenes
+
+
+def main(argv=None):
+    """コマンドラインのエントリーポイント。"""
+    parser = argparse.ArgumentParser(
+        description="複数のシーンに FT Connect Deformer のレシピを適用する")
+    parser.add_argument('scenes', nargs='+',
+                        help="シーンファイル、または @一覧ファイル")
+    parser.add_argument('--recipe', required=True, help="接続レシピ (JSON)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="同時に実行するワーカー数 (既定: CPU コア数)")
+    parser.add_argument('--mayapy', default=None, help="mayapy のパス")
+    parser.add_argument('--worker-command', default=None,
+                        help="mayapy の代わりに使うワーカーコマンド")
+    parser.add_argument('--scenes-per-worker', type=int,
+                        default=DEFAULT_SCENES_PER_WORKER,
+                        help="1つのワーカープロセスで処理する最大シーン数")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="ワーカープロセスごとのタイムアウト秒数")
+    parser.add_argument('--no-save', action='store_true',
+                        help="適用後にシーンを保存しない")
+    parser.add_argument('--output', default=None,
+                        help="結果を書き出す JSON ファイル")
+    parser.add_argument('--worker', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    scenes = read_scene_list(args.scenes)
+    if args.worker:
+        worker_main(args.recipe, scenes, save=not args.no_save)
+        return 0
+
+    if args.worker_command:
+        command = shlex.split(args.worker_command)
+    else:
+        command = default_worker_command(args.mayapy)
+    start = time.perf_counter()
+    results = run_batch(
+        scenes, args.recipe, workers=args.workers, command=command,
+        save=not args.no_save, scenes_per_worker=args.scenes_per_worker,
+        timeout=args.timeout)
+    failed_scenes = [result for result in results if not result['ok']]
+    print(f"{len(results)}シーン中 {len(failed_scenes)}シーン失敗 "
+          f"({time.perf_counter() - start:.1f}秒)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if failed_scenes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,783 @@
+"""FT Connect Deformer のベンチマーク。
+
+maya.cmds をメモリ上の擬似シーン (FakeCmds) に差し替え、Maya のライセンス
+なしでオブジェクト数・デフォーマー数・選択数に対する処理のスケーリングを
+計測する。計測値は処理時間、コマンドの呼び出し回数、ピークメモリ。
+
+    python FT_object_deformer_bench.py
+    python FT_object_deformer_bench.py --objects 100,1000 --deformers 1,10
+    python FT_object_deformer_bench.py --save-baseline bench_baseline.json
+    python FT_object_deformer_bench.py --baseline bench_baseline.json
+
+コマンドの呼び出し回数は環境に依存しないため、既定ではベースラインとの
+比較は呼び出し回数だけで行う (--check-time で処理時間も比較する)。
+OpenMaya を使う処理 (classify_selection_list など) は、同じ擬似シーンを
+参照する FakeOpenMaya に core.om を差し替えて計測する。FakeOpenMaya は
+選択の判定に必要なクラスだけを実装し、API の呼び出しも "om." 付きの
+名前で呼び出し回数に含める。
+"""
+import argparse
+import collections
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+
+def _install_maya_stubs():
+    """Maya がない環境でコアモジュールを読み込めるように空のモジュールを登録する。"""
+    try:
+        importlib.import_module('maya.cmds')
+        importlib.import_module('maya.api.OpenMaya')
+    except ImportError:
+        for name in ('maya', 'maya.cmds', 'maya.utils', 'maya.api',
+                     'maya.api.OpenMaya'):
+            sys.modules.setdefault(name, types.ModuleType(name))
+        sys.modules['maya'].cmds = sys.modules['maya.cmds']
+        sys.modules['maya'].utils = sys.modules['maya.utils']
+        sys.modules['maya'].api = sys.modules['maya.api']
+        sys.modules['maya.api'].OpenMaya = sys.modules['maya.api.OpenMaya']
+
+
+_install_maya_stubs()
+import FT_object_deformer_core as core  # noqa: E402
+
+
+# 既定のベースラインファイル
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'FT_object_deformer_bench_baseline.json')
+
+# ノードタイプの継承 (自身を含む、基底から順に)
+_DEFORMER_BASE = ['containerBase', 'entity', 'geometryFilter']
+TYPE_INHERITANCE = {
+    'transform': ['containerBase', 'entity', 'dagNode', 'transform'],
+    'mesh': ['containerBase', 'entity', 'dagNode', 'shape', 'geometryShape',
+             'deformableShape', 'controlPoint', 'surfaceShape', 'mesh'],
+    'nurbsCurve': ['containerBase', 'entity', 'dagNode', 'shape',
+                   'geometryShape', 'deformableShape', 'controlPoint',
+                   'curveShape', 'nurbsCurve'],
+    'bezierCurve': ['containerBase', 'entity', 'dagNode', 'shape',
+                    'geometryShape', 'deformableShape', 'controlPoint',
+                    'curveShape', 'nurbsCurve', 'bezierCurve'],
+    'clusterHandle': ['containerBase', 'entity', 'dagNode', 'shape',
+                      'clusterHandle'],
+    'cluster': _DEFORMER_BASE + ['weightGeometryFilter', 'cluster'],
+    'nonLinear': _DEFORMER_BASE + ['weightGeometryFilter', 'nonLinear'],
+    'skinCluster': _DEFORMER_BASE + ['skinCluster'],
+    'deltaMush': _DEFORMER_BASE + ['deltaMush'],
+    'network': ['network'],
+    'objectSet': ['entity', 'objectSet'],
+}
+
+# デフォーマーに接続できるシェイプのタイプ
+_DEFORMABLE = ('mesh', 'nurbsCurve')
+
+
+class FakeNode(object):
+    """擬似シーンのノード。"""
+
+    __slots__ = ('name', 'type', 'parent', 'children', 'connections',
+                 'intermediate', 'visible', 'members')
+
+    def __init__(self, name, node_type, parent=None):
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.connections = set()
+        self.intermediate = False
+        self.visible = True
+        self.members = [] if node_type in TYPE_INHERITANCE and \
+            'geometryFilter' in TYPE_INHERITANCE[node_type] else None
+
+    @property
+    def path(self):
+        """DAG ノードのフルパス。DG ノードは名前をそのまま返す。"""
+        if not self.is_dag:
+            return self.name
+        parts = []
+        node = self
+        while node is not None:
+            parts.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(parts))
+
+    @property
+    def is_dag(self):
+        return 'dagNode' in TYPE_INHERITANCE.get(self.type, ())
+
+
+class FakeCmds(object):
+    """maya.cmds の代わりに使う擬似コマンド群。
+
+    コアモジュールが使うコマンドとフラグだけを実装する。ノード名は
+    短い名前で一意である前提で、フルパスでも参照できる。各コマンドの
+    呼び出し回数を calls に記録し、latency 秒の遅延を加える。
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.nodes = {}
+        self.selection = []
+        self.set_members = collections.defaultdict(set)
+        self.calls = {}
+        self._undo_state = True
+        # 閉じたアンドゥチャンク名 (シーンは元に戻さず、名前だけを記録する)。
+        # Maya と同じく、編集コマンドを含まないチャンクは記録しない
+        self.undo_queue = []
+        self._open_chunks = []
+        self._edited = False
+
+    # --- シーン構築 ---
+
+    def create(self, name, node_type, parent=None):
+        """ノードを作成する。"""
+        parent_node = self.nodes[parent] if parent else None
+        node = FakeNode(name, node_type, parent_node)
+        if parent_node is not None:
+            parent_node.children.append(node)
+        self.nodes[name] = node
+        return node
+
+    def connect(self, src, dst):
+        """ノード同士を接続する。"""
+        self.nodes[src].connections.add(dst)
+        self.nodes[dst].connections.add(src)
+
+    def reset_calls(self):
+        """呼び出し回数をリセットする。"""
+        self.calls = {}
+
+    # --- 内部処理 ---
+
+    def _call(self, command):
+        self.calls[command] = self.calls.get(command, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _node(self, name):
+        # "node.attr" や "node.vtx[0:9]" はノード部分で引く
+        node = self.nodes.get(name.rsplit('|', 1)[-1].split('.', 1)[0])
+        if node is None:
+            raise RuntimeError(f"No object matches name: {name}")
+        return node
+
+    @staticmethod
+    def _names(args):
+        names = []
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                names.extend(arg)
+            else:
+                names.append(arg)
+        return names
+
+    @staticmethod
+    def _types(value):
+        if value is None:
+            return None
+        return [value] if isinstance(value, str) else list(value)
+
+    @staticmethod
+    def _is_a(node, types_):
+        inheritance = TYPE_INHERITANCE.get(node.type, [node.type])
+        return any(t in inheritance for t in types_)
+
+    # --- maya.cmds 互換コマンド ---
+
+    def ls(self, *args, **kwargs):
+        self._call('ls')
+        if kwargs.get('selection'):
+            names = list(self.selection)
+        elif args:
+            names = self._names(args)
+        else:
+            names = list(self.nodes)
+        nodes = {}
+        for name in names:
+            node = self.nodes.get(name.rsplit('|', 1)[-1])
+            if node is not None:
+                nodes[node.name] = node
+        nodes = list(nodes.values())
+        types_ = self._types(kwargs.get('type'))
+        if types_:
+            nodes = [node for node in nodes if self._is_a(node, types_)]
+        if kwargs.get('noIntermediate'):
+            nodes = [node for node in nodes if not node.intermediate]
+        if kwargs.get('visible'):
+            nodes = [node for node in nodes if node.visible]
+        if kwargs.get('long'):
+            names = [node.path for node in nodes]
+        else:
+            names = [node.name for node in nodes]
+        if kwargs.get('showType'):
+            return [value for name, node in zip(names, nodes)
+                    for value in (name, node.type)]
+        return names
+
+    def nodeType(self, name, isTypeName=False, inherited=False):
+        self._call('nodeType')
+        if isTypeName:
+            if name not in TYPE_INHERITANCE:
+                raise RuntimeError(f"Unknown node type: {name}")
+            return list(TYPE_INHERITANCE[name]) if inherited else name
+        node = self._node(name)
+        if inherited:
+            return list(TYPE_INHERITANCE.get(node.type, [node.type]))
+        return node.type
+
+    def objectType(self, name, isAType=None):
+        self._call('objectType')
+        node = self._node(name)
+        if isAType is not None:
+            return self._is_a(node, [isAType])
+        return node.type
+
+    def listConnections(self, name, type=None, **kwargs):
+        self._call('listConnections')
+        node = self._node(name)
+        connected = [self.nodes[n] for n in sorted(node.connections)]
+        if type:
+            connected = [n for n in connected if self._is_a(n, [type])]
+        return [n.name for n in connected] or None
+
+    def listRelatives(self, *args, **kwargs):
+        self._call('listRelatives')
+        nodes = [self._node(name) for name in self._names(args)]
+        if kwargs.get('parent'):
+            related = [n.parent for n in nodes if n.parent is not None]
+        elif kwargs.get('allDescendents'):
+            related = []
+            stack = list(nodes)
+            while stack:
+                node = stack.pop()
+                related.extend(node.children)
+                stack.extend(node.children)
+        else:
+            related = [child for n in nodes for child in n.children]
+        if kwargs.get('shapes'):
+            related = [n for n in related if self._is_a(n, ['shape'])]
+        if kwargs.get('noIntermediate'):
+            related = [n for n in related if not n.intermediate]
+        types_ = self._types(kwargs.get('type'))
+        if types_:
+            related = [n for n in related if self._is_a(n, types_)]
+        related = list(dict.fromkeys(related))
+        if kwargs.get('fullPath'):
+            return [n.path for n in related] or None
+        return [n.name for n in related] or None
+
+    def deformer(self, name, edit=False, query=False, geometry=None,
+                 remove=False, **kwargs):
+        self._call('deformer')
+        node = self._node(name)
+        if node.members is None:
+            raise RuntimeError(f"'{name}' is not a deformer.")
+        if query:
+            return [shape.name for shape in node.members] or None
+        self._edited = True
+        if remove:
+            for target in self._names([geometry]):
+                target_node = self._node(target)
+                shapes = [target_node] + target_node.children
+                shapes = [shape for shape in shapes if shape in node.members]
+                if not shapes:
+                    raise RuntimeError(
+                        f"'{target}' is not a member of '{name}'.")
+                for shape in shapes:
+                    node.members.remove(shape)
+            return
+        shapes = []
+        for target in self._names([geometry]):
+            target_node = self._node(target)
+            if self._is_a(target_node, _DEFORMABLE):
+                candidates = [target_node]
+            else:
+                candidates = [
+                    c for c in target_node.children
+                    if self._is_a(c, _DEFORMABLE) and not c.intermediate]
+            if not candidates:
+                raise RuntimeError(f"'{target}' has no deformable geometry.")
+            for shape in candidates:
+                if shape in node.members:
+                    raise RuntimeError(
+                        f"'{target}' is already a member of '{name}'.")
+            shapes.extend(candidates)
+        node.members.extend(shapes)
+
+    def sets(self, items, add=None, remove=None, query=False, **kwargs):
+        self._call('sets')
+        if query:
+            return sorted(self.set_members[self._node(items).name])
+        self._edited = True
+        set_node = self._node(add or remove)
+        deformers = [self.nodes[n] for n in set_node.connections
+                     if self.nodes[n].members is not None]
+        for item in self._names([items]):
+            target = self._node(item)
+            shapes = [target] if self._is_a(target, _DEFORMABLE) else [
+                c for c in target.children
+                if self._is_a(c, _DEFORMABLE) and not c.intermediate]
+            if not shapes:
+                raise RuntimeError(f"'{item}' has no deformable geometry.")
+            if remove:
+                self.set_members[set_node.name].discard(item)
+                continue
+            self.set_members[set_node.name].add(item)
+            # デフォーマーセットへの追加はジオメトリも接続する
+            for deformer in deformers:
+                deformer.members.extend(
+                    shape for shape in shapes if shape not in deformer.members)
+
+    def undoInfo(self, query=False, state=None, openChunk=False,
+                 closeChunk=False, chunkName='', undoName=False, **kwargs):
+        self._call('undoInfo')
+        if query:
+            if undoName:
+                return self.undo_queue[-1] if self.undo_queue else ''
+            return self._undo_state
+        if openChunk:
+            if not self._open_chunks:
+                self._edited = False
+            self._open_chunks.append(chunkName)
+        elif closeChunk:
+            name = self._open_chunks.pop()
+            if not self._open_chunks and self._edited:
+                self.undo_queue.append(name)
+
+    def about(self, batch=False, **kwargs):
+        self._call('about')
+        return True
+
+    def evaluationManager(self, query=False, mode=None, **kwargs):
+        self._call('evaluationManager')
+        if query:
+            return ['parallel']
+
+    def refresh(self, **kwargs):
+        self._call('refresh')
+
+    def undo(self):
+        self._call('undo')
+        if self.undo_queue:
+            self.undo_queue.pop()
+
+
+class FakeMObject(object):
+    """MObject の代わり。擬似シーンのノードを指す。"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def __eq__(self, other):
+        return isinstance(other, FakeMObject) and other.node is self.node
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return id(self.node)
+
+    def hasFn(self, fn):
+        # MFn の定数にはノードタイプ名を使う
+        return FakeCmds._is_a(self.node, [fn])
+
+
+class FakePlug(object):
+    """MPlug の代わり。ノード単位の接続を1つのプラグとして扱う。"""
+
+    __slots__ = ('om', 'owner', 'peer', 'isElement')
+
+    def __init__(self, om, owner, peer):
+        self.om = om
+        self.owner = owner
+        self.peer = peer
+        self.isElement = False
+
+    def node(self):
+        return FakeMObject(self.owner)
+
+    def attribute(self):
+        # ハンドル (DAG ノード) からデフォーマーへの接続は matrix、
+        # それ以外は message とみなす
+        if FakeCmds._is_a(self.owner, ['geometryFilter']) and \
+                self.peer.is_dag:
+            return 'matrix'
+        return 'message'
+
+    def connectedTo(self, asDst, asSrc):
+        self.om.cmds._call('om.MPlug.connectedTo')
+        if not asSrc:
+            return []
+        return [FakePlug(self.om, self.peer, self.owner)]
+
+
+class FakeOpenMaya(object):
+    """maya.api.OpenMaya の代わりに使う擬似 API。
+
+    classify_selection_list と classify_nodes が使うクラスとメソッドだけを
+    FakeCmds の擬似シーンの上に実装する。呼び出し回数は FakeCmds の
+    calls に記録する。
+    """
+
+    class MFn(object):
+        kGeometryFilt = 'geometryFilter'
+        kDagNode = 'dagNode'
+        kTransform = 'transform'
+
+    def __init__(self, cmds):
+        self.cmds = cmds
+        om = self
+
+        class MSelectionList(object):
+            def __init__(self):
+                self._nodes = []
+
+            def add(self, name):
+                cmds._call('om.MSelectionList.add')
+                node = cmds._node(name)
+                # Maya と同じく、同じノードは1つにまとめる
+                if node not in self._nodes:
+                    self._nodes.append(node)
+
+            def clear(self):
+                self._nodes = []
+
+            def length(self):
+                return len(self._nodes)
+
+            def getDependNode(self, index):
+                return FakeMObject(self._nodes[index])
+
+        class MGlobal(object):
+            @staticmethod
+            def getActiveSelectionList():
+                cmds._call('om.MGlobal.getActiveSelectionList')
+                selection = MSelectionList()
+                selection._nodes = list(dict.fromkeys(
+                    cmds._node(name) for name in cmds.selection))
+                return selection
+
+        class MObjectHandle(object):
+            def __init__(self, obj):
+                self.obj = obj
+
+            def hashCode(self):
+                return hash(self.obj)
+
+        class MFnDependencyNode(object):
+            def __init__(self, obj):
+                self.node = obj.node
+
+            def name(self):
+                return self.node.name
+
+            @property
+            def typeName(self):
+                return self.node.type
+
+            def getConnections(self):
+                cmds._call('om.MFnDependencyNode.getConnections')
+                return [FakePlug(om, self.node, cmds.nodes[name])
+                        for name in sorted(self.node.connections)]
+
+        class MFnDagNode(MFnDependencyNode):
+            def childCount(self):
+                return len(self.node.children)
+
+            def child(self, index):
+                return FakeMObject(self.node.children[index])
+
+            def partialPathName(self):
+                return self.node.name
+
+        class MFnAttribute(object):
+            def __init__(self, attribute):
+                self.name = attribute
+
+        self.MSelectionList = MSelectionList
+        self.MGlobal = MGlobal
+        self.MObjectHandle = MObjectHandle
+        self.MFnDependencyNode = MFnDependencyNode
+        self.MFnDagNode = MFnDagNode
+        self.MFnAttribute = MFnAttribute
+
+
+def build_scene(cmds, objects, deformers):
+    """ベンチマーク用の擬似シーンを構築する。
+
+    |rig 以下に objects 個のメッシュと、deformers 個のクラスター
+    (ハンドル付き) を作成する。
+
+    Args:
+        cmds (FakeCmds): 構築先
+        objects (int): メッシュの数
+        deformers (int): クラスターの数
+
+    Returns:
+        tuple: (オブジェクト名のリスト, デフォーマー名のリスト, ハンドル名のリスト)
+    """
+    cmds.create('rig', 'transform')
+    object_names = []
+    for i in range(objects):
+        name = f"geo_{i}"
+        cmds.create(name, 'transform', 'rig')
+        cmds.create(f"{name}Shape", 'mesh', name)
+        orig = cmds.create(f"{name}ShapeOrig", 'mesh', name)
+        orig.intermediate = True
+        object_names.append(name)
+    deformer_names = []
+    handle_names = []
+    for i in range(deformers):
+        name = f"cluster_{i}"
+        handle = f"{name}Handle"
+        cmds.create(name, 'cluster')
+        cmds.create(handle, 'transform')
+        cmds.create(f"{handle}Shape", 'clusterHandle', handle)
+        cmds.connect(handle, name)
+        cmds.create(f"{name}Set", 'objectSet')
+        cmds.connect(name, f"{name}Set")
+        deformer_names.append(name)
+        handle_names.append(handle)
+    return object_names, deformer_names, handle_names
+
+
+def measure(cmds, func):
+    """関数を実行し、処理時間・呼び出し回数・ピークメモリを計測する。
+
+    Returns:
+        dict: seconds, calls, calls_by_command, peak_kb
+    """
+    cmds.reset_calls()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+    finally:
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        'seconds': seconds,
+        'calls': sum(cmds.calls.values()),
+        'calls_by_command': dict(sorted(cmds.calls.items())),
+        'peak_kb': peak / 1024.0
+    }
+
+
+def run_case(objects, deformers, selection, latency=0.0):
+    """1つの組み合わせについて各処理を計測する。
+
+    Args:
+        objects (int): メッシュの数
+        deformers (int): デフォーマーの数
+        selection (int): 選択するノード数
+        latency (float, optional): コマンド1回あたりの擬似遅延 (秒)
+
+    Returns:
+        dict: 処理名から計測結果への辞書
+    """
+    cmds = FakeCmds(latency)
+    original_cmds = core.cmds
+    original_om = core.om
+    core.cmds = cmds
+    core.om = FakeOpenMaya(cmds)
+    core.classification_cache.clear()
+    try:
+        object_names, deformer_names, handle_names = build_scene(
+            cmds, objects, deformers)
+        results = {}
+
+        cmds.selection = object_names[:selection]
+        results['collect_selected_objects'] = measure(
+            cmds, core.collect_selected_objects)
+
+        cmds.selection = ['rig']
+        results['collect_deformable_shapes'] = measure(
+            cmds, core.collect_deformable_shapes)
+
+        handles = (handle_names * (selection // max(1, len(handle_names)) + 1))
+        handles = handles[:selection]
+        results['is_deformer'] = measure(
+            cmds, lambda: [core.is_deformer(handle) for handle in handles])
+
+        # add_selected_deformers と同じく、選択したハンドルとデフォーマーを
+        # 選択リストのまま判定する
+        cmds.selection = (handle_names + deformer_names)[:selection]
+        results['collect_selected_deformers'] = measure(
+            cmds, core.collect_selected_deformers)
+
+        recipe = {
+            'targets': object_names,
+            'deformers': deformer_names,
+            'pairing': {'mode': core.PAIRING_ALL, 'rules': []}
+        }
+        results['plan_recipe'] = measure(
+            cmds, lambda: core.plan_recipe(recipe))
+
+        results['apply'] = measure(
+            cmds, lambda: core.apply_deformers(
+                object_names, deformer_names, fast=True))
+        results['apply_rerun'] = measure(
+            cmds, lambda: core.apply_deformers(
+                object_names, deformer_names, fast=True))
+
+        # シェイプを持たない transform を混ぜ、接続できないペアを含める
+        cmds.create('props', 'transform')
+        empty_names = [f"empty_{i}" for i in range(selection)]
+        for name in empty_names:
+            cmds.create(name, 'transform', 'props')
+        results['apply_incompatible'] = measure(
+            cmds, lambda: core.apply_deformers(
+                object_names + empty_names, deformer_names, fast=True))
+
+        remove_plan = core.plan_pairs(object_names, deformer_names)
+        results['remove'] = measure(
+            cmds, lambda: core.run_remove(remove_plan))
+        results['remove_rerun'] = measure(
+            cmds, lambda: core.run_remove(remove_plan))
+
+        # タイマーの代わりにスライスを順に実行する (スライスごとのアンドゥを含む)。
+        # 処理時間で呼び出し回数が変わらないよう、固定のチャンクを
+        # 1スライスに1つずつ処理する
+        def apply_async():
+            run = core.async_apply(remove_plan, budget=0, chunk_size=100)
+            while run.step():
+                pass
+        results['apply_async'] = measure(cmds, apply_async)
+
+        # 頂点範囲の選択 (オブジェクトごとに2つの範囲) をまとめて追加する
+        components = [
+            core.ComponentTarget(name, 'vtx', [(0, 99), (200, 299)])
+            for name in object_names
+        ]
+        results['apply_components'] = measure(
+            cmds, lambda: core.apply_deformers(
+                components, deformer_names, fast=True))
+        return results
+    finally:
+        core.cmds = original_cmds
+        core.om = original_om
+
+
+def case_key(objects, deformers, selection):
+    """ベースラインの比較に使う組み合わせのキー。"""
+    return f"N={objects} M={deformers} S={selection}"
+
+
+def run_sweep(objects_list, deformers_list, selection_list, latency=0.0):
+    """すべての組み合わせを計測する。
+
+    Returns:
+        dict: "キー/処理名" から計測結果への辞書
+    """
+    report = {}
+    for objects in objects_list:
+        for deformers in deformers_list:
+            for selection in selection_list:
+                key = case_key(objects, deformers, selection)
+                for name, metrics in run_case(
+                        objects, deformers, selection, latency).items():
+                    report[f"{key}/{name}"] = metrics
+    return report
+
+
+def compare(report, baseline, time_tolerance=None, calls_tolerance=0.0):
+    """ベースラインと比較し、悪化した項目を返す。
+
+    Args:
+        report (dict): run_sweep の結果
+        baseline (dict): 保存済みの run_sweep の結果
+        time_tolerance (float, optional): 処理時間の許容増加率。
+            None の場合は処理時間を比較しない。
+        calls_tolerance (float, optional): 呼び出し回数の許容増加率
+
+    Returns:
+        list: 悪化した項目の説明のリスト
+    """
+    regressions = []
+    for key, metrics in sorted(report.items()):
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if metrics['calls'] > base['calls'] * (1.0 + calls_tolerance):
+            regressions.append(
+                f"{key}: コマンド呼び出し {base['calls']} -> {metrics['calls']}")
+        if (time_tolerance is not None
+                and metrics['seconds'] > base['seconds'] * (1.0 + time_tolerance)):
+            regressions.append(
+                f"{key}: 処理時間 {base['seconds']:.4f}秒 -> "
+                f"{metrics['seconds']:.4f}秒")
+    return regressions
+
+
+def format_report(report):
+    """計測結果を表形式の文字列にする。"""
+    lines = [f"{'ケース':<48} {'秒':>10} {'呼び出し':>10} {'ピークKB':>10}"]
+    for key, metrics in sorted(report.items()):
+        lines.append(
+            f"{key:<48} {metrics['seconds']:>10.4f} {metrics['calls']:>10} "
+            f"{metrics['peak_kb']:>10.1f}")
+    return '\n'.join(lines)
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(',') if value]
+
+
+def main(argv=None):
+    """コマンドラインのエントリーポイント。"""
+    parser = argparse.ArgumentParser(
+        description="FT Connect Deformer のベンチマーク (擬似 maya.cmds)")
+    parser.add_argument('--objects', type=_int_list, default=[100, 1000],
+                        help="オブジェクト数 (カンマ区切り)")
+    parser.add_argument('--deformers', type=_int_list, default=[1, 10],
+                        help="デフォーマー数 (カンマ区切り)")
+    parser.add_argument('--selection', type=_int_list, default=[100],
+                        help="選択数 (カンマ区切り)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="コマンド1回あたりの擬似遅延 (秒)")
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE,
+                        default=None,
+                        help="比較するベースラインの JSON (省略時は同梱のもの)")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE,
+                        default=None,
+                        help="結果をベースラインとして保存する JSON")
+    parser.add_argument('--check-time', type=float, default=None,
+                        metavar='TOLERANCE',
+                        help="処理時間も比較する (許容増加率, 例: 0.5)")
+    parser.add_argument('--json', default=None, help="結果を書き出す JSON")
+    args = parser.parse_args(argv)
+
+    report = run_sweep(args.objects, args.deformers, args.selection,
+                       args.latency)
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"ベースラインを保存しました: {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.check_time)
+        if regressions:
+            print("性能の悪化を検出しました:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("ベースラインからの悪化はありません")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3388 @@
+"""FT Connect Deformer のコア処理。
+
+Qt や maya.OpenMayaUI に依存しない maya.cmds のみの API を提供する。
+mayapy などの GUI を持たないプロセスからもインポートして使用できる。
+
+    import FT_object_deformer_core as core
+    objects = core.collect_selected_objects()
+    plan = core.plan_pairs(objects, ['cluster1', 'bend1'])
+    result = core.apply_plan(plan)
+"""
+import array
+import bisect
+import collections
+import contextlib
+import csv
+import fnmatch
+import gzip
+import json
+import logging
+import logging.handlers
+import math
+import re
+import time
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import maya.utils
+
+
+# 1回の deformer 編集コマンドで渡すジオメトリの最大数
+DEFAULT_CHUNK_SIZE = 500
+
+# デフォーマーとして扱うノードタイプ
+DEFORMER_TYPES = frozenset([
+    # 基本デフォーマー
+    'cluster', 'skinCluster', 'blendShape', 'lattice', 'ffd',
+    'nonLinear', 'sculpt', 'wrap', 'wire', 'jiggle', 'softMod',
+    'tweak', 'groupParts', 'groupId', 'objectSet',
+    # nonLinearデフォーマーの具体的なタイプ
+    'sine', 'squash', 'twist', 'wave', 'flare', 'bend',
+    # ハンドルタイプ
+    'clusterHandle', 'latticeShape'
+])
+
+# nonLinear ハンドル名の判定に使うキーワード
+NONLINEAR_TYPES = ('twist', 'bend', 'sine', 'wave', 'flare', 'squash')
+
+# 階層から収集する変形可能なシェイプのタイプ
+DEFORMABLE_SHAPE_TYPES = ('mesh', 'nurbsCurve', 'nurbsSurface', 'lattice')
+
+# 継承チェックで変形できるシェイプとみなす基底タイプ
+DEFORMABLE_BASE_TYPES = ('deformableShape', 'controlPoint')
+
+# 継承チェックでデフォーマーとみなす基底タイプ
+DEFORMER_BASE_TYPES = ('deformer', 'geometryFilter')
+
+# 一部のシェイプタイプにしか接続できないデフォーマー。
+# ここにないデフォーマーは変形できるすべてのシェイプに接続できるものとする
+DEFORMER_GEOMETRY_TYPES = {
+    'deltaMush': ('mesh',),
+    'tension': ('mesh',),
+    'solidify': ('mesh',),
+    'morph': ('mesh',),
+}
+
+
+# ツール共通のロガー。enable_logging を呼ぶまでは何も出力しない
+logger = logging.getLogger('FT_object_deformer')
+logger.addHandler(logging.NullHandler())
+logger.setLevel(logging.WARNING)
+
+# enable_logging で追加したハンドラー
+_log_handler = None
+
+
+def enable_logging(level=logging.INFO, capacity=1000, stream=None):
+    """ロガーの出力を有効にする。
+
+    出力は MemoryHandler でバッファリングし、capacity 件たまったとき、
+    ERROR 以上のログが出たとき、または flush_log を呼んだときにまとめて
+    書き出す。Script Editor への1行ごとの出力による遅延を避けるため。
+
+    Args:
+        level (int, optional): 出力するログレベル
+        capacity (int, optional): バッファする最大件数
+        stream (file, optional): 出力先。省略時は標準出力。
+    """
+    global _log_handler
+    disable_logging()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    _log_handler = logging.handlers.MemoryHandler(
+        capacity, flushLevel=logging.ERROR, target=target)
+    logger.addHandler(_log_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def disable_logging():
+    """enable_logging で有効にした出力をバッファを書き出してから止める。"""
+    global _log_handler
+    if _log_handler is not None:
+        _log_handler.close()
+        logger.removeHandler(_log_handler)
+        _log_handler = None
+    logger.setLevel(logging.WARNING)
+    logger.propagate = True
+
+
+def flush_log():
+    """バッファ中のログを書き出す。"""
+    if _log_handler is not None:
+        _log_handler.flush()
+
+
+class CommandProfiler(object):
+    """Maya コマンドの呼び出し回数と所要時間をフェーズごとに記録する。
+
+    enable_profiling で cmds をラップすると、ツールが発行するすべての
+    コマンドがここに記録される。フェーズ (collect / classify / plan /
+    apply) の所要時間はコマンド名 '<phase>' として記録する。
+    """
+
+    # フェーズ外で発行されたコマンドのフェーズ名
+    NO_PHASE = '-'
+
+    # フェーズ自体の所要時間を記録するコマンド名
+    PHASE_TOTAL = '<phase>'
+
+    def __init__(self):
+        self.records = {}
+        self._phases = []
+
+    @property
+    def current_phase(self):
+        """現在のフェーズ名。"""
+        return self._phases[-1] if self._phases else self.NO_PHASE
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """ブロック内のコマンドを指定したフェーズとして記録する。"""
+        self._phases.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.pop()
+            self.record(self.PHASE_TOTAL, time.perf_counter() - start, name)
+
+    def record(self, command, seconds, phase=None):
+        """コマンド1回分の所要時間を記録する。"""
+        key = (phase or self.current_phase, command)
+        self.records.setdefault(key, []).append(seconds)
+
+    def clear(self):
+        """記録を消去する。"""
+        self.records.clear()
+
+    def summary(self):
+        """集計結果を合計時間の降順で返す。
+
+        Returns:
+            list: phase, command, count, total, mean, p95 (秒) を持つ辞書のリスト
+        """
+        rows = []
+        for (phase, command), durations in self.records.items():
+            durations = sorted(durations)
+            total = sum(durations)
+            p95_index = max(0, math.ceil(len(durations) * 0.95) - 1)
+            rows.append({
+                'phase': phase,
+                'command': command,
+                'count': len(durations),
+                'total': total,
+                'mean': total / len(durations),
+                'p95': durations[p95_index]
+            })
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows
+
+    def format_summary(self, limit=10):
+        """集計結果の上位を表形式の文字列にする。"""
+        lines = [f"{'フェーズ':<10}{'コマンド':<20}{'回数':>8}"
+                 f"{'合計(ms)':>12}{'p95(ms)':>10}"]
+        for row in self.summary()[:limit]:
+            lines.append(
+                f"{row['phase']:<10}{row['command']:<20}{row['count']:>8}"
+                f"{row['total'] * 1000:>12.1f}{row['p95'] * 1000:>10.2f}")
+        return '\n'.join(lines)
+
+    def write_json(self, path):
+        """集計結果を JSON で書き出す。"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def write_csv(self, path):
+        """集計結果を CSV で書き出す。"""
+        fields = ['phase', 'command', 'count', 'total', 'mean', 'p95']
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.summary())
+
+
+class _ProfiledCmds(object):
+    """maya.cmds の各コマンドの所要時間を CommandProfiler に記録するラッパー。"""
+
+    def __init__(self, wrapped, profiler):
+        self._wrapped = wrapped
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        command = getattr(self._wrapped, name)
+        if not callable(command):
+            return command
+        profiler = self._profiler
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return command(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - start)
+        return timed
+
+
+# enable_profiling で有効にしたプロファイラー
+profiler = None
+
+
+def enable_profiling():
+    """コマンドのプロファイリングを開始する。
+
+    Returns:
+        CommandProfiler: 記録先のプロファイラー
+    """
+    global cmds, profiler
+    if profiler is None:
+        profiler = CommandProfiler()
+        cmds = _ProfiledCmds(cmds, profiler)
+    return profiler
+
+
+def disable_profiling():
+    """コマンドのプロファイリングを終了する。
+
+    Returns:
+        CommandProfiler or None: それまでの記録
+    """
+    global cmds, profiler
+    finished = profiler
+    if profiler is not None:
+        cmds = cmds._wrapped
+        profiler = None
+    return finished
+
+
+def _phase(name):
+    """プロファイリング中ならフェーズのコンテキストを返す。"""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name)
+
+
+class ClassificationCache(object):
+    """デフォーマー判定に使うノードタイプ単位のキャッシュ。
+
+    ノードタイプごとの継承チェック結果はセッション中に変化しないため
+    常にメモ化する。ノードごとの判定結果はリネームや接続の変更で
+    変わるため、キャッシュしない。
+    """
+
+    def __init__(self):
+        self._type_cache = {}
+        self._shape_cache = {}
+        self.type_hits = 0
+        self.type_misses = 0
+
+    def inherits_deformer(self, node_type):
+        """ノードタイプがデフォーマー基底タイプを継承しているか返す。
+
+        Args:
+            node_type (str): ノードタイプ名
+
+        Returns:
+            bool: deformer / geometryFilter を継承している場合 True
+        """
+        if node_type in self._type_cache:
+            self.type_hits += 1
+            return self._type_cache[node_type]
+        self.type_misses += 1
+        inheritance = cmds.nodeType(
+            node_type, isTypeName=True, inherited=True) or []
+        result = any(bt in inheritance for bt in DEFORMER_BASE_TYPES)
+        self._type_cache[node_type] = result
+        return result
+
+    def deformable_base(self, node_type):
+        """変形できるシェイプのタイプを、接続可否の判定に使うタイプに変換する。
+
+        DEFORMABLE_SHAPE_TYPES を継承するタイプ (bezierCurve など) は
+        その基底のタイプを、それ以外の deformableShape / controlPoint 派生の
+        タイプはそのままのタイプ名を返す。結果はタイプごとにメモ化する。
+
+        Args:
+            node_type (str): ノードタイプ名
+
+        Returns:
+            str or None: 変形できないタイプ (transform など) の場合は None
+        """
+        if node_type in self._shape_cache:
+            self.type_hits += 1
+            return self._shape_cache[node_type]
+        self.type_misses += 1
+        inheritance = cmds.nodeType(
+            node_type, isTypeName=True, inherited=True) or []
+        base = next(
+            (t for t in DEFORMABLE_SHAPE_TYPES if t in inheritance), None)
+        if base is None and any(
+                t in inheritance for t in DEFORMABLE_BASE_TYPES):
+            base = node_type
+        self._shape_cache[node_type] = base
+        return base
+
+    def clear(self):
+        """すべてのキャッシュとカウンターをリセットする。"""
+        self._type_cache.clear()
+        self._shape_cache.clear()
+        self.type_hits = self.type_misses = 0
+
+    def stats(self):
+        """キャッシュの統計情報を返す。
+
+        Returns:
+            dict: type_hits, type_misses, types (継承チェックをキャッシュした
+                ノードタイプの数), shapes (シェイプのタイプの数)
+        """
+        return {
+            'type_hits': self.type_hits,
+            'type_misses': self.type_misses,
+            'types': len(self._type_cache),
+            'shapes': len(self._shape_cache)
+        }
+
+
+# モジュール共通の判定キャッシュ
+classification_cache = ClassificationCache()
+
+
+def classification_cache_stats():
+    """ノードタイプの判定キャッシュのヒット・ミス数を返す。
+
+    Returns:
+        dict: ClassificationCache.stats の結果
+    """
+    return classification_cache.stats()
+
+
+class NodeStore(object):
+    """挿入順を保持するノードの集合。
+
+    キー (ノード名や UUID) から付加情報への辞書として保持するため、
+    追加・削除・存在確認はいずれも O(1) で行える。
+    行番号での参照用のキー一覧は変更後に最初に参照されたときだけ作り直す。
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._keys = None
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def keys(self):
+        """挿入順のキーのリストを返す。"""
+        if self._keys is None:
+            self._keys = list(self._items)
+        return self._keys
+
+    def get(self, key, default=None):
+        """キーに対応する付加情報を返す。"""
+        return self._items.get(key, default)
+
+    def values(self):
+        """挿入順の付加情報のリストを返す。"""
+        return list(self._items.values())
+
+    def add_many(self, items):
+        """まだ含まれていない項目をまとめて追加する。
+
+        Args:
+            items (iterable): (キー, 付加情報) のイテラブル
+
+        Returns:
+            list: 新しく追加されたキーのリスト (追加順)
+        """
+        added = []
+        for key, data in items:
+            if key not in self._items:
+                self._items[key] = data
+                added.append(key)
+        if added and self._keys is not None:
+            self._keys.extend(added)
+        return added
+
+    def remove_many(self, keys):
+        """項目をまとめて削除する。
+
+        Args:
+            keys (iterable): 削除するキー
+
+        Returns:
+            list: 実際に削除されたキーのリスト
+        """
+        removed = []
+        for key in keys:
+            if key in self._items:
+                del self._items[key]
+                removed.append(key)
+        if removed:
+            self._keys = None
+        return removed
+
+    def clear(self):
+        """すべての項目を削除する。"""
+        self._items.clear()
+        self._keys = None
+
+
+class NodeRegistry(object):
+    """NodeRecord のキャッシュを無効化するコールバックを管理する。
+
+    リネーム・削除・追加 (削除のアンドゥ)・親の変更のたびに世代番号を
+    進める。NodeRecord は世代番号が変わったときだけパスを引き直す。
+    コールバックが登録されていない間は、参照のたびに引き直す。
+
+    リスナーが登録されている間は、削除・リネームされたノードの UUID を
+    溜めておく。リスナーは溜まり始めたときに1回だけ呼ばれるため、
+    グループの削除のような連続したイベントは take_changes で1回に
+    まとめて処理できる。
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._callback_ids = []
+        self._listeners = []
+        self._removed = set()
+        self._renamed = set()
+        self._notified = False
+
+    @property
+    def callbacks_installed(self):
+        """無効化コールバックが登録されているかどうか。"""
+        return bool(self._callback_ids)
+
+    def install_callbacks(self):
+        """パスのキャッシュを無効化するコールバックを登録する。"""
+        if self._callback_ids:
+            return
+        self.generation += 1
+        self._callback_ids = [
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._on_name_changed),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_removed),
+            om.MDGMessage.addNodeAddedCallback(self._on_changed),
+            om.MDagMessage.addParentAddedCallback(self._on_parent_added),
+        ]
+
+    def remove_callbacks(self):
+        """コールバックを解除する。"""
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def add_listener(self, listener):
+        """変更の通知先を登録する。
+
+        Args:
+            listener (callable): 引数なしの関数。変更が溜まり始めたときに
+                1回だけ呼ばれる。
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """変更の通知先を解除する。最後の1つなら溜まった変更も破棄する。"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+        if not self._listeners:
+            self.take_changes()
+
+    def take_changes(self):
+        """溜まった変更を取り出してリセットする。
+
+        Returns:
+            tuple: (削除されたノードの UUID の集合,
+                リネーム・親の変更があったノードの UUID の集合)
+        """
+        removed = self._removed
+        renamed = self._renamed - removed
+        self._removed = set()
+        self._renamed = set()
+        self._notified = False
+        return removed, renamed
+
+    def _record(self, changes, node):
+        """変更を溜め、溜まり始めならリスナーに通知する。"""
+        if not self._listeners:
+            return
+        changes.add(om.MFnDependencyNode(node).uuid().asString())
+        if not self._notified:
+            self._notified = True
+            for listener in list(self._listeners):
+                listener()
+
+    def _on_changed(self, *args):
+        """キャッシュ済みのパスを古いものとして扱う。"""
+        self.generation += 1
+
+    def _on_name_changed(self, node, prev_name, client_data):
+        self.generation += 1
+        self._record(self._renamed, node)
+
+    def _on_node_removed(self, node, client_data):
+        self.generation += 1
+        self._record(self._removed, node)
+
+    def _on_parent_added(self, child, parent, client_data):
+        self.generation += 1
+        self._record(self._renamed, child.node())
+
+
+# モジュール共通のノードレコードの管理
+node_registry = NodeRegistry()
+
+
+class NodeRecord(object):
+    """UUID と MObjectHandle でノードを追跡するレコード。
+
+    ノード名の文字列ではなく MObjectHandle を保持するため、リネームや
+    短い名前の重複、名前空間の変更があっても同じノードを指し続ける。
+    パスは node_registry の世代番号が変わったときだけ MObjectHandle から
+    引き直す。ノードが削除されていれば UUID で探し直す (削除のアンドゥ)。
+
+    Attributes:
+        uuid (str): ノードの UUID
+        type (str): ノードタイプ
+        data: 付加情報 (デフォーマーの判定タイプなど)
+        saved_name (str): レシピに保存されていた名前。ペアリングでは
+            現在の名前の代わりにこの名前を使う (plan_recipe と同じ対応になる)。
+    """
+
+    def __init__(self, node, data=None):
+        """初期化。
+
+        Args:
+            node (om.MObject): 追跡するノード
+            data (optional): 付加情報
+        """
+        fn_node = om.MFnDependencyNode(node)
+        self.handle = om.MObjectHandle(node)
+        self.uuid = fn_node.uuid().asString()
+        self.type = fn_node.typeName
+        self.data = data
+        self.saved_name = None
+        self._path = None
+        self._name = None
+        self._generation = None
+
+    def __repr__(self):
+        return f"NodeRecord({self.name!r}, {self.uuid!r})"
+
+    def _resolve(self):
+        """MObjectHandle (無効なら UUID) からパスと名前を引き直す。"""
+        self._generation = node_registry.generation
+        if not self.handle.isValid():
+            names = cmds.ls(self.uuid, long=True) or []
+            if not names:
+                self._path = self._name = None
+                return
+            selection = om.MSelectionList()
+            selection.add(names[0])
+            self.handle = om.MObjectHandle(selection.getDependNode(0))
+        node = self.handle.object()
+        if node.hasFn(om.MFn.kDagNode):
+            dag_path = om.MDagPath.getAPathTo(node)
+            self._path = dag_path.fullPathName()
+            self._name = dag_path.partialPathName()
+        else:
+            self._path = self._name = om.MFnDependencyNode(node).name()
+
+    def _refresh(self):
+        if (not node_registry.callbacks_installed
+                or self._generation != node_registry.generation):
+            self._resolve()
+
+    @property
+    def path(self):
+        """ロングネーム (DG ノードは名前)。削除済みなら None。"""
+        self._refresh()
+        return self._path
+
+    @property
+    def name(self):
+        """一意に決まる最短のパス (表示用)。削除済みなら None。"""
+        self._refresh()
+        return self._name
+
+    @property
+    def alive(self):
+        """ノードがシーンに存在するかどうか。"""
+        return self.path is not None
+
+    @property
+    def pairing_name(self):
+        """ペアリングで使う名前 (saved_name があればその名前)。"""
+        return self.saved_name or self.name
+
+
+def node_records(nodes, data=None):
+    """ノード名から NodeRecord をまとめて作成する。
+
+    ノード名は MSelectionList で MObject に解決する (文字列の問い合わせは
+    レコードの作成時だけ行う)。
+
+    Args:
+        nodes (list): ノード名のリスト
+        data (list, optional): 各ノードの付加情報のリスト
+
+    Returns:
+        tuple: (NodeRecord のリスト, 解決できなかったノード名のリスト)
+    """
+    nodes = list(nodes)
+    data = list(data) if data is not None else [None] * len(nodes)
+    records = []
+    missing = []
+    for node, node_data in zip(nodes, data):
+        selection = om.MSelectionList()
+        try:
+            selection.add(node)
+        except RuntimeError:
+            missing.append(node)
+            continue
+        records.append(NodeRecord(selection.getDependNode(0), node_data))
+    return records, missing
+
+
+def is_deformer(node):
+    """ノードがデフォーマーかどうかチェックする。
+
+    ノードタイプの継承チェックは classification_cache にキャッシュされる。
+
+    Args:
+        node (str): チェック対象のノード名
+
+    Returns:
+        dict: デフォーマー情報を含む辞書
+            - is_deformer (bool): デフォーマーかどうか
+            - type (str): ノードタイプ
+    """
+    with _phase('classify'):
+        return _classify_node(node)
+
+
+def _classify_node(node):
+    """キャッシュを介さずにノードを判定する。is_deformer を参照。"""
+    # デバッグ出力が無効なときは説明文を組み立てない
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        node_type = cmds.nodeType(node)
+
+        # デフォーマーの継承チェック
+        is_deformer_node = False
+        debug_info = []
+
+        # 直接的なタイプチェック
+        if node_type in DEFORMER_TYPES:
+            is_deformer_node = True
+            if debug:
+                debug_info.append(f"直接タイプマッチ: {node_type}")
+
+        # Cluster特殊ケース
+        if not is_deformer_node:
+            # クラスターハンドルの場合
+            if 'cluster' in node.lower():
+                try:
+                    # クラスターハンドルかチェック
+                    is_cluster_handle = cmds.objectType(
+                        node, isAType='clusterHandle')
+                    is_transform = cmds.objectType(
+                        node, isAType='transform')
+
+                    if is_cluster_handle or is_transform:
+                        connections = cmds.listConnections(
+                            node, type='cluster') or []
+                        if connections:
+                            is_deformer_node = True
+                            node_type = 'clusterHandle'
+                            if debug:
+                                debug_info.append(
+                                    f"クラスター接続検出: {connections}")
+                except Exception as e:
+                    if debug:
+                        debug_info.append(f"クラスターチェックエラー: {e}")
+
+        # NonLinear特殊ケース
+        if not is_deformer_node:
+            nl_match = any(nl_type in node.lower() for nl_type in NONLINEAR_TYPES)
+            if nl_match:
+                try:
+                    # nonLinearハンドルかチェック
+                    connections = cmds.listConnections(
+                        node, type='nonLinear') or []
+                    if connections:
+                        is_deformer_node = True
+                        node_type = 'nonLinearHandle'
+                        if debug:
+                            debug_info.append(
+                                f"nonLinear接続検出: {connections}")
+                    # 直接nonLinearタイプかチェック
+                    elif cmds.objectType(node, isAType='nonLinear'):
+                        is_deformer_node = True
+                        node_type = 'nonLinear'
+                        if debug:
+                            debug_info.append("nonLinearタイプ検出")
+                except Exception as e:
+                    if debug:
+                        debug_info.append(f"nonLinearチェックエラー: {e}")
+
+        # Maya APIを使用してデフォーマーの継承をチェック
+        if not is_deformer_node:
+            try:
+                # デフォーマーベースクラスから継承しているかチェック
+                # (ノードタイプ単位でメモ化)
+                if classification_cache.inherits_deformer(node_type):
+                    is_deformer_node = True
+                    if debug:
+                        debug_info.append(f"継承検出: {node_type}")
+            except Exception as e:
+                if debug:
+                    debug_info.append(f"継承チェックエラー: {e}")
+
+        # 特別なケース: transformノードでもdeformerコマンドで使用可能な場合
+        if not is_deformer_node and node_type == 'transform':
+            # クラスターハンドルなどの可能性をチェック
+            try:
+                # 子シェイプをチェック
+                shapes = cmds.listRelatives(
+                    node, shapes=True, fullPath=True) or []
+                for shape in shapes:
+                    shape_type = cmds.nodeType(shape)
+                    if shape_type in DEFORMER_TYPES:
+                        is_deformer_node = True
+                        node_type = shape_type
+                        if debug:
+                            debug_info.append(f"子シェイプ検出: {shape_type}")
+                        break
+
+                # 接続をチェック
+                if not is_deformer_node:
+                    deformer_check_types = [
+                        'cluster', 'nonLinear', 'lattice', 'blendShape'
+                    ]
+                    for deformer_type in deformer_check_types:
+                        connections = cmds.listConnections(
+                            node, type=deformer_type) or []
+                        if connections:
+                            is_deformer_node = True
+                            node_type = f"{deformer_type}Handle"
+                            if debug:
+                                debug_info.append(
+                                    f"{deformer_type}接続検出: {connections}")
+                            break
+            except Exception as e:
+                if debug:
+                    debug_info.append(f"Transform特殊チェックエラー: {e}")
+
+        # デバッグ情報を出力
+        if debug_info:
+            logger.debug("デバッグ情報 (%s): %s", node, ' | '.join(debug_info))
+
+        return {
+            'is_deformer': is_deformer_node,
+            'type': node_type
+        }
+
+    except Exception as e:
+        logger.debug("is_deformer エラー (%s): %s", node, e)
+        return {
+            'is_deformer': False,
+            'type': 'unknown'
+        }
+
+
+def classify_nodes(nodes):
+    """複数のノードをまとめて分類する。
+
+    MSelectionList は重複する名前や同じノードを指す別名を1つにまとめて
+    しまうため、名前ごとに MObject に解決し、入力と同じ順序で結果を返す。
+    同じノードを指す名前は1回だけ判定する。存在しないノードは type が
+    'unknown' になる。
+
+    Args:
+        nodes (list): 分類するノード名のリスト
+
+    Returns:
+        list: 各ノードの (解決後のノード名, 判定結果) のリスト
+    """
+    with _phase('classify'):
+        selection = om.MSelectionList()
+        classified = {}
+        results = []
+        for node in nodes:
+            selection.clear()
+            try:
+                selection.add(node)
+            except RuntimeError:
+                results.append(
+                    (node, {'is_deformer': False, 'type': 'unknown'}))
+                continue
+            obj = selection.getDependNode(0)
+            key = om.MObjectHandle(obj).hashCode()
+            # hashCode は衝突しうるため、同じノードかどうかも確かめる
+            cached = classified.get(key)
+            if cached is None or cached[0] != obj:
+                cached = classified[key] = (obj, _classify_mobject(obj))
+            name, result = cached[1]
+            results.append((name, dict(result)))
+        return results
+
+
+def classify_selection_list(selection):
+    """MSelectionList の各要素を OpenMaya 2 API で一括判定する。
+
+    geometryFilter 派生ノードはそのままデフォーマーとして扱う。
+    クラスターや nonLinear などのハンドルは、ハンドル (transform と
+    そのシェイプ) のプラグ接続をたどってデフォーマーノードに解決する。
+    ノード名による推測は行わない。
+
+    Args:
+        selection (om.MSelectionList): 判定対象
+
+    Returns:
+        list: 各要素の (解決後のノード名, 判定結果) のリスト。
+            判定結果は is_deformer と同じ {'is_deformer', 'type'} の辞書。
+    """
+    with _phase('classify'):
+        return [_classify_mobject(selection.getDependNode(index))
+                for index in range(selection.length())]
+
+
+def _classify_mobject(node):
+    """1つのノードを判定する (classify_selection_list を参照)。
+
+    Args:
+        node (om.MObject): 判定対象
+
+    Returns:
+        tuple: (解決後のノード名, 判定結果)
+    """
+    fn_node = om.MFnDependencyNode(node)
+    if node.hasFn(om.MFn.kGeometryFilt):
+        return (fn_node.name(), {'is_deformer': True, 'type': fn_node.typeName})
+
+    deformer = _find_handle_deformer(node)
+    if deformer is not None:
+        fn_deformer = om.MFnDependencyNode(deformer)
+        return (fn_deformer.name(),
+                {'is_deformer': True, 'type': fn_deformer.typeName})
+
+    if node.hasFn(om.MFn.kDagNode):
+        name = om.MFnDagNode(node).partialPathName()
+    else:
+        name = fn_node.name()
+    return (name, {'is_deformer': False, 'type': fn_node.typeName})
+
+
+# ハンドル側から接続されるデフォーマーのアトリビュート
+# (cluster/softMod の matrix, nonLinear の deformerData, ffd のラティスなど)
+HANDLE_ATTRIBUTES = frozenset([
+    'matrix', 'clusterXforms', 'deformerData', 'softModXforms',
+    'deformedLatticeMatrix', 'deformedLatticePoints'
+])
+
+
+def _find_handle_deformer(node):
+    """ハンドルノードから接続先のデフォーマーノードを探す。
+
+    Args:
+        node (om.MObject): ハンドルの候補ノード
+
+    Returns:
+        om.MObject or None: 見つかったデフォーマーノード
+    """
+    candidates = [node]
+    if node.hasFn(om.MFn.kTransform):
+        fn_dag = om.MFnDagNode(node)
+        candidates.extend(
+            fn_dag.child(i) for i in range(fn_dag.childCount()))
+
+    for candidate in candidates:
+        fn_node = om.MFnDependencyNode(candidate)
+        for plug in fn_node.getConnections():
+            for dst in plug.connectedTo(False, True):
+                dst_node = dst.node()
+                # skinCluster の matrix[n] などの配列要素はハンドルではない
+                if not dst_node.hasFn(om.MFn.kGeometryFilt) or dst.isElement:
+                    continue
+                if om.MFnAttribute(dst.attribute()).name in HANDLE_ATTRIBUTES:
+                    return dst_node
+    return None
+
+
+def collect_selection():
+    """選択中のノードをそのまま取得する。
+
+    Returns:
+        list: ノード名のリスト
+    """
+    with _phase('collect'):
+        return cmds.ls(selection=True) or []
+
+
+def collect_selected_objects():
+    """選択中の変形対象オブジェクト (transform) を取得する。
+
+    Returns:
+        list: transform ノード名のリスト
+    """
+    with _phase('collect'):
+        return cmds.ls(selection=True, type='transform') or []
+
+
+def collect_deformable_shapes(roots=None, shape_types=DEFORMABLE_SHAPE_TYPES,
+                              name_pattern=None, include_intermediate=False,
+                              visible_only=False):
+    """ルート以下の階層にある変形可能なシェイプをまとめて取得する。
+
+    子孫のシェイプは listRelatives(allDescendents=True) の1回の呼び出しで
+    取得し、中間オブジェクトと非表示ノードの除外もそれぞれ ls の1回の
+    呼び出しで行う。
+
+    Args:
+        roots (list, optional): ルートノード。省略時は選択中のノード。
+        shape_types (tuple, optional): 収集するシェイプのタイプ
+        name_pattern (str, optional): シェイプまたは親 transform の短い名前に
+            対するワイルドカード (例: "L_*")
+        include_intermediate (bool, optional): 中間オブジェクトを含めるかどうか
+        visible_only (bool, optional): 表示されているシェイプだけにするかどうか
+
+    Returns:
+        list: シェイプのフルパスのリスト
+    """
+    with _phase('collect'):
+        if roots is None:
+            roots = cmds.ls(selection=True, long=True) or []
+        if not roots or not shape_types:
+            return []
+        shape_types = list(shape_types)
+        shapes = cmds.ls(roots, type=shape_types, long=True) or []
+        shapes += cmds.listRelatives(
+            roots, allDescendents=True, fullPath=True, type=shape_types) or []
+        if shapes and not include_intermediate:
+            shapes = cmds.ls(shapes, noIntermediate=True, long=True) or []
+        if shapes and visible_only:
+            shapes = cmds.ls(shapes, visible=True, long=True) or []
+        if name_pattern:
+            shapes = [
+                shape for shape in shapes
+                if any(fnmatch.fnmatchcase(name, name_pattern)
+                       for name in shape.rsplit('|', 2)[-2:])
+            ]
+        # 重複するルートを選択した場合に備えて順序を保って重複を除く
+        return list(dict.fromkeys(shapes))
+
+
+def collect_selected_deformers():
+    """選択中のアイテムを分類して取得する。
+
+    アクティブな選択リストをそのまま classify_selection_list で判定する。
+
+    Returns:
+        list: 各アイテムの (解決後のノード名, 判定結果) のリスト
+    """
+    return classify_selection_list(om.MGlobal.getActiveSelectionList())
+
+
+class DeformerIndex(object):
+    """シーンのすべてのデフォーマーの索引。
+
+    build で ls(type='geometryFilter') を1回だけ呼び出してデフォーマーを
+    列挙し、タイプ・ハンドル・接続中のジオメトリ数・名前空間を OpenMaya で
+    プラグからまとめて調べる。コールバックを登録している間は、追加・削除・
+    リネーム・接続変更のあったデフォーマーだけを update で更新するため、
+    シーンを走査し直す必要はない。
+
+    NodeRegistry と同様に、変更が溜まり始めたときにリスナーを1回だけ呼ぶ。
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self._dirty = {}
+        self._removed = set()
+        self._callback_ids = []
+        self._listeners = []
+        self._notified = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def callbacks_installed(self):
+        """更新用のコールバックが登録されているかどうか。"""
+        return bool(self._callback_ids)
+
+    def build(self):
+        """シーンを1回走査して索引を作り直す。
+
+        Returns:
+            dict: UUID からデフォーマー情報への辞書 (entries)
+        """
+        with _phase('collect'):
+            self.entries = {}
+            self._dirty = {}
+            self._removed = set()
+            selection = om.MSelectionList()
+            for name in cmds.ls(type='geometryFilter') or []:
+                selection.add(name)
+            for index in range(selection.length()):
+                entry = self._entry(selection.getDependNode(index))
+                self.entries[entry['uuid']] = entry
+        return self.entries
+
+    @staticmethod
+    def _entry(node):
+        """デフォーマーノードの情報を作成する。
+
+        Returns:
+            dict: uuid, name, type, handle (なければ None), geometry (接続中の
+                ジオメトリ数), namespace (なければ空文字列)
+        """
+        fn_node = om.MFnDependencyNode(node)
+        name = fn_node.name()
+        handle = None
+        for plug in fn_node.getConnections():
+            if (plug.isElement or not plug.isDestination
+                    or om.MFnAttribute(plug.attribute()).name
+                    not in HANDLE_ATTRIBUTES):
+                continue
+            source = plug.source().node()
+            if source.hasFn(om.MFn.kDagNode):
+                fn_dag = om.MFnDagNode(source)
+                # ハンドルのシェイプではなく transform を返す
+                if fn_dag.parentCount() and source.hasFn(om.MFn.kShape):
+                    fn_dag = om.MFnDagNode(fn_dag.parent(0))
+                handle = fn_dag.partialPathName()
+                break
+        geometry = fn_node.findPlug('outputGeometry', False)
+        return {
+            'uuid': fn_node.uuid().asString(),
+            'name': name,
+            'type': fn_node.typeName,
+            'handle': handle,
+            'geometry': geometry.numConnectedElements(),
+            'namespace': name.rpartition(':')[0]
+        }
+
+    def types(self):
+        """索引に含まれるデフォーマータイプをソートして返す。"""
+        return sorted({entry['type'] for entry in self.entries.values()})
+
+    def search(self, text='', node_type=None):
+        """名前 (大文字小文字を区別しない部分一致) とタイプで絞り込む。
+
+        Args:
+            text (str, optional): 名前に含まれる文字列
+            node_type (str, optional): デフォーマータイプ
+
+        Returns:
+            list: 名前順のデフォーマー情報のリスト
+        """
+        text = text.lower()
+        return sorted(
+            (entry for entry in self.entries.values()
+             if (node_type is None or entry['type'] == node_type)
+             and text in entry['name'].lower()),
+            key=lambda entry: entry['name'])
+
+    def install_callbacks(self):
+        """デフォーマーの追加・削除・リネーム・接続変更を監視する。"""
+        if self._callback_ids:
+            return
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(
+                self._on_changed, 'geometryFilter'),
+            om.MDGMessage.addNodeRemovedCallback(
+                self._on_removed, 'geometryFilter'),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._on_name_changed),
+            om.MDGMessage.addConnectionCallback(self._on_connection),
+        ]
+
+    def remove_callbacks(self):
+        """コールバックを解除する。"""
+        if self._callback_ids:
+            om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def add_listener(self, listener):
+        """変更の通知先を登録する。"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """変更の通知先を解除する。"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def update(self):
+        """溜まった変更を索引に反映する。
+
+        Returns:
+            tuple: (追加・更新された UUID のリスト, 削除された UUID のリスト)
+        """
+        dirty = self._dirty
+        removed = [uuid for uuid in self._removed if uuid in self.entries]
+        self._dirty = {}
+        self._removed = set()
+        self._notified = False
+        for uuid in removed:
+            del self.entries[uuid]
+        changed = []
+        for uuid, handle in dirty.items():
+            if not handle.isValid():
+                # 削除の途中で接続変更が通知された場合
+                if self.entries.pop(uuid, None) is not None:
+                    removed.append(uuid)
+                continue
+            self.entries[uuid] = self._entry(handle.object())
+            changed.append(uuid)
+        return changed, removed
+
+    def _mark(self, node, removed=False):
+        """変更を溜め、溜まり始めならリスナーに通知する。"""
+        uuid = om.MFnDependencyNode(node).uuid().asString()
+        if removed:
+            self._removed.add(uuid)
+            self._dirty.pop(uuid, None)
+        else:
+            # 削除のアンドゥで戻ったノードは削除扱いを取り消す
+            self._removed.discard(uuid)
+            self._dirty[uuid] = om.MObjectHandle(node)
+        if not self._notified:
+            self._notified = True
+            for listener in list(self._listeners):
+                listener()
+
+    def _on_changed(self, node, client_data):
+        self._mark(node)
+
+    def _on_removed(self, node, client_data):
+        self._mark(node, removed=True)
+
+    def _on_name_changed(self, node, prev_name, client_data):
+        if node.hasFn(om.MFn.kGeometryFilt):
+            self._mark(node)
+
+    def _on_connection(self, src_plug, dst_plug, made, client_data):
+        # ジオメトリの接続・切断とハンドルの接続を反映する
+        for plug in (src_plug, dst_plug):
+            node = plug.node()
+            if node.hasFn(om.MFn.kGeometryFilt):
+                self._mark(node)
+
+
+# コンポーネント名 ("pSphere1.vtx[0:99]" など) の書式
+_COMPONENT = re.compile(
+    r'^(?P<node>[^.]+)\.(?P<component>\w+)(?P<index>(?:\[[^\]]*\])+)$')
+
+# 1次元のインデックス ("[12]" または "[0:99]")
+_SINGLE_INDEX = re.compile(r'^\[(\d+)(?::(\d+))?\]$')
+
+
+def _merge_ranges(ranges):
+    """インデックスの範囲をソートし、重なりや隣接をまとめる。
+
+    Args:
+        ranges (iterable): (開始, 終了) のイテラブル (終了を含む)
+
+    Returns:
+        array.array: [開始, 終了, 開始, 終了, ...] の配列
+    """
+    merged = array.array('q')
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1] + 1:
+            merged[-1] = max(merged[-1], end)
+        else:
+            merged.extend((start, end))
+    return merged
+
+
+class ComponentTarget(object):
+    """ノードのコンポーネントの一部を変形対象として表す。
+
+    頂点ごとの文字列 ("pSphere1.vtx[12]") に展開せず、連続した
+    インデックスを (開始, 終了) の組の配列 (ランレングス) で保持する。
+    20万頂点の選択でも、範囲の数だけのメモリとコマンド引数で済む。
+    サーフェスの CV (cv[u][v]) やラティスの点 (pt[s][t][u]) などの
+    多次元のインデックスは、Maya の範囲表記の文字列のまま保持する。
+
+    Args:
+        node (str): ノード名
+        component (str): コンポーネント名 ("vtx", "cv" など)
+        ranges (iterable, optional): 1次元インデックスの (開始, 終了) の組
+        raw (iterable, optional): 多次元インデックスの文字列 ("[0:3][1]" など)
+    """
+
+    __slots__ = ('node', 'component', 'ranges', 'raw')
+
+    def __init__(self, node, component, ranges=(), raw=()):
+        self.node = node
+        self.component = component
+        self.ranges = _merge_ranges(ranges)
+        self.raw = tuple(dict.fromkeys(raw))
+
+    def _key(self):
+        return (self.node, self.component, self.ranges.tobytes(), self.raw)
+
+    def __eq__(self, other):
+        return isinstance(other, ComponentTarget) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"ComponentTarget({self.label()!r})"
+
+    def __str__(self):
+        return self.label()
+
+    def count(self):
+        """1次元インデックスの数と多次元の範囲表記の数の合計を返す。"""
+        ranges = self.ranges
+        return (sum(ranges[i + 1] - ranges[i] + 1
+                    for i in range(0, len(ranges), 2))
+                + len(self.raw))
+
+    def contains(self, other):
+        """other のコンポーネントがすべてこの範囲に含まれるかどうか (ノードは比較しない)。"""
+        if other.component != self.component:
+            return False
+        if not set(other.raw) <= set(self.raw):
+            return False
+        starts = self.ranges[::2]
+        for i in range(0, len(other.ranges), 2):
+            j = bisect.bisect_right(starts, other.ranges[i]) - 1
+            if j < 0 or self.ranges[2 * j + 1] < other.ranges[i + 1]:
+                return False
+        return True
+
+    def label(self, node=None):
+        """表示用の名前を返す。例 "pSphere1.vtx[0:4999]" / "pSphere1.vtx[...] (1200個)" """
+        node = self.node if node is None else node
+        if len(self.ranges) == 2 and not self.raw:
+            start, end = self.ranges
+            index = f"[{start}]" if start == end else f"[{start}:{end}]"
+            return f"{node}.{self.component}{index}"
+        return f"{node}.{self.component}[...] ({self.count()}個)"
+
+    def on(self, node):
+        """範囲を共有したまま、別のノード名 (ロングネームなど) に置き換える。"""
+        target = ComponentTarget.__new__(ComponentTarget)
+        target.node = node
+        target.component = self.component
+        target.ranges = self.ranges
+        target.raw = self.raw
+        return target
+
+    def strings(self):
+        """Maya のコマンドに渡す範囲表記の文字列のリストを返す。
+
+        Returns:
+            list: 範囲ごとに1つの文字列 ("pSphere1.vtx[0:4999]" など)
+        """
+        prefix = f"{self.node}.{self.component}"
+        ranges = self.ranges
+        names = [
+            f"{prefix}[{ranges[i]}]" if ranges[i] == ranges[i + 1]
+            else f"{prefix}[{ranges[i]}:{ranges[i + 1]}]"
+            for i in range(0, len(ranges), 2)
+        ]
+        names.extend(prefix + index for index in self.raw)
+        return names
+
+
+def target_node(target):
+    """変形対象のノード名を返す (ComponentTarget ならそのノード)。"""
+    if isinstance(target, ComponentTarget):
+        return target.node
+    return target
+
+
+def group_components(names):
+    """名前のリストのコンポーネントを、ノードとコンポーネントごとにまとめる。
+
+    コンポーネントでない名前 (と既存の ComponentTarget) はそのまま残し、
+    コンポーネント名は最初に現れた位置に ComponentTarget として1つにまとめる。
+
+    Args:
+        names (iterable): ノード名またはコンポーネント名のイテラブル
+
+    Returns:
+        list: ノード名と ComponentTarget のリスト
+    """
+    grouped = {}
+    order = []
+    for name in names:
+        match = None
+        if not isinstance(name, ComponentTarget):
+            match = _COMPONENT.match(name)
+        if match is None:
+            order.append(name)
+            continue
+        key = (match.group('node'), match.group('component'))
+        if key not in grouped:
+            grouped[key] = ([], [])
+            order.append(key)
+        ranges, raw = grouped[key]
+        index = match.group('index')
+        single = _SINGLE_INDEX.match(index)
+        if single is not None:
+            start = int(single.group(1))
+            ranges.append((start, int(single.group(2) or start)))
+        else:
+            raw.append(index)
+    return [
+        ComponentTarget(item[0], item[1], *grouped[item])
+        if isinstance(item, tuple) else item
+        for item in order
+    ]
+
+
+def collect_selected_components():
+    """選択中のコンポーネントを範囲のまま取得する。
+
+    cmds.ls は範囲を圧縮した表記 ("pSphere1.vtx[0:4999]") で返すため、
+    頂点ごとの文字列には展開しない。
+
+    Returns:
+        list: ComponentTarget のリスト
+    """
+    with _phase('collect'):
+        selection = cmds.ls(selection=True, long=True) or []
+        return [
+            target for target in group_components(selection)
+            if isinstance(target, ComponentTarget)
+        ]
+
+
+def _deformer_set(deformer):
+    """デフォーマーのメンバーシップを管理する objectSet を返す。なければ None。"""
+    sets = cmds.listConnections(
+        f"{deformer}.message", type='objectSet',
+        source=False, destination=True) or []
+    return sets[0] if sets else None
+
+
+def _component_members(deformer_set):
+    """デフォーマーセットの現在のメンバーを1回の問い合わせで調べる。
+
+    Args:
+        deformer_set (str): デフォーマーセット名
+
+    Returns:
+        tuple: ((ロングネーム, コンポーネント名) から ComponentTarget への辞書,
+            ジオメトリ全体がメンバーのノードのロングネームの集合)。
+            ノードはシェイプと親 transform のどちらのロングネームでも引ける。
+    """
+    members = group_components(cmds.sets(deformer_set, query=True) or [])
+    paths = long_names({target_node(member) for member in members})
+    components = {}
+    whole = set()
+    for member in members:
+        path = paths[target_node(member)]
+        keys = (path, path.rsplit('|', 1)[0])
+        if isinstance(member, ComponentTarget):
+            for key in keys:
+                components[(key, member.component)] = member
+        else:
+            whole.update(keys)
+    return components, whole
+
+
+def _edit_components(deformer_set, targets, remove=False):
+    """コンポーネントをデフォーマーセットにまとめて追加 (または削除) する。
+
+    すべての範囲を1回の cmds.sets で渡す。失敗した場合だけ
+    ComponentTarget ごとに再試行して失敗した対象を特定する。
+
+    Args:
+        deformer_set (str): デフォーマーセット名
+        targets (list): ComponentTarget のリスト
+        remove (bool, optional): セットから外すかどうか
+
+    Returns:
+        tuple: (成功した対象のリスト, (対象, エラー) のリスト)
+    """
+    def edit(chunk):
+        strings = [name for target in chunk for name in target.strings()]
+        if remove:
+            cmds.sets(strings, remove=deformer_set)
+        else:
+            cmds.sets(strings, add=deformer_set)
+
+    try:
+        edit(targets)
+        return list(targets), []
+    except RuntimeError as e:
+        if len(targets) == 1:
+            return [], [(targets[0], e)]
+    succeeded = []
+    failed = []
+    for target in targets:
+        try:
+            edit([target])
+        except RuntimeError as e:
+            failed.append((target, e))
+        else:
+            succeeded.append(target)
+    return succeeded, failed
+
+
+def _split_components(objects):
+    """変形対象をノード名と ComponentTarget に分ける。
+
+    Returns:
+        tuple: (ノード名のリスト, ComponentTarget のリスト)
+    """
+    nodes = []
+    components = []
+    for obj in objects:
+        if isinstance(obj, ComponentTarget):
+            components.append(obj)
+        else:
+            nodes.append(obj)
+    return nodes, components
+
+
+def _apply_components(deformer, components, result, remove=False, paths=None):
+    """ComponentTarget をデフォーマーセットに追加 (削除) して result を更新する。
+
+    paths を渡した場合はデフォーマーセットのメンバーを1回だけ問い合わせ、
+    追加するときはすべて含まれている対象を present に、外すときは
+    まったく含まれていない対象を absent に数えて編集しない。
+
+    Args:
+        deformer (str): デフォーマー名
+        components (list): ComponentTarget のリスト
+        result (dict): new_apply_result で作成した結果 (更新される)
+        remove (bool, optional): セットから外すかどうか
+        paths (dict, optional): long_names が返したノード名からロングネームへの辞書
+
+    Returns:
+        list: 編集した ComponentTarget のリスト
+    """
+    deformer_set = _deformer_set(deformer)
+    if deformer_set is None:
+        error = RuntimeError(
+            f"'{deformer}' にはデフォーマーセットがないため、"
+            f"コンポーネント単位で編集できません")
+        failed = [(target, error) for target in components]
+        components = []
+    else:
+        failed = []
+    if components and paths is not None:
+        members, whole = _component_members(deformer_set)
+        pending = []
+        for target in components:
+            path = paths[target.node]
+            member = members.get((path, target.component))
+            if remove:
+                skip = path not in whole and member is None
+            else:
+                skip = path in whole or (
+                    member is not None and member.contains(target))
+            if not skip:
+                pending.append(target)
+        result['absent' if remove else 'present'] += (
+            len(components) - len(pending))
+        components = pending
+    succeeded = []
+    if components:
+        succeeded, edit_failed = _edit_components(
+            deformer_set, components, remove)
+        failed.extend(edit_failed)
+    result['removed' if remove else 'created'] += len(succeeded)
+    for target, e in failed:
+        result['failed'].append((deformer, target, e))
+        logger.warning("'%s' を '%s' で編集できませんでした。%s",
+                       target, deformer, e)
+    result['error'] = len(result['failed'])
+    if succeeded:
+        logger.info("%d個のコンポーネント範囲をデフォーマー '%s' %sしました。",
+                    len(succeeded), deformer,
+                    "から削除" if remove else "に追加")
+    return succeeded
+
+
+# ペアリングモード
+PAIRING_ALL = 'all'
+PAIRING_INDEX = 'index'
+PAIRING_RULES = 'rules'
+
+# 名前のトークン区切り
+_TOKEN_SPLIT = re.compile(r'[_:|]+')
+
+# ワイルドカード文字
+_WILDCARD = re.compile(r'[*?\[]')
+
+# ワイルドカードのパターンをリテラル部分に分ける区切り。文字クラス
+# ("[0-9]" や "[!LR]") は中身ごと1つの区切りとして扱う
+_GLOB_SPECIAL = re.compile(r'\*|\?|\[!?\]?[^\]]*\]')
+
+# 正規表現の先頭にあるリテラル部分 (特殊文字を含まない)
+_REGEX_LITERAL_PREFIX = re.compile(r'\^([A-Za-z0-9_]+)')
+
+
+def _match_names(node):
+    """名前ルールで照合する短い名前を返す。
+
+    シェイプのパスの場合は親 transform の短い名前も照合対象にする。
+    ComponentTarget はそのノードの名前で照合する。
+    """
+    parts = target_node(node).rsplit('|', 2)
+    if len(parts) == 3 and parts[1]:
+        return (parts[2], parts[1])
+    return (parts[-1],)
+
+
+class NameIndex(object):
+    """名前ルールの照合を高速化する索引。
+
+    短い名前の完全一致、前方一致・後方一致 (ソート済みリストの二分探索)、
+    トークン ("_" などで区切った単語) の索引を事前に作り、パターンごとに
+    候補を絞り込んでから照合する。これにより N 個の名前に対する照合は
+    全件の総当たりではなく、候補数にほぼ比例する時間で済む。
+    """
+
+    def __init__(self, nodes):
+        """初期化。
+
+        Args:
+            nodes (list): 索引を作るノード名のリスト (順序を保持する)
+        """
+        self.nodes = list(nodes)
+        self.exact = collections.defaultdict(list)
+        self.tokens = collections.defaultdict(set)
+        names = []
+        for index, node in enumerate(self.nodes):
+            for name in _match_names(node):
+                self.exact[name].append(index)
+                names.append((name, index))
+                for token in _TOKEN_SPLIT.split(name):
+                    if token:
+                        self.tokens[token].add(index)
+        names.sort()
+        self._prefix_keys = [name for name, _ in names]
+        self._prefix_values = [index for _, index in names]
+        reversed_names = sorted((name[::-1], index) for name, index in names)
+        self._suffix_keys = [name for name, _ in reversed_names]
+        self._suffix_values = [index for _, index in reversed_names]
+
+    @staticmethod
+    def _range(keys, values, prefix):
+        """ソート済みのキーから前方一致する要素の番号を返す。"""
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff')
+        return set(values[start:end])
+
+    def with_prefix(self, prefix):
+        """短い名前が prefix で始まるノードの番号の集合。"""
+        return self._range(self._prefix_keys, self._prefix_values, prefix)
+
+    def with_suffix(self, suffix):
+        """短い名前が suffix で終わるノードの番号の集合。"""
+        return self._range(self._suffix_keys, self._suffix_values, suffix[::-1])
+
+    def candidates(self, pattern):
+        """ワイルドカードのパターンに一致しうるノードの番号の集合。
+
+        Returns:
+            set or None: 絞り込めない場合 (パターンが "*" など) は None
+        """
+        if not _WILDCARD.search(pattern):
+            return set(self.exact.get(pattern, ()))
+        options = []
+        literals = _GLOB_SPECIAL.split(pattern)
+        if literals[0]:
+            options.append(self.with_prefix(literals[0]))
+        if literals[-1]:
+            options.append(self.with_suffix(literals[-1]))
+        # 区切り文字で囲まれたリテラル (例: "*_arm_*" の "arm") はトークンで引く
+        for literal in literals[1:-1]:
+            parts = _TOKEN_SPLIT.split(literal)
+            if len(parts) >= 3:
+                for token in parts[1:-1]:
+                    if token:
+                        options.append(self.tokens.get(token, set()))
+        if not options:
+            return None
+        return min(options, key=len)
+
+    def match_glob(self, pattern):
+        """ワイルドカードに一致するノードの番号を昇順で返す。"""
+        candidates = self.candidates(pattern)
+        if candidates is None:
+            candidates = range(len(self.nodes))
+        return sorted(
+            index for index in candidates
+            if any(fnmatch.fnmatchcase(name, pattern)
+                   for name in _match_names(self.nodes[index])))
+
+    def match_regex(self, regex):
+        """正規表現に一致するノードの (番号, マッチ) を昇順で返す。"""
+        literal = _regex_literal_prefix(regex)
+        if literal:
+            candidates = sorted(self.with_prefix(literal))
+        else:
+            candidates = range(len(self.nodes))
+        matches = []
+        for index in candidates:
+            for name in _match_names(self.nodes[index]):
+                match = regex.search(name)
+                if match:
+                    matches.append((index, match))
+                    break
+        return matches
+
+
+def _regex_literal_prefix(regex):
+    """正規表現に一致する名前が必ず持つ先頭のリテラル部分を返す。
+
+    "^L_arm" なら "L_arm"。選択 (|) を含む場合や、大文字小文字を区別
+    しない場合は絞り込めないため空文字を返す。
+    """
+    pattern = regex.pattern
+    if '|' in pattern or regex.flags & re.IGNORECASE:
+        return ''
+    literal = _REGEX_LITERAL_PREFIX.match(pattern)
+    if not literal:
+        return ''
+    prefix = literal.group(1)
+    # 直後に量指定子がある文字は省略されうる (例: "^L_a*")
+    if pattern[literal.end():literal.end() + 1] in ('*', '?', '{'):
+        prefix = prefix[:-1]
+    return prefix
+
+
+class PairingRule(object):
+    """オブジェクトとデフォーマーを名前で対応付けるルール。
+
+    glob ルールは、object_pattern に一致するオブジェクトを deformer_pattern
+    に一致するすべてのデフォーマーに接続する。regex ルールは、
+    object_pattern (正規表現) に一致したオブジェクトごとに deformer_pattern
+    をテンプレートとして展開し (\\1 などのグループ参照が使える)、
+    その名前のデフォーマーに接続する。
+    """
+
+    GLOB = 'glob'
+    REGEX = 'regex'
+
+    def __init__(self, object_pattern, deformer_pattern, kind=GLOB):
+        """初期化。
+
+        Args:
+            object_pattern (str): オブジェクト側のパターン
+            deformer_pattern (str): デフォーマー側のパターン
+            kind (str, optional): PairingRule.GLOB または PairingRule.REGEX
+
+        Raises:
+            ValueError: 正規表現が不正な場合
+        """
+        self.object_pattern = object_pattern
+        self.deformer_pattern = deformer_pattern
+        self.kind = kind
+        self.regex = None
+        if kind == self.REGEX:
+            try:
+                self.regex = re.compile(object_pattern)
+            except re.error as e:
+                raise ValueError(f"正規表現が不正です: {object_pattern} ({e})")
+
+    def __repr__(self):
+        return (f"PairingRule({self.object_pattern!r}, "
+                f"{self.deformer_pattern!r}, {self.kind!r})")
+
+    def to_text(self):
+        """parse_rules で読み込める1行の文字列にする。"""
+        prefix = 're: ' if self.kind == self.REGEX else ''
+        return f"{prefix}{self.object_pattern} -> {self.deformer_pattern}"
+
+    def pairs(self, object_index, deformer_index):
+        """ルールに一致する (デフォーマー番号, オブジェクト番号) を返す。"""
+        if self.kind == self.REGEX:
+            for object_number, match in object_index.match_regex(self.regex):
+                try:
+                    deformer_name = match.expand(self.deformer_pattern)
+                except (re.error, IndexError):
+                    continue
+                for deformer_number in deformer_index.exact.get(
+                        deformer_name, ()):
+                    yield deformer_number, object_number
+            return
+        deformer_numbers = deformer_index.match_glob(self.deformer_pattern)
+        if not deformer_numbers:
+            return
+        for object_number in object_index.match_glob(self.object_pattern):
+            for deformer_number in deformer_numbers:
+                yield deformer_number, object_number
+
+
+def parse_rules(text):
+    """テキストから名前ルールを読み込む。
+
+    1行に1ルールを "オブジェクトのパターン -> デフォーマーのパターン" の
+    形式で書く。"re:" で始まる行は正規表現ルールになる。空行と "#" で
+    始まる行は無視する。
+
+        L_* -> L_bend
+        re: ^([LR])_.*_geo$ -> \\1_bend
+
+    Args:
+        text (str): ルールのテキスト
+
+    Returns:
+        list: PairingRule のリスト
+
+    Raises:
+        ValueError: 書式が不正な行がある場合
+    """
+    rules = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        kind = PairingRule.GLOB
+        if line.startswith('re:'):
+            kind = PairingRule.REGEX
+            line = line[3:].strip()
+        if '->' not in line:
+            raise ValueError(f"{number}行目: '->' がありません: {line}")
+        object_pattern, deformer_pattern = (
+            part.strip() for part in line.rsplit('->', 1))
+        if not object_pattern or not deformer_pattern:
+            raise ValueError(f"{number}行目: パターンが空です: {line}")
+        try:
+            rules.append(PairingRule(object_pattern, deformer_pattern, kind))
+        except ValueError as e:
+            raise ValueError(f"{number}行目: {e}")
+    return rules
+
+
+def plan_pairs(objects, deformers, mode=PAIRING_ALL, rules=None):
+    """接続計画を作成する。
+
+    mode によってオブジェクトとデフォーマーの組み合わせを決める。
+
+    - PAIRING_ALL: すべてのオブジェクトをすべてのデフォーマーに接続する
+    - PAIRING_INDEX: 同じ順番のオブジェクトとデフォーマーを1対1で接続する。
+      数が違う場合は対応しない項目を黙って捨てずにエラーにする。
+    - PAIRING_RULES: rules (PairingRule のリスト) に一致する組み合わせだけ
+      接続する。照合には NameIndex を使う。
+
+    Args:
+        objects (list): 変形対象オブジェクト名のリスト
+        deformers (list): デフォーマー名のリスト
+        mode (str, optional): ペアリングモード
+        rules (list, optional): PAIRING_RULES で使う PairingRule のリスト
+
+    Returns:
+        list: (デフォーマー名, オブジェクト名のリスト) のリスト。
+            接続するオブジェクトがないデフォーマーは含まない。
+
+    Raises:
+        ValueError: 不明なモードの場合、または PAIRING_INDEX で
+            オブジェクトとデフォーマーの数が違う場合
+    """
+    with _phase('plan'):
+        objects = list(objects)
+        deformers = list(deformers)
+        if mode == PAIRING_ALL:
+            if not objects:
+                return []
+            return [(deformer, objects) for deformer in deformers]
+        if mode == PAIRING_INDEX:
+            if len(objects) != len(deformers):
+                raise ValueError(
+                    f"順番どおりの対応にはオブジェクトとデフォーマーが同じ数"
+                    f"必要です (オブジェクト {len(objects)}個, "
+                    f"デフォーマー {len(deformers)}個)")
+            return [
+                (deformer, [obj]) for obj, deformer in zip(objects, deformers)
+            ]
+        if mode != PAIRING_RULES:
+            raise ValueError(f"不明なペアリングモードです: {mode}")
+
+        object_index = NameIndex(objects)
+        deformer_index = NameIndex(deformers)
+        matched = collections.defaultdict(set)
+        for rule in rules or ():
+            for deformer_number, object_number in rule.pairs(
+                    object_index, deformer_index):
+                matched[deformer_number].add(object_number)
+        return [
+            (deformers[number], [objects[i] for i in sorted(matched[number])])
+            for number in sorted(matched)
+        ]
+
+
+def plan_records(objects, deformers, mode=PAIRING_ALL, rules=None):
+    """NodeRecord の一覧から接続計画を作成する。
+
+    ペアリング (名前ルールの照合など) は NodeRecord.pairing_name
+    (レシピから読み込んだレコードは保存時の名前、それ以外は表示名) で行い、
+    計画にはロングネームを入れる。削除済みのノードは除外する。data が
+    ComponentTarget のレコードは、そのコンポーネントを変形対象にする。
+
+    Args:
+        objects (list): 変形対象の NodeRecord のリスト
+        deformers (list): デフォーマーの NodeRecord のリスト
+        mode (str, optional): plan_pairs のペアリングモード
+        rules (list, optional): PAIRING_RULES で使う PairingRule のリスト
+
+    Returns:
+        list: plan_pairs と同じ形式の接続計画
+    """
+    paths = {}
+    names = []
+    for records in (objects, deformers):
+        alive = []
+        for record in records:
+            if record.alive:
+                name = record.pairing_name
+                path = record.path
+                if isinstance(record.data, ComponentTarget):
+                    name = record.data.on(name)
+                    path = record.data.on(path)
+                paths[name] = path
+                alive.append(name)
+        names.append(alive)
+    removed = len(objects) + len(deformers) - sum(len(n) for n in names)
+    if removed:
+        logger.warning("削除されたノード%d個を除外しました。", removed)
+    plan = plan_pairs(names[0], names[1], mode, rules)
+    return [
+        (paths[deformer], [paths[obj] for obj in objs])
+        for deformer, objs in plan
+    ]
+
+
+def _match_paths(nodes, paths):
+    """まとめて ls したロングネームを元のノード名に対応付ける。
+
+    ls は存在しないノードを飛ばし、重複する短い名前はすべて返すため、
+    結果の順番ではなく名前 (パスの末尾) で対応付ける。短い名前が
+    重複する場合は最初に一致したものを使う。
+
+    Args:
+        nodes (iterable): ls に渡したノード名
+        paths (list): ls が返したロングネームのリスト
+
+    Returns:
+        tuple: (元のノード名から paths の番号への辞書,
+            どのロングネームにも一致しなかったノード名のリスト)
+    """
+    by_suffix = {}
+    for index, path in enumerate(paths):
+        parts = path.split('|')
+        for start in range(len(parts)):
+            by_suffix.setdefault('|'.join(parts[start:]), index)
+    matched = {}
+    unmatched = []
+    for node in nodes:
+        index = by_suffix.get(node)
+        if index is None:
+            unmatched.append(node)
+        else:
+            matched[node] = index
+    return matched, unmatched
+
+
+def _node_types(nodes):
+    """ノード名をロングネームとノードタイプに変換する。
+
+    まとめて1回の ls で調べ、結果に対応するものがなかった名前
+    (存在しないノードなど) だけを1件ずつ調べ直す。
+
+    Args:
+        nodes (list): ノード名のリスト
+
+    Returns:
+        dict: 元のノード名から (ロングネーム, ノードタイプ) への辞書。
+            存在しないノードは含まない。
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return {}
+    typed = cmds.ls(nodes, long=True, showType=True) or []
+    matched, unmatched = _match_paths(nodes, typed[::2])
+    result = {
+        node: (typed[2 * index], typed[2 * index + 1])
+        for node, index in matched.items()
+    }
+    for node in unmatched:
+        typed = cmds.ls(node, long=True, showType=True) or []
+        if typed:
+            result[node] = (typed[0], typed[1])
+    return result
+
+
+def _inherits_deformer(node_type):
+    """inherits_deformer の結果を返す。不明なタイプは False とする。"""
+    try:
+        return classification_cache.inherits_deformer(node_type)
+    except RuntimeError:
+        return False
+
+
+def _deformable_base(node_type):
+    """deformable_base の結果を返す。不明なタイプは None とする。"""
+    try:
+        return classification_cache.deformable_base(node_type)
+    except RuntimeError:
+        return None
+
+
+def _resolve_deformers(deformers):
+    """デフォーマー名を、実際に接続するデフォーマーノードとタイプに解決する。
+
+    geometryFilter 派生のノードはそのまま使う。それ以外 (ハンドルや
+    強制追加したノード) は classify_nodes で接続先のデフォーマーに解決する。
+
+    Args:
+        deformers (list): デフォーマー名のリスト
+
+    Returns:
+        dict: 元の名前から (デフォーマーノード名, タイプ) への辞書。
+            デフォーマーに解決できないノードは含まない。
+    """
+    resolved = {}
+    others = []
+    for node, (_, node_type) in _node_types(deformers).items():
+        if _inherits_deformer(node_type):
+            resolved[node] = (node, node_type)
+        else:
+            others.append(node)
+    if others:
+        for node, (name, info) in zip(others, classify_nodes(others)):
+            if info['is_deformer'] and _inherits_deformer(info['type']):
+                resolved[node] = (name, info['type'])
+    return resolved
+
+
+def _target_shapes(objects):
+    """変形対象ごとのロングネームとシェイプのタイプを調べる。
+
+    対象そのものがシェイプの場合はそのタイプを、transform の場合は
+    中間オブジェクトでない子シェイプのタイプを使う。子シェイプは
+    listRelatives の1回の呼び出しでまとめて取得する。タイプは継承で
+    判定し (ClassificationCache.deformable_base)、bezierCurve などの
+    派生タイプは基底のタイプ (nurbsCurve) として扱う。
+
+    Args:
+        objects (list): 変形対象オブジェクト名のリスト
+
+    Returns:
+        dict: 元のオブジェクト名から (ロングネーム, シェイプタイプのタプル)
+            への辞書。存在しないオブジェクトは含まない。
+    """
+    typed = _node_types(objects)
+    bases = {
+        node_type: _deformable_base(node_type)
+        for node_type in set(t for _, t in typed.values())
+    }
+    parents = [
+        path for path, node_type in typed.values() if bases[node_type] is None
+    ]
+    children = collections.defaultdict(list)
+    if parents:
+        shapes = cmds.listRelatives(
+            parents, shapes=True, fullPath=True, noIntermediate=True) or []
+        typed_shapes = cmds.ls(shapes, long=True, showType=True) or []
+        for shape, shape_type in zip(typed_shapes[::2], typed_shapes[1::2]):
+            base = _deformable_base(shape_type)
+            if base is not None:
+                children[shape.rsplit('|', 1)[0]].append(base)
+    return {
+        obj: (path, (bases[node_type],) if bases[node_type] is not None
+              else tuple(children[path]))
+        for obj, (path, node_type) in typed.items()
+    }
+
+
+def _skin_owners():
+    """シーンの skinCluster ごとにバインドされているジオメトリを調べる。
+
+    skinCluster の列挙に ls を1回だけ使い、バインド先は outputGeometry の
+    接続を OpenMaya でたどって調べる (skinCluster ごとのコマンドは発行しない)。
+
+    Returns:
+        dict: ジオメトリ (シェイプと親 transform) のロングネームから
+            skinCluster 名への辞書
+    """
+    owners = {}
+    selection = om.MSelectionList()
+    for skin in cmds.ls(type='skinCluster') or []:
+        selection.add(skin)
+    for index in range(selection.length()):
+        fn_skin = om.MFnDependencyNode(selection.getDependNode(index))
+        name = fn_skin.name()
+        plug = fn_skin.findPlug('outputGeometry', False)
+        for element in range(plug.numElements()):
+            for destination in plug.elementByPhysicalIndex(
+                    element).destinations():
+                node = destination.node()
+                if not node.hasFn(om.MFn.kDagNode):
+                    continue
+                path = om.MDagPath.getAPathTo(node).fullPathName()
+                owners[path] = name
+                owners[path.rsplit('|', 1)[0]] = name
+    return owners
+
+
+def check_plan(plan):
+    """接続計画を実行前に検証し、接続できないペアを取り除く。
+
+    cmds.deformer の失敗 (RuntimeError) で接続できないペアを見つける
+    代わりに、変形対象ごとのシェイプのタイプとデフォーマーごとの対応
+    ジオメトリを1回ずつ調べ、編集コマンドを発行する前に次のペアを除外する。
+
+    - デフォーマーに解決できないノード (強制追加したノードなど)
+    - 存在しない、または変形できるシェイプを持たない変形対象
+    - デフォーマーが対応していないタイプのシェイプしか持たない変形対象
+    - 別の skinCluster に既にバインドされているジオメトリ (skinCluster の場合)
+
+    ハンドルは接続先のデフォーマーノードに置き換える。結果はそのまま
+    ドライランの結果として確認できる。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+
+    Returns:
+        dict: 検証結果
+            - plan (list): 接続できるペアだけの接続計画
+            - rejected (list): (デフォーマー, オブジェクト, 理由) のリスト
+            - deformers (dict): デフォーマー名から (接続先のノード名, タイプ)
+              への辞書
+            - targets (dict): オブジェクト名 (ComponentTarget はそのノード名)
+              から (ロングネーム, シェイプタイプのタプル) への辞書
+    """
+    with _phase('plan'):
+        deformers = _resolve_deformers(
+            dict.fromkeys(deformer for deformer, _ in plan))
+        targets = _target_shapes(dict.fromkeys(
+            target_node(obj) for _, objects in plan for obj in objects))
+        owners = {}
+        if any(t == 'skinCluster' for _, t in deformers.values()):
+            owners = _skin_owners()
+
+        accepted = []
+        rejected = []
+        for deformer, objects in plan:
+            if deformer not in deformers:
+                rejected.extend(
+                    (deformer, obj, "デフォーマーとして接続できません")
+                    for obj in objects)
+                continue
+            name, deformer_type = deformers[deformer]
+            supported = DEFORMER_GEOMETRY_TYPES.get(deformer_type)
+            compatible = []
+            for obj in objects:
+                node = target_node(obj)
+                if node not in targets:
+                    reason = "ノードが見つかりません"
+                else:
+                    path, shape_types = targets[node]
+                    # 既存のバインドと競合するのは skinCluster 同士だけ
+                    owner = None
+                    if deformer_type == 'skinCluster':
+                        owner = owners.get(path)
+                    if not shape_types:
+                        reason = "変形できるシェイプがありません"
+                    elif supported is not None and not any(
+                            t in supported for t in shape_types):
+                        reason = (f"{deformer_type} は "
+                                  f"{', '.join(shape_types)} に対応していません")
+                    elif owner is not None and owner != name:
+                        reason = f"既に {owner} にバインドされています"
+                    else:
+                        compatible.append(obj)
+                        continue
+                rejected.append((deformer, obj, reason))
+            if compatible:
+                accepted.append((name, compatible))
+
+        for deformer, obj, reason in rejected:
+            logger.debug("'%s' と '%s' は接続できません: %s",
+                         obj, deformer, reason)
+        if rejected:
+            logger.warning("接続できない%d組のペアを除外しました。", len(rejected))
+        return {
+            'plan': accepted,
+            'rejected': rejected,
+            'deformers': deformers,
+            'targets': targets
+        }
+
+
+def format_check(check, limit=20):
+    """check_plan の結果を確認用のテキストにする。
+
+    Args:
+        check (dict): check_plan の結果
+        limit (int, optional): 表示する除外ペアの最大数
+
+    Returns:
+        str: 整形済みのテキスト
+    """
+    lines = [
+        f"接続予定: {plan_size(check['plan'])}組 / "
+        f"除外: {len(check['rejected'])}組"
+    ]
+    for deformer, obj, reason in check['rejected'][:limit]:
+        lines.append(f"  {obj} -> {deformer}: {reason}")
+    if len(check['rejected']) > limit:
+        lines.append(f"  ...ほか {len(check['rejected']) - limit}組")
+    return '\n'.join(lines)
+
+
+def connect_geometry_batched(deformer, objects, chunk_size=DEFAULT_CHUNK_SIZE):
+    """複数のオブジェクトをまとめて1つのデフォーマーに接続する。
+
+    オブジェクトを chunk_size 個ずつのチャンクに分け、チャンクごとに
+    1回だけ cmds.deformer を呼び出す。チャンクの接続に失敗した場合は
+    チャンクを二分して再試行し、失敗したオブジェクトだけを特定する。
+
+    Args:
+        deformer (str): 接続先のデフォーマー名
+        objects (list): 接続するオブジェクト名のリスト
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+
+    Returns:
+        tuple: (成功したオブジェクトのリスト, (オブジェクト, エラー) のリスト)
+    """
+    succeeded = []
+    failed = []
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, len(objects), chunk_size):
+        _connect_chunk(
+            deformer, objects[start:start + chunk_size], succeeded, failed)
+    return succeeded, failed
+
+
+def _connect_chunk(deformer, chunk, succeeded, failed, remove=False):
+    """チャンクを接続し、失敗時は二分探索で失敗オブジェクトを絞り込む。
+
+    remove が True の場合は接続の代わりにデフォーマーから外す。
+    """
+    try:
+        if remove:
+            cmds.deformer(deformer, edit=True, remove=True, geometry=list(chunk))
+        else:
+            cmds.deformer(deformer, edit=True, geometry=list(chunk))
+    except RuntimeError as e:
+        if len(chunk) == 1:
+            failed.append((chunk[0], e))
+            return
+        middle = len(chunk) // 2
+        _connect_chunk(deformer, chunk[:middle], succeeded, failed, remove)
+        _connect_chunk(deformer, chunk[middle:], succeeded, failed, remove)
+    else:
+        succeeded.extend(chunk)
+
+
+def query_membership(deformer):
+    """デフォーマーに現在接続されているジオメトリを取得する。
+
+    Args:
+        deformer (str): デフォーマー名
+
+    Returns:
+        set: 出力シェイプとその親 transform のロングネームの集合。
+            デフォーマーでないノードの場合は空の集合。
+    """
+    try:
+        geometry = cmds.deformer(deformer, query=True, geometry=True) or []
+    except RuntimeError:
+        return set()
+    members = set()
+    for shape in cmds.ls(geometry, long=True) or []:
+        members.add(shape)
+        members.add(shape.rsplit('|', 1)[0])
+    return members
+
+
+def long_names(nodes):
+    """ノード名をロングネームに変換する。
+
+    まとめて1回の ls で変換し、結果に対応するものがなかった名前
+    (削除済みなど) だけを1件ずつ変換する。解決できないノードは元の
+    名前のまま返す。
+
+    Args:
+        nodes (list): ノード名のリスト
+
+    Returns:
+        dict: 元のノード名からロングネームへの辞書
+    """
+    # 既にロングネームのもの (NodeRecord のパスなど) は問い合わせない
+    result = {node: node for node in nodes if node.startswith('|')}
+    nodes = [node for node in nodes if not node.startswith('|')]
+    if not nodes:
+        return result
+    resolved = cmds.ls(nodes, long=True) or []
+    matched, unmatched = _match_paths(nodes, resolved)
+    result.update((node, resolved[index]) for node, index in matched.items())
+    result.update(
+        (node, (cmds.ls(node, long=True) or [node])[0]) for node in unmatched)
+    return result
+
+
+def _chunks(items, chunk_size):
+    """items を chunk_size 個ずつのリストに分ける。
+
+    chunk_size はチャンクごとに int() で読み直すため、AdaptiveChunkSize を
+    渡すと処理の途中でも大きさが変わる。
+    """
+    start = 0
+    while start < len(items):
+        size = max(1, int(chunk_size))
+        yield items[start:start + size]
+        start += size
+
+
+def new_apply_result():
+    """空の実行結果を作成する。
+
+    Returns:
+        dict: 実行結果
+            - created (int): 新しく作成した接続数
+            - present (int): 接続済みでスキップした数
+            - removed (int): デフォーマーから外した数
+            - absent (int): 未接続のため外さずにスキップした数
+            - error (int): 失敗した接続数
+            - failed (list): (デフォーマー, オブジェクト, エラー) のリスト
+            - rejected (list): check_plan で除外した
+              (デフォーマー, オブジェクト, 理由) のリスト
+            - cancelled (bool): 途中でキャンセルされたかどうか
+            - rolled_back (bool): キャンセル後に元に戻したかどうか
+    """
+    return {
+        'created': 0,
+        'present': 0,
+        'removed': 0,
+        'absent': 0,
+        'error': 0,
+        'failed': [],
+        'rejected': [],
+        'cancelled': False,
+        'rolled_back': False
+    }
+
+
+def plan_size(plan):
+    """接続計画に含まれるペアの総数を返す。"""
+    return sum(len(objects) for _, objects in plan)
+
+
+def iter_apply_plan(plan, result, chunk_size=DEFAULT_CHUNK_SIZE,
+                    skip_existing=True, on_connected=None):
+    """接続計画をチャンクごとに実行するジェネレーター。
+
+    チャンクを1つ処理するたびに result を更新し、進捗を yield する。
+    途中で反復をやめれば、そのチャンクの後で処理を中断できる。
+
+    skip_existing が True の場合、デフォーマーごとに現在の接続を1回だけ
+    問い合わせ、未接続のペアだけを接続する。変更のないシーンで再実行
+    してもデフォーマーごとの問い合わせ以外のコマンドは発行しない。
+
+    ComponentTarget はデフォーマーごとにまとめて、デフォーマーセットへの
+    1回の cmds.sets で追加する。skip_existing の場合はセットのメンバーを
+    1回だけ問い合わせ、すべて含まれている対象は present に数える。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+        result (dict): new_apply_result で作成した結果 (更新される)
+        chunk_size (int or AdaptiveChunkSize, optional): 1回のコマンドで渡す
+            最大オブジェクト数
+        skip_existing (bool, optional): 接続済みのペアをスキップするかどうか
+        on_connected (callable, optional): チャンクを接続するたびに
+            (デフォーマー, 新しく接続したオブジェクトのリスト) で呼ばれる関数。
+            ウェイトの初期化などの後処理に使う。
+
+    Yields:
+        tuple: (処理済みのペア数, ペアの総数)
+    """
+    with _phase('apply'):
+        total = plan_size(plan)
+        done = 0
+        paths = None
+        if skip_existing:
+            paths = long_names({
+                target_node(obj) for _, objects in plan for obj in objects})
+        for deformer, objects in plan:
+            objects, components = _split_components(objects)
+            if components:
+                succeeded = _apply_components(
+                    deformer, components, result, paths=paths)
+                if succeeded and on_connected is not None:
+                    on_connected(deformer, succeeded)
+                done += len(components)
+                if not objects:
+                    yield done, total
+                    continue
+            if skip_existing:
+                members = query_membership(deformer)
+                missing = [obj for obj in objects if paths[obj] not in members]
+                result['present'] += len(objects) - len(missing)
+                done += len(objects) - len(missing)
+                objects = missing
+            if not objects:
+                yield done, total
+                continue
+            created = 0
+            for chunk in _chunks(objects, chunk_size):
+                succeeded = []
+                failed = []
+                _connect_chunk(deformer, chunk, succeeded, failed)
+                created += len(succeeded)
+                result['created'] += len(succeeded)
+                for obj, e in failed:
+                    result['failed'].append((deformer, obj, e))
+                    logger.warning("'%s' を '%s' に追加できませんでした。%s",
+                                   obj, deformer, e)
+                result['error'] = len(result['failed'])
+                if succeeded and on_connected is not None:
+                    on_connected(deformer, succeeded)
+                done += len(chunk)
+                yield done, total
+            logger.info("%d個のオブジェクトをデフォーマー '%s' に追加しました。",
+                        created, deformer)
+
+
+def apply_plan(plan, chunk_size=DEFAULT_CHUNK_SIZE, skip_existing=True,
+               progress=None, on_connected=None):
+    """接続計画を実行する。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+        skip_existing (bool, optional): 接続済みのペアをスキップするかどうか
+        progress (ProgressReporter, optional): 進捗の通知先。
+            update が False を返すと次のチャンクの前で中断する。
+        on_connected (callable, optional): iter_apply_plan を参照
+
+    Returns:
+        dict: new_apply_result の形式の実行結果
+    """
+    result = new_apply_result()
+    return _drive(
+        iter_apply_plan(plan, result, chunk_size, skip_existing, on_connected),
+        result, plan_size(plan), progress)
+
+
+def _drive(steps, result, total, progress=None):
+    """チャンクごとのジェネレーターを最後まで (またはキャンセルまで) 進める。
+
+    Args:
+        steps (iterator): (処理済みのペア数, ペアの総数) を yield する反復子
+        result (dict): new_apply_result で作成した結果
+        total (int): 進捗の総数
+        progress (ProgressReporter, optional): 進捗の通知先
+
+    Returns:
+        dict: result
+    """
+    if progress is not None:
+        progress.start(total)
+    try:
+        for done, step_total in steps:
+            if progress is not None and not progress.update(done, step_total):
+                result['cancelled'] = True
+                break
+    finally:
+        if progress is not None:
+            progress.finish()
+    return result
+
+
+def iter_remove_plan(plan, result, chunk_size=DEFAULT_CHUNK_SIZE,
+                     on_removed=None):
+    """接続計画のペアをデフォーマーから外すジェネレーター。
+
+    デフォーマーごとに現在の接続を1回だけ問い合わせ (メンバーシップの
+    索引)、接続されていないペアは編集コマンドを発行せずにスキップする。
+    接続中のペアはデフォーマーごとにまとめ、chunk_size 個ずつ1回の
+    cmds.deformer(edit=True, remove=True) で外す。ComponentTarget は
+    デフォーマーセットから1回の cmds.sets でまとめて削除する。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+        result (dict): new_apply_result で作成した結果 (更新される)
+        chunk_size (int or AdaptiveChunkSize, optional): 1回のコマンドで渡す
+            最大オブジェクト数
+        on_removed (callable, optional): チャンクを外すたびに
+            (デフォーマー, 外したオブジェクトのリスト) で呼ばれる関数
+
+    Yields:
+        tuple: (処理済みのペア数, ペアの総数)
+    """
+    with _phase('remove'):
+        total = plan_size(plan)
+        done = 0
+        paths = long_names({
+            target_node(obj) for _, objects in plan for obj in objects})
+        for deformer, objects in plan:
+            members = query_membership(deformer)
+            connected = [
+                obj for obj in objects if paths[target_node(obj)] in members]
+            result['absent'] += len(objects) - len(connected)
+            done += len(objects) - len(connected)
+            connected, components = _split_components(connected)
+            if components:
+                succeeded = _apply_components(
+                    deformer, components, result, remove=True, paths=paths)
+                if succeeded and on_removed is not None:
+                    on_removed(deformer, succeeded)
+                done += len(components)
+            if not connected:
+                yield done, total
+                continue
+            removed = 0
+            for chunk in _chunks(connected, chunk_size):
+                succeeded = []
+                failed = []
+                _connect_chunk(deformer, chunk, succeeded, failed, remove=True)
+                removed += len(succeeded)
+                result['removed'] += len(succeeded)
+                for obj, e in failed:
+                    result['failed'].append((deformer, obj, e))
+                    logger.warning("'%s' を '%s' から外せませんでした。%s",
+                                   obj, deformer, e)
+                result['error'] = len(result['failed'])
+                if succeeded and on_removed is not None:
+                    on_removed(deformer, succeeded)
+                done += len(chunk)
+                yield done, total
+            logger.info("%d個のオブジェクトをデフォーマー '%s' から外しました。",
+                        removed, deformer)
+
+
+def iter_swap_plan(plan, replacements, result, chunk_size=DEFAULT_CHUNK_SIZE):
+    """接続計画のペアを別のデフォーマーに付け替えるジェネレーター。
+
+    元のデフォーマーから外せたオブジェクトだけを、replacements で
+    対応する新しいデフォーマーに接続する。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画 (元のデフォーマー)
+        replacements (dict): 元のデフォーマーから新しいデフォーマーへの辞書
+        result (dict): new_apply_result で作成した結果 (更新される)
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+
+    Yields:
+        tuple: (処理済みのステップ数, ステップの総数)。外す・接続するで
+            ペアごとに2ステップ。外せなかったペア (付け替え済みなど) は
+            接続しないため、外し終えた時点で総数を実際に接続する数に合わせる。
+    """
+    moved = collections.defaultdict(dict)
+
+    def on_removed(deformer, objects):
+        moved[replacements[deformer]].update(dict.fromkeys(objects))
+
+    plan = [(deformer, objects) for deformer, objects in plan
+            if deformer in replacements]
+    size = plan_size(plan)
+    total = 2 * size
+    for done, _ in iter_remove_plan(plan, result, chunk_size, on_removed):
+        yield done, total
+    add_plan = [(deformer, list(objects)) for deformer, objects in moved.items()]
+    total = size + plan_size(add_plan)
+    for done, _ in iter_apply_plan(add_plan, result, chunk_size):
+        yield size + done, total
+    yield total, total
+
+
+class ProgressReporter(object):
+    """apply_plan の進捗の通知先。
+
+    start / update / finish の順に呼び出される。update が False を返すと
+    処理はチャンクの区切りで中断される。処理速度と残り時間は
+    rate と eta で参照できる。
+    """
+
+    def __init__(self):
+        self.done = 0
+        self.total = 0
+        self._start_time = None
+
+    def start(self, total):
+        """処理の開始時に呼び出される。"""
+        self.done = 0
+        self.total = total
+        self._start_time = time.perf_counter()
+
+    def update(self, done, total):
+        """チャンクの処理後に呼び出される。
+
+        Returns:
+            bool: 処理を続ける場合 True
+        """
+        self.done = done
+        self.total = total
+        self.report()
+        return not self.is_cancelled()
+
+    def finish(self):
+        """処理の終了時 (中断時を含む) に呼び出される。"""
+
+    def report(self):
+        """進捗を表示する。サブクラスで実装する。"""
+
+    def is_cancelled(self):
+        """キャンセルが要求されているかどうか。"""
+        return False
+
+    @property
+    def elapsed(self):
+        """開始からの経過秒数。"""
+        if self._start_time is None:
+            return 0.0
+        return time.perf_counter() - self._start_time
+
+    @property
+    def rate(self):
+        """1秒あたりの処理ペア数。"""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """残り時間の見込み (秒)。見積もれない場合は None。"""
+        rate = self.rate
+        if rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / rate)
+
+    def message(self):
+        """進捗の説明文を返す。"""
+        text = f"{self.done}/{self.total} 組 ({self.rate:.0f} 組/秒"
+        eta = self.eta
+        if eta is not None:
+            text += f", 残り約 {eta:.0f} 秒"
+        return text + ")"
+
+
+class MayaProgress(ProgressReporter):
+    """Maya 本体での進捗表示。
+
+    インタラクティブセッションでは中断可能な progressWindow を表示する。
+    バッチモード (mayapy) ではウィンドウを出せないため、一定間隔で
+    進捗を標準出力に書き出す。
+    """
+
+    def __init__(self, title="FT Connect Deformer", interval=2.0):
+        """初期化。
+
+        Args:
+            title (str, optional): ウィンドウタイトル
+            interval (float, optional): バッチモードでの出力間隔 (秒)
+        """
+        super(MayaProgress, self).__init__()
+        self.title = title
+        self.interval = interval
+        self.interactive = not cmds.about(batch=True)
+        self._last_print = 0.0
+
+    def start(self, total):
+        super(MayaProgress, self).start(total)
+        if self.interactive:
+            cmds.progressWindow(
+                title=self.title, progress=0, maxValue=max(1, total),
+                status=self.message(), isInterruptable=True)
+
+    def report(self):
+        if self.interactive:
+            cmds.progressWindow(
+                edit=True, progress=self.done, status=self.message())
+        elif self.elapsed - self._last_print >= self.interval:
+            self._last_print = self.elapsed
+            print(self.message())
+
+    def is_cancelled(self):
+        return self.interactive and cmds.progressWindow(
+            query=True, isCancelled=True)
+
+    def finish(self):
+        if self.interactive:
+            cmds.progressWindow(endProgress=True)
+        else:
+            print(self.message())
+
+
+# キャンセル時の扱い
+ON_CANCEL_COMMIT = 'commit'
+ON_CANCEL_ROLLBACK = 'rollback'
+
+
+@contextlib.contextmanager
+def undo_chunk(chunk_name='FTConnectDeformer'):
+    """ブロック内のコマンドを1つのアンドゥチャンクにまとめる。
+
+    Args:
+        chunk_name (str, optional): アンドゥチャンク名
+
+    Yields:
+        bool: アンドゥが有効でチャンクを開いた場合 True
+    """
+    undo_enabled = cmds.undoInfo(query=True, state=True)
+    if undo_enabled:
+        cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+    try:
+        yield undo_enabled
+    finally:
+        if undo_enabled:
+            cmds.undoInfo(closeChunk=True)
+
+
+# fast_apply_context の入れ子の深さ
+_fast_apply_depth = 0
+
+
+@contextlib.contextmanager
+def fast_apply_context(chunk_name='FTConnectDeformer'):
+    """適用処理を高速化するコンテキストマネージャー。
+
+    ブロック内のコマンドを1つのアンドゥチャンクにまとめ、ビューポートの
+    再描画を停止し、評価マネージャーを DG モードに切り替えて評価グラフの
+    再構築を終了時の1回にまとめる。例外が発生しても元の状態に戻す。
+    入れ子で使用した場合は最も外側のブロックだけが状態を切り替える。
+
+        with fast_apply_context():
+            apply_plan(plan)
+
+    Args:
+        chunk_name (str, optional): アンドゥチャンク名
+    """
+    global _fast_apply_depth
+    if _fast_apply_depth:
+        _fast_apply_depth += 1
+        try:
+            yield
+        finally:
+            _fast_apply_depth -= 1
+        return
+
+    _fast_apply_depth = 1
+    interactive = not cmds.about(batch=True)
+    evaluation_mode = cmds.evaluationManager(query=True, mode=True)[0]
+    try:
+        with undo_chunk(chunk_name):
+            try:
+                if interactive:
+                    cmds.refresh(suspend=True)
+                if evaluation_mode != 'off':
+                    cmds.evaluationManager(mode='off')
+                yield
+            finally:
+                if evaluation_mode != 'off':
+                    cmds.evaluationManager(mode=evaluation_mode)
+                if interactive:
+                    cmds.refresh(suspend=False)
+    finally:
+        _fast_apply_depth = 0
+
+
+def _run_undoable(run, fast=True, on_cancel=ON_CANCEL_COMMIT,
+                  single_undo=False):
+    """run を実行し、キャンセル時の確定・取り消しを処理する。
+
+    on_cancel が ON_CANCEL_ROLLBACK の場合、または single_undo が True の
+    場合は処理全体を1つのアンドゥチャンクで実行する。ROLLBACK で
+    キャンセルされたらアンドゥで元に戻す。外側で fast_apply_context が
+    開かれている場合やアンドゥが無効な場合は元に戻せないため、
+    キャンセル前の結果がそのまま残る。
+
+    Args:
+        run (callable): new_apply_result の形式の結果を返す関数
+        fast (bool, optional): fast_apply_context 内で実行するかどうか
+        on_cancel (str, optional): ON_CANCEL_COMMIT または ON_CANCEL_ROLLBACK
+        single_undo (bool, optional): fast でなくても1つのアンドゥ操作に
+            まとめるかどうか
+
+    Returns:
+        dict: run の結果
+    """
+    can_rollback = (
+        on_cancel == ON_CANCEL_ROLLBACK
+        and not _fast_apply_depth
+        and cmds.undoInfo(query=True, state=True))
+    if fast:
+        context = fast_apply_context()
+    elif can_rollback or single_undo:
+        context = undo_chunk()
+    else:
+        context = contextlib.nullcontext()
+    with context:
+        result = run()
+    if result['cancelled'] and can_rollback:
+        cmds.undo()
+        result['rolled_back'] = True
+    return result
+
+
+def run_apply(plan, chunk_size=DEFAULT_CHUNK_SIZE, skip_existing=True,
+              fast=True, progress=None, on_cancel=ON_CANCEL_COMMIT,
+              check=True, on_connected=None):
+    """接続計画を実行し、キャンセル時の確定・取り消しを処理する。
+
+    check が True の場合は、実行前に check_plan で接続できないペアを
+    取り除き、結果の rejected に記録する。キャンセル時の扱いは
+    _run_undoable を参照。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+        skip_existing (bool, optional): 接続済みのペアをスキップするかどうか
+        fast (bool, optional): fast_apply_context 内で実行するかどうか
+        progress (ProgressReporter, optional): 進捗の通知先
+        on_cancel (str, optional): ON_CANCEL_COMMIT または ON_CANCEL_ROLLBACK
+        check (bool, optional): 実行前に check_plan で検証するかどうか
+        on_connected (callable, optional): iter_apply_plan を参照。
+            接続と同じアンドゥチャンクの中で呼ばれる。
+
+    Returns:
+        dict: new_apply_result の形式の実行結果
+    """
+    rejected = []
+    if check:
+        checked = check_plan(plan)
+        plan = checked['plan']
+        rejected = checked['rejected']
+    result = _run_undoable(
+        lambda: apply_plan(
+            plan, chunk_size, skip_existing, progress, on_connected),
+        fast, on_cancel)
+    result['rejected'] = rejected
+    return result
+
+
+def run_remove(plan, chunk_size=DEFAULT_CHUNK_SIZE, fast=True, progress=None,
+               on_cancel=ON_CANCEL_COMMIT):
+    """接続計画のペアをデフォーマーから外す。
+
+    未接続のペアはスキップし (結果の absent)、処理全体を1つのアンドゥ
+    操作にまとめる。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+        fast (bool, optional): fast_apply_context 内で実行するかどうか
+        progress (ProgressReporter, optional): 進捗の通知先
+        on_cancel (str, optional): ON_CANCEL_COMMIT または ON_CANCEL_ROLLBACK
+
+    Returns:
+        dict: new_apply_result の形式の実行結果
+    """
+    def run():
+        result = new_apply_result()
+        return _drive(iter_remove_plan(plan, result, chunk_size),
+                      result, plan_size(plan), progress)
+    return _run_undoable(run, fast, on_cancel, single_undo=True)
+
+
+def run_swap(plan, replacements, chunk_size=DEFAULT_CHUNK_SIZE, fast=True,
+             progress=None, on_cancel=ON_CANCEL_COMMIT):
+    """接続計画のペアを、元のデフォーマーから新しいデフォーマーに付け替える。
+
+    新しいデフォーマーに接続できないペア (check_plan で判定) は外さずに
+    結果の rejected に記録する。処理全体を1つのアンドゥ操作にまとめる。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画 (元のデフォーマー)
+        replacements (dict): 元のデフォーマーから新しいデフォーマーへの辞書
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+        fast (bool, optional): fast_apply_context 内で実行するかどうか
+        progress (ProgressReporter, optional): 進捗の通知先
+        on_cancel (str, optional): ON_CANCEL_COMMIT または ON_CANCEL_ROLLBACK
+
+    Returns:
+        dict: new_apply_result の形式の実行結果
+    """
+    plan = [(deformer, objects) for deformer, objects in plan
+            if deformer in replacements]
+    checked = check_plan(
+        [(replacements[deformer], objects) for deformer, objects in plan])
+    rejected = {(deformer, obj) for deformer, obj, _ in checked['rejected']}
+    plan = [
+        (deformer, [obj for obj in objects
+                    if (replacements[deformer], obj) not in rejected])
+        for deformer, objects in plan
+    ]
+    plan = [(deformer, objects) for deformer, objects in plan if objects]
+    # check_plan がハンドルを解決した場合に備えて、接続先は解決後の名前にする
+    resolved = {
+        deformer: name for deformer, (name, _) in checked['deformers'].items()
+    }
+    replacements = {
+        deformer: resolved.get(new, new)
+        for deformer, new in replacements.items()
+    }
+
+    def run():
+        result = new_apply_result()
+        return _drive(iter_swap_plan(plan, replacements, result, chunk_size),
+                      result, 2 * plan_size(plan), progress)
+    result = _run_undoable(run, fast, on_cancel, single_undo=True)
+    result['rejected'] = checked['rejected']
+    return result
+
+
+# 非同期実行で1回のスライスに使う時間の既定値 (秒)
+DEFAULT_SLICE_BUDGET = 0.05
+
+
+class AdaptiveChunkSize(object):
+    """計測した処理時間に合わせて変わるチャンクサイズ。
+
+    iter_apply_plan などの chunk_size に渡すと、チャンクごとに int() で
+    現在の値が読まれる。record で受け取った1ペアあたりの処理時間の
+    指数移動平均から、1チャンクが budget 秒に収まる大きさに調整する。
+
+    Args:
+        budget (float, optional): 1チャンクの目標の処理時間 (秒)
+        initial (int, optional): 計測前のチャンクサイズ
+        minimum (int, optional): 最小のチャンクサイズ
+        maximum (int, optional): 最大のチャンクサイズ
+        smoothing (float, optional): 新しい計測値の重み (0-1)
+    """
+
+    def __init__(self, budget=DEFAULT_SLICE_BUDGET, initial=50, minimum=1,
+                 maximum=DEFAULT_CHUNK_SIZE, smoothing=0.5):
+        self.budget = budget
+        self.minimum = minimum
+        self.maximum = maximum
+        self.smoothing = smoothing
+        self.size = max(minimum, min(maximum, initial))
+        self.per_item = None
+
+    def __int__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"AdaptiveChunkSize({self.size})"
+
+    def record(self, count, seconds):
+        """count 個のペアの処理に seconds 秒かかったことを記録する。"""
+        if count <= 0:
+            return
+        per_item = seconds / count
+        if self.per_item is None:
+            self.per_item = per_item
+        else:
+            self.per_item = (self.smoothing * per_item
+                             + (1.0 - self.smoothing) * self.per_item)
+        if self.per_item <= 0:
+            self.size = self.maximum
+            return
+        self.size = int(max(self.minimum, min(
+            self.maximum, self.budget / self.per_item)))
+
+
+class SlicedRun(object):
+    """チャンクごとのジェネレーターを時間で区切って少しずつ進める。
+
+    step を呼ぶたびに budget 秒を上限としてジェネレーターを進め、制御を
+    呼び出し元 (Qt のタイマーや Maya のアイドル処理) に返す。その間に
+    ダイアログの再描画や操作ができる。各スライスは1つのアンドゥチャンクに
+    まとめるため、元に戻す操作はスライス単位になる。
+
+    chunk_size に AdaptiveChunkSize を渡すと、ステップごとの処理時間を
+    記録してチャンクサイズを調整する。
+
+    on_cancel が ON_CANCEL_ROLLBACK の場合、キャンセルするとこれまでの
+    スライスのアンドゥチャンクを新しい順に元に戻す。スライスの合間に
+    ユーザーが別の操作をしていた場合は、アンドゥキューの先頭がスライスで
+    なくなった時点で止め、それより前の変更は残す。
+
+    Args:
+        steps (iterator): (処理済みのペア数, ペアの総数) を yield する反復子
+        result (dict): new_apply_result で作成した結果
+        total (int): 進捗の総数
+        chunk_size (AdaptiveChunkSize, optional): 処理時間を記録するチャンクサイズ
+        budget (float, optional): 1回のスライスの処理時間の上限 (秒)
+        progress (ProgressReporter, optional): 進捗の通知先
+        on_cancel (str, optional): ON_CANCEL_COMMIT または ON_CANCEL_ROLLBACK
+    """
+
+    # 各スライスのアンドゥチャンク名 (元に戻すときにアンドゥキューと照合する)
+    chunk_name = 'FTConnectDeformerSlice'
+
+    def __init__(self, steps, result, total, chunk_size=None,
+                 budget=DEFAULT_SLICE_BUDGET, progress=None,
+                 on_cancel=ON_CANCEL_COMMIT):
+        self.steps = steps
+        self.result = result
+        self.total = total
+        self.chunk_size = chunk_size
+        self.budget = budget
+        self.progress = progress
+        self.on_cancel = on_cancel
+        self.done = 0
+        self.slices = 0
+        self.undo_chunks = 0
+        self.started = False
+        self.finished = False
+        self.paused = False
+        self._cancel_requested = False
+
+    def pause(self):
+        """一時停止する。resume まで step は何もしない。"""
+        self.paused = True
+
+    def resume(self):
+        """一時停止を解除する。呼び出し元がスケジュールを再開する。"""
+        self.paused = False
+
+    def cancel(self):
+        """キャンセルを要求する。次の step で処理を終える。"""
+        self._cancel_requested = True
+        self.paused = False
+
+    def step(self):
+        """1回のスライスを実行する。
+
+        Returns:
+            bool: 続きがあり、次のスライスをスケジュールする必要がある場合 True。
+                完了・キャンセル・一時停止の場合は False。
+        """
+        if self.finished or self.paused:
+            return False
+        if not self.started:
+            self.started = True
+            if self.progress is not None:
+                self.progress.start(self.total)
+        self.slices += 1
+        deadline = time.perf_counter() + self.budget
+        recorded = False
+        # キャンセル済みの場合は空のアンドゥチャンクを作らない
+        if not self._cancel_requested:
+            with undo_chunk(self.chunk_name) as undo_enabled:
+                while not self._cancel_requested:
+                    start = time.perf_counter()
+                    before = self._work()
+                    try:
+                        done, total = next(self.steps)
+                    except StopIteration:
+                        self._finish()
+                        return False
+                    # 接続済みでスキップしたペアは編集も計測もしない
+                    work = self._work() - before
+                    if work and undo_enabled and not recorded:
+                        # シーンを編集したスライスだけを数える
+                        # (編集のないアンドゥチャンクは記録されない)
+                        self.undo_chunks += 1
+                        recorded = True
+                    if work and self.chunk_size is not None:
+                        self.chunk_size.record(
+                            work, time.perf_counter() - start)
+                    self.done = done
+                    if (self.progress is not None
+                            and not self.progress.update(done, total)):
+                        break
+                    if time.perf_counter() >= deadline:
+                        return True
+        self.result['cancelled'] = True
+        self._finish()
+        if self.on_cancel == ON_CANCEL_ROLLBACK:
+            self._rollback()
+        return False
+
+    def _work(self):
+        """これまでに接続・解除したペア (アンドゥできる編集) の数を返す。"""
+        return self.result['created'] + self.result['removed']
+
+    def _rollback(self):
+        """これまでのスライスのアンドゥチャンクを元に戻す。"""
+        undone = 0
+        while (undone < self.undo_chunks
+               and cmds.undoInfo(query=True, undoName=True) == self.chunk_name):
+            cmds.undo()
+            undone += 1
+        self.result['rolled_back'] = undone == self.undo_chunks
+        if not self.result['rolled_back']:
+            logger.warning(
+                "スライスの間に別の操作があったため、%d個中%d個のスライスだけを"
+                "元に戻しました。", self.undo_chunks, undone)
+
+    def _finish(self):
+        """ジェネレーターを閉じ、進捗表示を終える。"""
+        self.finished = True
+        self.steps.close()
+        if self.progress is not None:
+            self.progress.finish()
+        logger.info("%d回のスライスで処理しました。", self.slices)
+
+
+def async_apply(plan, skip_existing=True, progress=None, check=True,
+                on_connected=None, budget=DEFAULT_SLICE_BUDGET,
+                chunk_size=None, on_cancel=ON_CANCEL_COMMIT):
+    """接続計画を少しずつ実行する SlicedRun を作成する。
+
+    check_plan による検証だけはこの場で行い、接続は返した SlicedRun の
+    step を呼ぶたびに進む。chunk_size を省略した場合、チャンクサイズは
+    AdaptiveChunkSize で1回のスライスに収まるように調整する。Qt の
+    タイマーで step を呼ぶか、run_deferred で Maya のアイドル処理に任せる。
+
+    Args:
+        plan (list): plan_pairs が返す接続計画
+        skip_existing (bool, optional): 接続済みのペアをスキップするかどうか
+        progress (ProgressReporter, optional): 進捗の通知先
+        check (bool, optional): 実行前に check_plan で検証するかどうか
+        on_connected (callable, optional): iter_apply_plan を参照
+        budget (float, optional): 1回のスライスの処理時間の上限 (秒)
+        chunk_size (int, optional): 固定のチャンクサイズ。0 秒の budget と
+            組み合わせると1スライスに1チャンクずつ処理し、コマンドの
+            呼び出し回数が処理時間に左右されなくなる (ベンチマーク用)。
+        on_cancel (str, optional): ON_CANCEL_COMMIT または ON_CANCEL_ROLLBACK
+
+    Returns:
+        SlicedRun: 結果は完了後に result で参照する
+    """
+    result = new_apply_result()
+    if check:
+        checked = check_plan(plan)
+        plan = checked['plan']
+        result['rejected'] = checked['rejected']
+    adaptive = None
+    if chunk_size is None:
+        chunk_size = adaptive = AdaptiveChunkSize(budget)
+    steps = iter_apply_plan(
+        plan, result, chunk_size, skip_existing, on_connected)
+    return SlicedRun(
+        steps, result, plan_size(plan), adaptive, budget, progress, on_cancel)
+
+
+def run_deferred(run):
+    """SlicedRun を Maya のアイドル処理で最後まで進める。
+
+    スライスごとに maya.utils.executeDeferred で次のスライスを予約する。
+    一時停止した場合は予約をやめるため、resume の後にもう一度呼び出す。
+    バッチモードでは executeDeferred がその場で実行されるため、
+    スライスを順に実行する。
+
+    Args:
+        run (SlicedRun): 実行する処理
+    """
+    if cmds.about(batch=True):
+        while run.step():
+            pass
+        return
+
+    def step():
+        if run.step():
+            maya.utils.executeDeferred(step)
+    maya.utils.executeDeferred(step)
+
+
+def apply_deformers(objects, deformers, chunk_size=DEFAULT_CHUNK_SIZE,
+                    skip_existing=True, fast=False, progress=None,
+                    mode=PAIRING_ALL, rules=None, dry_run=False,
+                    on_connected=None):
+    """オブジェクトをデフォーマーに接続する。
+
+    既定ではすべてのオブジェクトをすべてのデフォーマーに接続する。
+    dry_run が True の場合は何も変更せず、check_plan の結果を返す。
+    objects にはコンポーネント名 ("pSphere1.vtx[0:99]") や ComponentTarget
+    も指定でき、コンポーネント名はノードごとに1つの対象にまとめる。
+
+    Args:
+        objects (list): 変形対象オブジェクト名のリスト
+        deformers (list): デフォーマー名のリスト
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+        skip_existing (bool, optional): 接続済みのペアをスキップするかどうか
+        fast (bool, optional): fast_apply_context 内で実行するかどうか
+        progress (ProgressReporter, optional): 進捗の通知先
+        mode (str, optional): plan_pairs のペアリングモード
+        rules (list, optional): PAIRING_RULES で使う PairingRule のリスト
+        dry_run (bool, optional): 検証だけを行うかどうか
+        on_connected (callable, optional): 新しく接続したペアの後処理。
+            iter_apply_plan を参照。
+
+    Returns:
+        dict: new_apply_result の形式の実行結果。
+            dry_run の場合は check_plan の結果。
+    """
+    objects = group_components(objects)
+    plan = plan_pairs(objects, deformers, mode, rules)
+    if dry_run:
+        return check_plan(plan)
+    return run_apply(
+        plan, chunk_size, skip_existing, fast=fast, progress=progress,
+        on_connected=on_connected)
+
+
+# レシピファイルの形式のバージョン
+RECIPE_VERSION = 1
+
+# gzip ファイルの先頭バイト
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# パスの各要素の先頭にある名前空間 ("ns:" や "ns:sub:")
+_NAMESPACE = re.compile(r'[^|:]*:')
+
+
+def _strip_namespaces(name):
+    """名前やパスの各要素から名前空間を取り除く。"""
+    return _NAMESPACE.sub('', name)
+
+
+class SceneLookup(object):
+    """シーンのノード名を1回の走査で索引化し、名前をまとめて解決する。
+
+    cmds.ls(long=True) の1回の呼び出しで得たノードについて、ロングネーム、
+    短い名前、名前空間を取り除いた名前 (短い名前とパスの両方) から
+    ロングネームへの索引を作る。レシピの名前を1件ずつ ls で問い合わせる
+    代わりに、この索引だけで解決する。
+
+    Args:
+        nodes (list, optional): 索引化するノードのロングネーム。
+            省略時はシーンのすべてのノード。
+    """
+
+    def __init__(self, nodes=None):
+        if nodes is None:
+            nodes = cmds.ls(long=True) or []
+        self.paths = set(nodes)
+        self.by_short = collections.defaultdict(list)
+        self.by_stripped = collections.defaultdict(list)
+        for path in self.paths:
+            self.by_short[path.rsplit('|', 1)[-1]].append(path)
+            stripped = _strip_namespaces(path)
+            self.by_stripped[stripped].append(path)
+            if '|' in stripped:
+                self.by_stripped[stripped.rsplit('|', 1)[-1]].append(path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def candidates(self, name):
+        """名前に一致するノードのロングネームを返す。
+
+        ロングネームの完全一致、短い名前 (または部分パス) の一致、
+        名前空間を無視した一致の順に探し、最初に見つかった候補を返す。
+
+        Args:
+            name (str): ノード名、部分パス、またはロングネーム
+
+        Returns:
+            list: 一致したロングネームのリスト (見つからなければ空)
+        """
+        if name in self.paths:
+            return [name]
+        short = name.rsplit('|', 1)[-1]
+        if '|' in name:
+            suffix = '|' + name.lstrip('|')
+            found = [p for p in self.by_short.get(short, ())
+                     if p.endswith(suffix)]
+        else:
+            found = list(self.by_short.get(name, ()))
+        if found:
+            return found
+        stripped = _strip_namespaces(name)
+        if '|' not in stripped:
+            return list(self.by_stripped.get(stripped, ()))
+        suffix = '|' + stripped.lstrip('|')
+        return [
+            p for p in self.by_stripped.get(stripped.rsplit('|', 1)[-1], ())
+            if _strip_namespaces(p).endswith(suffix)
+        ]
+
+    def resolve(self, names):
+        """複数の名前をまとめて解決する。
+
+        Args:
+            names (list): 解決する名前のリスト
+
+        Returns:
+            tuple: (元の名前からロングネームへの辞書,
+                見つからない名前のリスト, 一意に決まらない名前のリスト)
+        """
+        resolved = {}
+        missing = []
+        ambiguous = []
+        for name in names:
+            found = self.candidates(name)
+            if len(found) == 1:
+                resolved[name] = found[0]
+            elif found:
+                ambiguous.append(name)
+            else:
+                missing.append(name)
+        return resolved, missing, ambiguous
+
+
+def save_recipe(path, targets, deformers, mode=PAIRING_ALL, rules=None,
+                skip_existing=True):
+    """接続レシピを JSON で保存する。
+
+    パスが .gz で終わる場合は gzip で圧縮する。
+
+    ComponentTarget は範囲表記のコンポーネント名の文字列として保存する。
+
+    Args:
+        path (str): 保存先のパス
+        targets (list): 変形対象オブジェクト名 (または ComponentTarget) のリスト
+        deformers (list): デフォーマー名のリスト
+        mode (str, optional): plan_pairs のペアリングモード
+        rules (list, optional): PAIRING_RULES で使う PairingRule のリスト
+        skip_existing (bool, optional): 適用時に接続済みのペアをスキップするかどうか
+
+    Returns:
+        dict: 保存したレシピ
+    """
+    recipe = {
+        'version': RECIPE_VERSION,
+        'targets': [
+            name for target in targets
+            for name in (target.strings()
+                         if isinstance(target, ComponentTarget) else (target,))
+        ],
+        'deformers': list(deformers),
+        'pairing': {
+            'mode': mode,
+            'rules': [rule.to_text() for rule in rules or ()]
+        },
+        'skip_existing': skip_existing
+    }
+    if path.lower().endswith('.gz'):
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(recipe, f, ensure_ascii=False)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(recipe, f, ensure_ascii=False, indent=2)
+    return recipe
+
+
+def load_recipe(path):
+    """接続レシピ (JSON、gzip 圧縮も可) を読み込む。
+
+    レシピは変形対象とデフォーマーの一覧と、ペアリングの設定を持つ辞書:
+
+        {"targets": ["pCube1", "pCube2"], "deformers": ["cluster1"],
+         "pairing": {"mode": "rules", "rules": ["pCube* -> cluster1"]}}
+
+    pairing を省略した場合はすべてのオブジェクトをすべてのデフォーマーに
+    接続する。
+
+    Args:
+        path (str): レシピファイルのパス
+
+    Returns:
+        dict: targets, deformers, pairing を持つ辞書
+
+    Raises:
+        ValueError: 必須のキーがない場合、またはペアリングの設定が不正な場合
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    recipe = json.loads(data.decode('utf-8'))
+    for key in ('targets', 'deformers'):
+        if not isinstance(recipe.get(key), list):
+            raise ValueError(f"レシピに '{key}' のリストがありません: {path}")
+    pairing = recipe.setdefault('pairing', {})
+    pairing.setdefault('mode', PAIRING_ALL)
+    pairing.setdefault('rules', [])
+    if pairing['mode'] not in (PAIRING_ALL, PAIRING_INDEX, PAIRING_RULES):
+        raise ValueError(f"不明なペアリングモードです: {pairing['mode']}")
+    # 書式の誤りは適用時ではなく読み込み時に報告する
+    parse_rules('\n'.join(pairing['rules']))
+    return recipe
+
+
+def recipe_rules(recipe):
+    """レシピの名前ルールを PairingRule のリストとして返す。"""
+    return parse_rules('\n'.join(recipe['pairing']['rules']))
+
+
+def plan_recipe(recipe, lookup=None):
+    """レシピの接続計画を作り、名前を現在のシーンのノードに解決する。
+
+    ペアリングはレシピに保存された名前で行うため、名前空間が変わった
+    シーンでも名前ルールや順番どおりの対応が保たれる。名前の解決には
+    SceneLookup を使い、シーンの走査は1回だけ行う。コンポーネント名は
+    ノードとコンポーネントごとに ComponentTarget にまとめ、ノード名を
+    解決する。
+
+    Args:
+        recipe (dict): load_recipe で読み込んだレシピ
+        lookup (SceneLookup, optional): 名前の解決に使う索引。
+            省略時は現在のシーンから作成する。
+
+    Returns:
+        tuple: (ロングネームの接続計画,
+            解決できなかったペアの (デフォーマー, オブジェクト, 理由) のリスト)
+    """
+    targets = group_components(recipe['targets'])
+    plan = plan_pairs(
+        targets, recipe['deformers'],
+        recipe['pairing']['mode'], recipe_rules(recipe))
+    if lookup is None:
+        lookup = SceneLookup()
+    resolved, missing, ambiguous = lookup.resolve(dict.fromkeys(
+        [target_node(target) for target in targets] + recipe['deformers']))
+    reasons = dict.fromkeys(missing, "シーンに見つかりません")
+    reasons.update(dict.fromkeys(ambiguous, "名前が一意に決まりません"))
+    if reasons:
+        logger.warning("レシピの%d個の名前を解決できませんでした。", len(reasons))
+
+    resolved_plan = []
+    unresolved = []
+    for deformer, objects in plan:
+        if deformer in reasons:
+            unresolved.extend(
+                (deformer, obj, reasons[deformer]) for obj in objects)
+            continue
+        found = []
+        for obj in objects:
+            node = target_node(obj)
+            if node in reasons:
+                unresolved.append((deformer, obj, reasons[node]))
+            elif isinstance(obj, ComponentTarget):
+                found.append(obj.on(resolved[node]))
+            else:
+                found.append(resolved[obj])
+        if found:
+            resolved_plan.append((resolved[deformer], found))
+    return resolved_plan, unresolved
+
+
+def apply_recipe(recipe, chunk_size=DEFAULT_CHUNK_SIZE, fast=True,
+                 progress=None, dry_run=False, lookup=None):
+    """レシピを現在のシーンに適用する。
+
+    解決できなかった名前を含むペアは、実行結果の rejected に記録する。
+
+    Args:
+        recipe (dict): load_recipe で読み込んだレシピ
+        chunk_size (int, optional): 1回のコマンドで渡す最大オブジェクト数
+        fast (bool, optional): fast_apply_context 内で実行するかどうか
+        progress (ProgressReporter, optional): 進捗の通知先
+        dry_run (bool, optional): 検証だけを行うかどうか
+        lookup (SceneLookup, optional): 名前の解決に使う索引
+
+    Returns:
+        dict: new_apply_result の形式の実行結果。
+            dry_run の場合は check_plan の結果。
+    """
+    plan, unresolved = plan_recipe(recipe, lookup)
+    if dry_run:
+        result = check_plan(plan)
+    else:
+        result = run_apply(
+            plan, chunk_size, recipe.get('skip_existing', True),
+            fast=fast, progress=progress)
+    result['rejected'] = unresolved + result['rejected']
+    return result
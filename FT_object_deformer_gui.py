@@ -0,0 +1,1585 @@
+"""FT Connect Deformer のダイアログ。
+
+Qt に依存するため、show_connect_to_deformer_gui から必要になった時点で
+インポートされる。処理本体は FT_object_deformer_core に委譲する。
+"""
+import logging
+
+import maya.OpenMayaUI as omui
+import maya.utils
+
+import FT_object_deformer_core as core
+
+# PySide2/PySide6 互換インポート
+try:
+    from PySide2.QtWidgets import (
+        QDialog, QLabel, QListView, QLineEdit, QPushButton, QVBoxLayout,
+        QHBoxLayout, QGroupBox, QWidget, QAbstractItemView, QCheckBox,
+        QProgressBar, QComboBox, QApplication, QPlainTextEdit, QFileDialog,
+        QDoubleSpinBox
+    )
+    from PySide2.QtCore import (
+        Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QTimer
+    )
+    from shiboken2 import wrapInstance
+except ImportError:
+    from PySide6.QtWidgets import (
+        QDialog, QLabel, QListView, QLineEdit, QPushButton, QVBoxLayout,
+        QHBoxLayout, QGroupBox, QWidget, QAbstractItemView, QCheckBox,
+        QProgressBar, QComboBox, QApplication, QPlainTextEdit, QFileDialog,
+        QDoubleSpinBox
+    )
+    from PySide6.QtCore import (
+        Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QTimer
+    )
+    from shiboken6 import wrapInstance
+
+def maya_main_window():
+    """Mayaのメインウィンドウを取得する。
+    
+    Returns:
+        QWidget: Mayaのメインウィンドウ
+    """
+    main_window_ptr = omui.MQtUtil.mainWindow()
+    return wrapInstance(int(main_window_ptr), QWidget)
+
+
+class NodeListModel(QAbstractListModel):
+    """NodeStore を表示するリストモデル。
+
+    表示用の文字列は label_func で付加情報から生成する。
+    Qt.UserRole でストアのキー (ノードの UUID) を返す。
+    """
+
+    def __init__(self, store, label_func=None, parent=None):
+        """初期化。
+        
+        Args:
+            store (core.NodeStore): 表示するストア
+            label_func (callable, optional): (キー, 付加情報) から表示名を返す関数
+            parent (QObject, optional): 親オブジェクト
+        """
+        super(NodeListModel, self).__init__(parent)
+        self.store = store
+        self.label_func = label_func or (lambda key, data: key)
+
+    def add_nodes(self, nodes, data=None, saved_names=None):
+        """ノード名から core.NodeRecord を作成して追加する。
+        
+        Args:
+            nodes (list): ノード名のリスト
+            data (list, optional): 各ノードの付加情報のリスト
+            saved_names (list, optional): 各ノードのレシピに保存されていた名前
+            
+        Returns:
+            list: 新しく追加されたキー (UUID) のリスト
+        """
+        nodes = list(nodes)
+        records, missing = core.node_records(nodes, data)
+        for node in missing:
+            core.logger.warning("'%s' がシーンに見つかりません", node)
+        if saved_names is not None:
+            missing = set(missing)
+            found = [saved for node, saved in zip(nodes, saved_names)
+                     if node not in missing]
+            for record, saved in zip(records, found):
+                record.saved_name = saved
+        return self.add_items((record.uuid, record) for record in records)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.store.keys()[index.row()]
+        if role == Qt.DisplayRole:
+            return self.label_func(key, self.store.get(key))
+        if role == Qt.UserRole:
+            return key
+        return None
+
+    def add_items(self, items):
+        """項目をまとめて追加し、追加分の行を一度に挿入する。
+        
+        Args:
+            items (iterable): (キー, 付加情報) のイテラブル
+            
+        Returns:
+            list: 新しく追加されたキーのリスト
+        """
+        items = list(items)
+        first = len(self.store)
+        new_keys = [key for key, _ in items if key not in self.store]
+        if not new_keys:
+            return []
+        self.beginInsertRows(QModelIndex(), first, first + len(set(new_keys)) - 1)
+        added = self.store.add_many(items)
+        self.endInsertRows()
+        return added
+
+    def remove_keys(self, keys):
+        """項目をまとめて削除する。
+        
+        Args:
+            keys (iterable): 削除するキー
+            
+        Returns:
+            list: 実際に削除されたキーのリスト
+        """
+        self.beginResetModel()
+        removed = self.store.remove_many(keys)
+        self.endResetModel()
+        return removed
+
+    def clear(self):
+        """すべての項目を削除する。"""
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
+
+    def refresh_labels(self):
+        """すべての行の表示名を更新する (シグナルは1回だけ発行する)。"""
+        if len(self.store):
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self.store) - 1))
+
+
+class FilteredNodeList(QWidget):
+    """絞り込み欄付きのノード一覧。
+    
+    大量の項目でも軽快に動作するよう、行の高さを固定した QListView と
+    QSortFilterProxyModel で表示する。
+    """
+
+    def __init__(self, model, parent=None):
+        super(FilteredNodeList, self).__init__(parent)
+        self.model = model
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("フィルター...")
+        self.filter_edit.textChanged.connect(self.proxy.setFilterWildcard)
+
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setMaximumHeight(150)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.filter_edit)
+        layout.addWidget(self.view)
+
+    def selected_keys(self):
+        """ビューで選択されている項目のキーを返す。"""
+        return [
+            index.data(Qt.UserRole)
+            for index in self.view.selectionModel().selectedIndexes()
+        ]
+
+
+class DeformerFilterProxy(QSortFilterProxyModel):
+    """core.DeformerIndex.search の結果 (名前の部分一致とタイプ) で絞り込むプロキシ。
+    
+    表示名にはタイプやジオメトリ数も含まれるため、文字列の照合は
+    プロキシではなく索引の名前に対して行う。
+    """
+
+    def __init__(self, deformer_index, parent=None):
+        super(DeformerFilterProxy, self).__init__(parent)
+        self.deformer_index = deformer_index
+        self.text = ''
+        self.node_type = None
+        self.matches = None
+
+    def set_text(self, text):
+        """名前に含まれる文字列を設定する。"""
+        self.text = text
+        self.update_matches()
+
+    def set_node_type(self, node_type):
+        """表示するデフォーマータイプを設定する。None ならすべて表示する。"""
+        self.node_type = node_type
+        self.update_matches()
+
+    def update_matches(self):
+        """索引を検索し直して絞り込みを更新する (索引の更新後にも呼ぶ)。"""
+        if not self.text and self.node_type is None:
+            self.matches = None
+        else:
+            self.matches = {
+                entry['uuid'] for entry in self.deformer_index.search(
+                    self.text, self.node_type)
+            }
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matches is None:
+            return True
+        key = self.sourceModel().index(
+            source_row, 0, source_parent).data(Qt.UserRole)
+        return key in self.matches
+
+
+class DeformerBrowser(QGroupBox):
+    """シーンのすべてのデフォーマーを一覧表示するパネル。
+    
+    表示したときに core.DeformerIndex を1回の走査で作成し、以降は
+    コールバックで溜まった変更だけをアイドル時にまとめて反映する。
+    閉じている間はコールバックを登録しない。
+    """
+
+    def __init__(self, parent=None):
+        super(DeformerBrowser, self).__init__("シーンのデフォーマー", parent)
+        self.setCheckable(True)
+        self.setChecked(False)
+        self.deformer_index = core.DeformerIndex()
+        self.store = core.NodeStore()
+        self.model = NodeListModel(self.store, self.entry_label, self)
+        self.proxy = DeformerFilterProxy(self.deformer_index, self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.setDynamicSortFilter(True)
+        self._sync_scheduled = False
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("検索...")
+        self.type_combo = QComboBox()
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setMaximumHeight(150)
+        self.count_label = QLabel()
+        self.add_btn = QPushButton("選択したデフォーマーを追加")
+
+        self.content = QWidget()
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.search_edit)
+        filter_layout.addWidget(self.type_combo)
+        content_layout = QVBoxLayout(self.content)
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        content_layout.addLayout(filter_layout)
+        content_layout.addWidget(self.view)
+        footer_layout = QHBoxLayout()
+        footer_layout.addWidget(self.count_label)
+        footer_layout.addStretch()
+        footer_layout.addWidget(self.add_btn)
+        content_layout.addLayout(footer_layout)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.content)
+        self.content.setVisible(False)
+
+        self.search_edit.textChanged.connect(self.update_search)
+        self.type_combo.currentIndexChanged.connect(self.update_type_filter)
+        self.toggled.connect(self.set_active)
+
+    def entry_label(self, uuid, data):
+        """一覧の表示名を返す。
+        
+        例: "cluster1 (cluster) ジオメトリ: 3 ハンドル: cluster1Handle"
+        """
+        entry = self.deformer_index.entries.get(uuid)
+        if entry is None:
+            return uuid
+        label = (f"{entry['name']} ({entry['type']}) "
+                 f"ジオメトリ: {entry['geometry']}")
+        if entry['handle']:
+            label += f" ハンドル: {entry['handle']}"
+        return label
+
+    def set_active(self, active):
+        """索引の作成・コールバックの登録と解除を行う。"""
+        self.content.setVisible(active)
+        if active:
+            self.deformer_index.build()
+            self.deformer_index.install_callbacks()
+            self.deformer_index.add_listener(self.schedule_sync)
+            self.model.clear()
+            self.model.add_items(
+                (uuid, None) for uuid in self.deformer_index.entries)
+            self.proxy.sort(0)
+            self.update_types()
+        else:
+            self.stop()
+
+    def stop(self):
+        """コールバックを解除し、一覧を空にする。"""
+        self._sync_scheduled = False
+        self.deformer_index.remove_listener(self.schedule_sync)
+        self.deformer_index.remove_callbacks()
+        self.model.clear()
+
+    def schedule_sync(self):
+        """索引の更新をアイドル時に1回だけ行うよう予約する。"""
+        if not self._sync_scheduled:
+            self._sync_scheduled = True
+            maya.utils.executeDeferred(self.sync)
+
+    def sync(self):
+        """溜まった変更を索引と一覧に反映する。"""
+        if not self._sync_scheduled:
+            return
+        self._sync_scheduled = False
+        changed, removed = self.deformer_index.update()
+        if removed:
+            self.model.remove_keys(removed)
+        self.model.add_items(
+            (uuid, None) for uuid in changed if uuid not in self.store)
+        if changed:
+            self.model.refresh_labels()
+        self.update_types()
+
+    def update_types(self):
+        """タイプの絞り込み候補と件数の表示を更新する。"""
+        current = self.type_combo.currentData()
+        self.type_combo.blockSignals(True)
+        self.type_combo.clear()
+        self.type_combo.addItem("すべてのタイプ", None)
+        for node_type in self.deformer_index.types():
+            self.type_combo.addItem(node_type, node_type)
+        self.type_combo.setCurrentIndex(
+            max(0, self.type_combo.findData(current)))
+        self.type_combo.blockSignals(False)
+        self.update_type_filter()
+
+    def update_search(self, text):
+        """名前の部分一致 (大文字小文字を区別しない) で絞り込む。"""
+        self.proxy.set_text(text)
+        self.update_count()
+
+    def update_type_filter(self):
+        """選択中のタイプで絞り込む。"""
+        self.proxy.set_node_type(self.type_combo.currentData())
+        self.update_count()
+
+    def update_count(self):
+        """表示中の件数を更新する。"""
+        self.count_label.setText(
+            f"{self.proxy.rowCount()} / {len(self.deformer_index)}個")
+
+    def selected_entries(self):
+        """選択されているデフォーマーの情報を返す。"""
+        entries = []
+        for index in self.view.selectionModel().selectedIndexes():
+            entry = self.deformer_index.entries.get(index.data(Qt.UserRole))
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+
+class DialogProgress(core.ProgressReporter):
+    """ダイアログのプログレスバーに進捗を表示する。
+    
+    チャンクごとにイベントを処理し、キャンセルボタンの押下を受け付ける。
+    非同期実行中はイベントループに制御が戻るため、process_events を
+    False にしてイベントを処理しない。
+    """
+
+    def __init__(self, dialog):
+        super(DialogProgress, self).__init__()
+        self.dialog = dialog
+        self.cancelled = False
+        self.process_events = True
+
+    def start(self, total):
+        super(DialogProgress, self).start(total)
+        self.cancelled = False
+        self.dialog.progress_bar.setRange(0, max(1, total))
+        self.dialog.progress_bar.setValue(0)
+        self.dialog.progress_widget.setVisible(True)
+        if self.process_events:
+            QApplication.processEvents()
+
+    def report(self):
+        self.dialog.progress_bar.setValue(self.done)
+        self.dialog.progress_label.setText(self.message())
+        if self.process_events:
+            QApplication.processEvents()
+
+    def is_cancelled(self):
+        return self.cancelled
+
+    def cancel(self):
+        """キャンセルを要求する。次のチャンクの前で処理が止まる。"""
+        self.cancelled = True
+
+    def finish(self):
+        self.dialog.progress_widget.setVisible(False)
+
+
+class FTConnectDeformerGUI(QDialog):
+    def __init__(self, parent=None):
+        """初期化。
+        
+        Args:
+            parent (QWidget, optional): 親ウィジェット。デフォルトはMayaのメインウィンドウ。
+        """
+        if parent is None:
+            parent = maya_main_window()
+        super(FTConnectDeformerGUI, self).__init__(parent)
+        
+        self.setWindowTitle("FT Connect Deformer v1.0")
+        self.setWindowFlags(Qt.Window)
+        self.setMinimumSize(400, 500)
+        
+        # データ格納用ストア (UUID から core.NodeRecord への挿入順の辞書)
+        self.stored_objects = core.NodeStore()
+        self.stored_deformers = core.NodeStore()
+        self.objects_model = NodeListModel(
+            self.stored_objects, self.object_label, parent=self)
+        self.deformers_model = NodeListModel(
+            self.stored_deformers, self.deformer_label, parent=self)
+        
+        self.create_widgets()
+        self.create_layouts()
+        self.create_connections()
+        
+        self.update_pair_count()
+        self.update_weight_widgets()
+        
+        # ダイアログ表示中はノードのパスをキャッシュする
+        core.node_registry.install_callbacks()
+        
+        # 追加したノードの削除・リネームをリストに反映する
+        self._sync_scheduled = False
+        self._cleaned_up = False
+        core.node_registry.add_listener(self.schedule_scene_sync)
+        
+    def create_widgets(self):
+        """UIウィジェットを作成する。"""
+        # オブジェクトセクション
+        self.objects_label = QLabel("変形対象オブジェクト:")
+        self.objects_list = FilteredNodeList(self.objects_model)
+        self.add_objects_btn = QPushButton("選択したオブジェクトを追加")
+        self.add_components_btn = QPushButton("選択したコンポーネントを追加")
+        self.add_hierarchy_btn = QPushButton("階層から追加")
+        self.remove_objects_btn = QPushButton("選択項目を削除")
+        
+        # 階層から追加のオプション
+        self.hierarchy_group = QGroupBox("階層から追加のオプション")
+        self.hierarchy_group.setCheckable(True)
+        self.hierarchy_group.setChecked(False)
+        self.shape_type_cbs = {}
+        for shape_type in core.DEFORMABLE_SHAPE_TYPES:
+            checkbox = QCheckBox(shape_type)
+            checkbox.setChecked(True)
+            self.shape_type_cbs[shape_type] = checkbox
+        self.name_pattern_edit = QLineEdit()
+        self.name_pattern_edit.setPlaceholderText("名前のパターン (例: L_*)")
+        self.intermediate_cb = QCheckBox("中間オブジェクトを含める")
+        self.visible_only_cb = QCheckBox("表示中のみ")
+        
+        # デフォーマーセクション
+        self.deformers_label = QLabel("デフォーマー:")
+        self.deformers_list = FilteredNodeList(self.deformers_model)
+        self.add_deformers_btn = QPushButton("選択したデフォーマーを追加")
+        self.force_add_btn = QPushButton("強制追加（検証なし）")
+        self.force_add_btn.setStyleSheet(
+            "QPushButton { "
+            "background-color: #FF9800; "
+            "color: white; "
+            "}")
+        self.remove_deformers_btn = QPushButton("選択項目を削除")
+        self.deformer_browser = DeformerBrowser()
+        
+        # ペアリング
+        self.pairing_combo = QComboBox()
+        self.pairing_combo.addItem("すべてのオブジェクト × すべてのデフォーマー", 
+                                   core.PAIRING_ALL)
+        self.pairing_combo.addItem("順番どおりに1対1", core.PAIRING_INDEX)
+        self.pairing_combo.addItem("名前ルール", core.PAIRING_RULES)
+        self.rules_edit = QPlainTextEdit()
+        self.rules_edit.setPlaceholderText(
+            "1行に1ルール (オブジェクト -> デフォーマー)\n"
+            "L_* -> L_bend\n"
+            "re: ^([LR])_.*_geo$ -> \\1_bend")
+        self.rules_edit.setMaximumHeight(80)
+        self.rules_edit.setVisible(False)
+        self.pair_count_label = QLabel()
+        self.dry_run_btn = QPushButton("ドライラン")
+        self.dry_run_btn.setToolTip(
+            "シーンを変更せずに、接続できないペアとその理由を確認します")
+        self.check_text = QPlainTextEdit()
+        self.check_text.setReadOnly(True)
+        self.check_text.setMaximumHeight(120)
+        self.check_text.setVisible(False)
+        # 入力中に何度も計画を作り直さないよう、更新をまとめる
+        self.pair_count_timer = QTimer(self)
+        self.pair_count_timer.setSingleShot(True)
+        self.pair_count_timer.setInterval(200)
+        
+        # 実行オプション
+        self.fast_apply_cb = QCheckBox("高速適用（1回の操作で元に戻す）")
+        self.fast_apply_cb.setChecked(True)
+        self.fast_apply_cb.setToolTip(
+            "適用中はビューポートの再描画と評価グラフの再構築を止め、"
+            "すべての接続を1つのアンドゥ操作にまとめます")
+        self.async_apply_cb = QCheckBox("非同期で適用（実行中もダイアログを操作可能）")
+        self.async_apply_cb.setToolTip(
+            "処理を短い時間に区切って少しずつ実行します。"
+            "一時停止でき、元に戻す操作は区切りごとになります")
+        # 非同期実行のスライスを1つずつイベントループから呼び出す
+        self.async_run = None
+        self.async_initializer = None
+        self.async_timer = QTimer(self)
+        self.async_timer.setInterval(0)
+        
+        # ウェイトの初期化 (NumPy が必要)
+        self.weights_group = QGroupBox("ウェイトの初期化")
+        self.weights_group.setCheckable(True)
+        self.weights_group.setChecked(False)
+        self.weights_group.setToolTip(
+            "新しく接続したジオメトリのウェイトを適用後にまとめて設定します "
+            "(NumPy が必要です)")
+        self.weight_mode_combo = QComboBox()
+        self.weight_mode_combo.addItem("一定値", 'constant')
+        self.weight_mode_combo.addItem("ハンドルからの減衰", 'falloff')
+        self.weight_mode_combo.addItem("参照メッシュからコピー（最近傍）", 'closest')
+        self.weight_value_spin = QDoubleSpinBox()
+        self.weight_value_spin.setRange(0.0, 1.0)
+        self.weight_value_spin.setSingleStep(0.1)
+        self.weight_value_spin.setValue(1.0)
+        self.weight_radius_spin = QDoubleSpinBox()
+        self.weight_radius_spin.setRange(0.001, 1000000.0)
+        self.weight_radius_spin.setValue(1.0)
+        self.weight_radius_spin.setPrefix("半径: ")
+        self.weight_reference_edit = QLineEdit()
+        self.weight_reference_edit.setPlaceholderText("参照メッシュ")
+        self.weight_reference_btn = QPushButton("選択を設定")
+        
+        # 診断オプション
+        self.log_cb = QCheckBox("ログを出力")
+        self.log_cb.setToolTip(
+            "接続結果を Script Editor に出力します (まとめて書き出します)")
+        self.debug_log_cb = QCheckBox("デバッグ")
+        self.debug_log_cb.setEnabled(False)
+        self.profile_cb = QCheckBox("プロファイル")
+        self.profile_cb.setToolTip(
+            "Maya コマンドの呼び出し回数と所要時間を記録します")
+        self.profile_text = QPlainTextEdit()
+        self.profile_text.setReadOnly(True)
+        self.profile_text.setMaximumHeight(120)
+        self.profile_text.setVisible(False)
+        self.export_profile_btn = QPushButton("レポートを書き出す")
+        self.export_profile_btn.setVisible(False)
+        
+        self.on_cancel_combo = QComboBox()
+        self.on_cancel_combo.addItem("キャンセル時: 処理済みの接続を残す", 
+                                     core.ON_CANCEL_COMMIT)
+        self.on_cancel_combo.addItem("キャンセル時: すべて元に戻す", 
+                                     core.ON_CANCEL_ROLLBACK)
+        
+        # 進捗表示 (適用中のみ表示)
+        self.progress_widget = QWidget()
+        self.progress_bar = QProgressBar()
+        self.progress_label = QLabel()
+        self.cancel_btn = QPushButton("キャンセル")
+        self.pause_btn = QPushButton("一時停止")
+        self.pause_btn.setVisible(False)
+        self.progress_widget.setVisible(False)
+        self.progress = DialogProgress(self)
+        
+        # 実行ボタン
+        self.apply_btn = QPushButton("デフォーマーを適用")
+        self.apply_btn.setStyleSheet(
+            "QPushButton { "
+            "background-color: #4CAF50; "
+            "color: white; "
+            "font-weight: bold; "
+            "padding: 8px; "
+            "}")
+        
+        # 解除・付け替えボタン
+        self.remove_btn = QPushButton("デフォーマーから外す")
+        self.remove_btn.setToolTip(
+            "ペアリングに一致する接続を解除します (未接続のペアはスキップ)")
+        self.swap_btn = QPushButton("選択したデフォーマーに付け替え")
+        self.swap_btn.setToolTip(
+            "デフォーマーリストで選択した1つのデフォーマーに、"
+            "他のデフォーマーの接続を移します")
+        
+        # リセットボタン
+        self.reset_btn = QPushButton("リセット")
+        self.reset_btn.setStyleSheet(
+            "QPushButton { "
+            "background-color: #f44336; "
+            "color: white; "
+            "padding: 8px; "
+            "}")
+        
+        # レシピの保存・読み込み
+        self.save_recipe_btn = QPushButton("レシピを保存")
+        self.load_recipe_btn = QPushButton("レシピを読み込む")
+        
+        # 閉じるボタン
+        self.close_btn = QPushButton("閉じる")
+        
+        # ステータスラベル
+        self.status_label = QLabel("準備完了")
+        self.status_label.setStyleSheet(
+            "QLabel { "
+            "color: #333; "
+            "padding: 5px; "
+            "}")
+        
+    def create_layouts(self):
+        """UIレイアウトを作成する。"""
+        main_layout = QVBoxLayout(self)
+        
+        # オブジェクトセクション
+        objects_group = QGroupBox("変形対象オブジェクト")
+        objects_layout = QVBoxLayout()
+        objects_layout.addWidget(self.objects_list)
+        
+        objects_btn_layout = QHBoxLayout()
+        objects_btn_layout.addWidget(self.add_objects_btn)
+        objects_btn_layout.addWidget(self.add_components_btn)
+        objects_btn_layout.addWidget(self.add_hierarchy_btn)
+        objects_btn_layout.addWidget(self.remove_objects_btn)
+        objects_layout.addLayout(objects_btn_layout)
+        
+        hierarchy_layout = QVBoxLayout()
+        shape_types_layout = QHBoxLayout()
+        for checkbox in self.shape_type_cbs.values():
+            shape_types_layout.addWidget(checkbox)
+        hierarchy_layout.addLayout(shape_types_layout)
+        hierarchy_layout.addWidget(self.name_pattern_edit)
+        hierarchy_filter_layout = QHBoxLayout()
+        hierarchy_filter_layout.addWidget(self.intermediate_cb)
+        hierarchy_filter_layout.addWidget(self.visible_only_cb)
+        hierarchy_layout.addLayout(hierarchy_filter_layout)
+        self.hierarchy_group.setLayout(hierarchy_layout)
+        objects_layout.addWidget(self.hierarchy_group)
+        
+        objects_group.setLayout(objects_layout)
+        main_layout.addWidget(objects_group)
+        
+        # デフォーマーセクション
+        deformers_group = QGroupBox("デフォーマー")
+        deformers_layout = QVBoxLayout()
+        deformers_layout.addWidget(self.deformers_list)
+        
+        deformers_btn_layout = QHBoxLayout()
+        deformers_btn_layout.addWidget(self.add_deformers_btn)
+        deformers_btn_layout.addWidget(self.force_add_btn)
+        deformers_btn_layout.addWidget(self.remove_deformers_btn)
+        deformers_layout.addLayout(deformers_btn_layout)
+        deformers_layout.addWidget(self.deformer_browser)
+        
+        deformers_group.setLayout(deformers_layout)
+        main_layout.addWidget(deformers_group)
+        
+        # ペアリングセクション
+        pairing_group = QGroupBox("ペアリング")
+        pairing_layout = QVBoxLayout()
+        pairing_layout.addWidget(self.pairing_combo)
+        pairing_layout.addWidget(self.rules_edit)
+        pair_count_layout = QHBoxLayout()
+        pair_count_layout.addWidget(self.pair_count_label)
+        pair_count_layout.addStretch()
+        pair_count_layout.addWidget(self.dry_run_btn)
+        pairing_layout.addLayout(pair_count_layout)
+        pairing_layout.addWidget(self.check_text)
+        pairing_group.setLayout(pairing_layout)
+        main_layout.addWidget(pairing_group)
+        
+        # 実行ボタンセクション
+        main_layout.addWidget(self.fast_apply_cb)
+        main_layout.addWidget(self.async_apply_cb)
+        weights_layout = QHBoxLayout()
+        weights_layout.addWidget(self.weight_mode_combo)
+        weights_layout.addWidget(self.weight_value_spin)
+        weights_layout.addWidget(self.weight_radius_spin)
+        weights_layout.addWidget(self.weight_reference_edit)
+        weights_layout.addWidget(self.weight_reference_btn)
+        self.weights_group.setLayout(weights_layout)
+        main_layout.addWidget(self.weights_group)
+        diagnostics_layout = QHBoxLayout()
+        diagnostics_layout.addWidget(self.log_cb)
+        diagnostics_layout.addWidget(self.debug_log_cb)
+        diagnostics_layout.addWidget(self.profile_cb)
+        diagnostics_layout.addStretch()
+        diagnostics_layout.addWidget(self.export_profile_btn)
+        main_layout.addLayout(diagnostics_layout)
+        main_layout.addWidget(self.profile_text)
+        main_layout.addWidget(self.on_cancel_combo)
+        main_layout.addWidget(self.apply_btn)
+        edit_btn_layout = QHBoxLayout()
+        edit_btn_layout.addWidget(self.remove_btn)
+        edit_btn_layout.addWidget(self.swap_btn)
+        main_layout.addLayout(edit_btn_layout)
+        
+        # 進捗セクション
+        progress_layout = QHBoxLayout(self.progress_widget)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.pause_btn)
+        progress_layout.addWidget(self.cancel_btn)
+        main_layout.addWidget(self.progress_widget)
+        
+        # 下部ボタン
+        bottom_btn_layout = QHBoxLayout()
+        bottom_btn_layout.addWidget(self.reset_btn)
+        bottom_btn_layout.addWidget(self.save_recipe_btn)
+        bottom_btn_layout.addWidget(self.load_recipe_btn)
+        bottom_btn_layout.addStretch()
+        bottom_btn_layout.addWidget(self.close_btn)
+        main_layout.addLayout(bottom_btn_layout)
+        
+        # ステータス
+        main_layout.addWidget(self.status_label)
+        
+    def create_connections(self):
+        """シグナルとスロットを接続する。"""
+        # オブジェクト関連ボタン
+        self.add_objects_btn.clicked.connect(self.add_selected_objects)
+        self.add_components_btn.clicked.connect(self.add_selected_components)
+        self.add_hierarchy_btn.clicked.connect(self.add_hierarchy_shapes)
+        self.remove_objects_btn.clicked.connect(self.remove_selected_objects)
+        
+        # デフォーマー関連ボタン
+        self.add_deformers_btn.clicked.connect(self.add_selected_deformers)
+        self.force_add_btn.clicked.connect(self.force_add_deformers)
+        self.remove_deformers_btn.clicked.connect(self.remove_selected_deformers)
+        
+        # ペアリング
+        self.pairing_combo.currentIndexChanged.connect(
+            self.update_pairing_widgets)
+        self.rules_edit.textChanged.connect(self.pair_count_timer.start)
+        for model in (self.objects_model, self.deformers_model):
+            model.rowsInserted.connect(self.pair_count_timer.start)
+            model.modelReset.connect(self.pair_count_timer.start)
+        self.pair_count_timer.timeout.connect(self.update_pair_count)
+        self.dry_run_btn.clicked.connect(self.dry_run)
+        
+        # ウェイトの初期化
+        self.weight_mode_combo.currentIndexChanged.connect(
+            self.update_weight_widgets)
+        self.weight_reference_btn.clicked.connect(self.set_weight_reference)
+        
+        # 実行・制御ボタン
+        self.apply_btn.clicked.connect(self.apply_deformers)
+        self.remove_btn.clicked.connect(self.remove_deformers)
+        self.swap_btn.clicked.connect(self.swap_deformers)
+        self.cancel_btn.clicked.connect(self.cancel_operation)
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.async_timer.timeout.connect(self.step_async_apply)
+        self.reset_btn.clicked.connect(self.reset_all)
+        self.deformer_browser.add_btn.clicked.connect(self.add_browser_deformers)
+        self.save_recipe_btn.clicked.connect(self.save_recipe)
+        self.load_recipe_btn.clicked.connect(self.load_recipe)
+        self.close_btn.clicked.connect(self.close)
+        
+        # 診断オプション
+        self.log_cb.toggled.connect(self.update_logging)
+        self.debug_log_cb.toggled.connect(self.update_logging)
+        self.profile_cb.toggled.connect(self.toggle_profiling)
+        self.export_profile_btn.clicked.connect(self.export_profile)
+        
+    def add_selected_objects(self):
+        """選択したオブジェクトをリストに追加する。"""
+        selection = core.collect_selected_objects()
+        if not selection:
+            self.update_status(
+                "オブジェクトが選択されていません", "warning")
+            return
+            
+        added_count = len(
+            self.objects_model.add_nodes(selection))
+                
+        if added_count > 0:
+            self.update_status(
+                f"{added_count}個のオブジェクトを追加しました", 
+                "success")
+        else:
+            self.update_status(
+                "既に追加済みのオブジェクトです", "info")
+            
+    def add_selected_components(self):
+        """選択したコンポーネントを範囲のままリストに追加する。
+        
+        ノードごとに1項目とし、既にリストにあるノードは新しい選択の
+        コンポーネントで置き換える。
+        """
+        targets = core.collect_selected_components()
+        if not targets:
+            self.update_status(
+                "コンポーネントが選択されていません", "warning")
+            return
+            
+        records, missing = core.node_records(
+            [target.node for target in targets], targets)
+        for node in missing:
+            core.logger.warning("'%s' がシーンに見つかりません", node)
+        existing = [
+            record.uuid for record in records
+            if record.uuid in self.stored_objects
+        ]
+        if existing:
+            self.objects_model.remove_keys(existing)
+        self.objects_model.add_items(
+            (record.uuid, record) for record in records)
+        count = sum(target.count() for target in targets)
+        self.update_status(
+            f"{len(records)}個のノードのコンポーネント ({count}個) を追加しました", 
+            "success")
+            
+    def add_hierarchy_shapes(self):
+        """選択したルート以下の変形可能なシェイプをまとめて追加する。"""
+        shape_types = [
+            shape_type for shape_type, checkbox in self.shape_type_cbs.items()
+            if checkbox.isChecked()
+        ]
+        shapes = core.collect_deformable_shapes(
+            shape_types=shape_types,
+            name_pattern=self.name_pattern_edit.text().strip() or None,
+            include_intermediate=self.intermediate_cb.isChecked(),
+            visible_only=self.visible_only_cb.isChecked())
+        if not shapes:
+            self.update_status(
+                "選択した階層に対象のシェイプがありません", "warning")
+            return
+            
+        added_count = len(
+            self.objects_model.add_nodes(shapes))
+        if added_count > 0:
+            self.update_status(
+                f"{added_count}個のシェイプを追加しました", 
+                "success")
+        else:
+            self.update_status(
+                "既に追加済みのシェイプです", "info")
+            
+    def remove_selected_objects(self):
+        """選択したオブジェクトをリストから削除する。"""
+        keys = self.objects_list.selected_keys()
+        if keys:
+            self.objects_model.remove_keys(keys)
+            self.update_status(
+                f"{len(keys)}個のオブジェクトを削除しました", "info")
+        else:
+            self.update_status(
+                "削除するアイテムを選択してください", "warning")
+            
+    def add_selected_deformers(self):
+        """選択したデフォーマーをリストに追加する。"""
+        classified = core.collect_selected_deformers()
+        if not classified:
+            self.update_status(
+                "デフォーマーが選択されていません", "warning")
+            return
+            
+        valid = []
+        for item, deformer_result in classified:
+            if deformer_result['is_deformer']:
+                valid.append((item, deformer_result['type']))
+            else:
+                # デバッグ情報を表示
+                core.logger.debug(
+                    "'%s' のタイプは '%s' です", item, deformer_result['type'])
+                self.update_status(
+                    f"'{item}' は有効なデフォーマーではありません "
+                    f"(タイプ: {deformer_result['type']})", 
+                    "warning")
+        
+        added_count = len(self.deformers_model.add_nodes(
+            [item for item, _ in valid],
+            [deformer_type for _, deformer_type in valid]))
+        skipped_count = len(valid) - added_count
+                
+        if added_count > 0:
+            self.update_status(
+                f"{added_count}個のデフォーマーを追加しました", 
+                "success")
+        elif skipped_count > 0:
+            self.update_status(
+                "既に追加済みのデフォーマーです", 
+                "info")
+        elif len(classified) > 0:
+            self.update_status(
+                "選択されたアイテムにデフォーマーが含まれていません", 
+                "warning")
+            
+    def add_browser_deformers(self):
+        """デフォーマー一覧で選択したデフォーマーをリストに追加する。
+        
+        一覧の項目は索引の作成時に判定済みのため、再判定は行わない。
+        """
+        entries = self.deformer_browser.selected_entries()
+        if not entries:
+            self.update_status(
+                "一覧でデフォーマーを選択してください", "warning")
+            return
+        added_count = len(self.deformers_model.add_nodes(
+            [entry['name'] for entry in entries],
+            [entry['type'] for entry in entries]))
+        if added_count > 0:
+            self.update_status(
+                f"{added_count}個のデフォーマーを追加しました", 
+                "success")
+        else:
+            self.update_status(
+                "既に追加済みのデフォーマーです", 
+                "info")
+            
+    def force_add_deformers(self):
+        """選択したアイテムを強制的にデフォーマーとして追加（検証なし）。"""
+        selection = core.collect_selection()
+        if not selection:
+            self.update_status(
+                "アイテムが選択されていません", "warning")
+            return
+            
+        # 強制追加の場合は付加情報 (タイプ) を持たない
+        added_count = len(
+            self.deformers_model.add_nodes(selection))
+                    
+        if added_count > 0:
+            self.update_status(
+                f"{added_count}個のアイテムを強制追加しました", 
+                "success")
+        else:
+            self.update_status(
+                "既に追加済みのアイテムです", 
+                "info")
+            
+    def remove_selected_deformers(self):
+        """選択したデフォーマーをリストから削除する。"""
+        keys = self.deformers_list.selected_keys()
+        if keys:
+            self.deformers_model.remove_keys(keys)
+            self.update_status(
+                f"{len(keys)}個のデフォーマーを削除しました", "info")
+        else:
+            self.update_status(
+                "削除するアイテムを選択してください", "warning")
+            
+    @staticmethod
+    def object_label(uuid, record):
+        """オブジェクト一覧の表示名を返す。
+        
+        Args:
+            uuid (str): ノードの UUID
+            record (core.NodeRecord): ノードのレコード
+            
+        Returns:
+            str: ノードの表示名。削除済みの場合は "[削除済み]" を付ける。
+                コンポーネントの場合は範囲または個数を付ける。
+        """
+        if not record.alive:
+            return f"{uuid} [削除済み]"
+        if isinstance(record.data, core.ComponentTarget):
+            return record.data.label(record.name)
+        return record.name
+        
+    @staticmethod
+    def deformer_label(uuid, record):
+        """デフォーマー一覧の表示名を返す。
+        
+        Args:
+            uuid (str): ノードの UUID
+            record (core.NodeRecord): ノードのレコード。data はデフォーマー
+                タイプ (強制追加の場合は None)。
+            
+        Returns:
+            str: 例 "cluster1 (cluster)" / "item1 [強制追加]"
+        """
+        name = FTConnectDeformerGUI.object_label(uuid, record)
+        if record.data is None:
+            return f"{name} [強制追加]"
+        return f"{name} ({record.data})"
+            
+    def is_deformer(self, node):
+        """ノードがデフォーマーかどうかチェックする。
+
+        core.is_deformer への委譲。
+        """
+        return core.is_deformer(node)
+            
+    def update_pairing_widgets(self):
+        """ペアリングモードに合わせてルール欄の表示を切り替える。"""
+        self.rules_edit.setVisible(
+            self.pairing_combo.currentData() == core.PAIRING_RULES)
+        self.update_pair_count()
+        
+    def update_weight_widgets(self):
+        """ウェイトの初期化方法に合わせて入力欄の表示を切り替える。"""
+        mode = self.weight_mode_combo.currentData()
+        self.weight_value_spin.setVisible(mode != 'closest')
+        self.weight_radius_spin.setVisible(mode == 'falloff')
+        self.weight_reference_edit.setVisible(mode == 'closest')
+        self.weight_reference_btn.setVisible(mode == 'closest')
+        
+    def set_weight_reference(self):
+        """選択中のオブジェクトを参照メッシュに設定する。"""
+        selection = core.collect_selected_objects()
+        if not selection:
+            self.update_status(
+                "参照メッシュが選択されていません", "warning")
+            return
+        self.weight_reference_edit.setText(selection[0])
+        
+    def weight_initializer(self):
+        """ウェイトの初期化の設定から後処理を作る。
+        
+        FT_object_deformer_weights (NumPy) は有効な場合だけ読み込む。
+        
+        Returns:
+            WeightInitializer or None: 無効な場合は None
+            
+        Raises:
+            ImportError: NumPy がインストールされていない場合
+            ValueError: 設定が不正な場合
+        """
+        if not self.weights_group.isChecked():
+            return None
+        import FT_object_deformer_weights as weights
+        return weights.WeightInitializer(
+            self.weight_mode_combo.currentData(),
+            value=self.weight_value_spin.value(),
+            radius=self.weight_radius_spin.value(),
+            reference=self.weight_reference_edit.text().strip() or None)
+        
+    def build_plan(self, deformers=None):
+        """現在のリストとペアリング設定から接続計画を作る。
+        
+        Args:
+            deformers (list, optional): 使うデフォーマーの core.NodeRecord。
+                省略時はデフォーマーリストのすべて。
+                
+        Returns:
+            list: core.plan_pairs の接続計画
+            
+        Raises:
+            ValueError: 名前ルールの書式が不正な場合、または順番どおりの
+                対応でオブジェクトとデフォーマーの数が違う場合
+        """
+        mode = self.pairing_combo.currentData()
+        rules = None
+        if mode == core.PAIRING_RULES:
+            rules = core.parse_rules(self.rules_edit.toPlainText())
+        if deformers is None:
+            deformers = self.stored_deformers.values()
+        return core.plan_records(
+            self.stored_objects.values(), deformers, mode, rules)
+        
+    def update_pair_count(self):
+        """実行前に接続予定のペア数を表示する。"""
+        try:
+            count = core.plan_size(self.build_plan())
+        except ValueError as e:
+            self.pair_count_label.setText(f"ペアリングエラー: {e}")
+            return
+        self.pair_count_label.setText(f"接続予定: {count}組")
+        
+    def dry_run(self):
+        """シーンを変更せずに接続計画を検証し、結果を表示する。"""
+        try:
+            plan = self.build_plan()
+        except ValueError as e:
+            self.update_status(f"ペアリングエラー: {e}", "error")
+            return
+        check = core.check_plan(plan)
+        self.check_text.setPlainText(core.format_check(check))
+        self.check_text.setVisible(True)
+        if check['rejected']:
+            self.update_status(
+                f"ドライラン: {len(check['rejected'])}組は接続できません", 
+                "warning")
+        else:
+            self.update_status(
+                f"ドライラン: {core.plan_size(check['plan'])}組すべて接続できます", 
+                "success")
+        
+    def prepare_plan(self, deformers=None):
+        """実行前にリストとペアリングを検証し、接続計画を作る。
+        
+        Args:
+            deformers (list, optional): 使うデフォーマーの core.NodeRecord。
+                省略時はデフォーマーリストのすべて。
+                
+        Returns:
+            list or None: 接続計画。実行できない場合はステータスに理由を
+                表示して None を返す。
+        """
+        if not self.stored_objects:
+            self.update_status(
+                "変形対象オブジェクトが設定されていません", 
+                "error")
+            return None
+            
+        if not self.stored_deformers:
+            self.update_status(
+                "デフォーマーが設定されていません", 
+                "error")
+            return None
+            
+        try:
+            plan = self.build_plan(deformers)
+        except ValueError as e:
+            self.update_status(f"ペアリングエラー: {e}", "error")
+            return None
+        if not plan:
+            self.update_status(
+                "ペアリングに一致する組み合わせがありません", "warning")
+            return None
+        return plan
+        
+    def run_operation(self, run):
+        """実行中はボタンを無効にして操作を実行する。
+        
+        Args:
+            run (callable): 実行結果を返す関数
+            
+        Returns:
+            dict: core.new_apply_result の形式の実行結果
+        """
+        self.set_operations_enabled(False)
+        try:
+            return run()
+        finally:
+            self.set_operations_enabled(True)
+            core.flush_log()
+            self.update_profile_summary()
+            
+    def set_operations_enabled(self, enabled):
+        """適用・解除・付け替えボタンの有効・無効を切り替える。"""
+        for button in (self.apply_btn, self.remove_btn, self.swap_btn):
+            button.setEnabled(enabled)
+        
+    def apply_deformers(self):
+        """デフォーマーを適用する。"""
+        plan = self.prepare_plan()
+        if plan is None:
+            return
+        self.update_status(
+            f"{core.plan_size(plan)}組の接続を実行中...", "info")
+        try:
+            initializer = self.weight_initializer()
+        except (ImportError, ValueError) as e:
+            self.update_status(f"ウェイトの初期化: {e}", "error")
+            return
+        if self.async_apply_cb.isChecked():
+            self.start_async_apply(plan, initializer)
+            return
+        result = self.run_operation(lambda: core.run_apply(
+            plan,
+            fast=self.fast_apply_cb.isChecked(),
+            progress=self.progress,
+            on_cancel=self.on_cancel_combo.currentData(),
+            on_connected=initializer))
+        self.report_result(
+            result, initializer.written if initializer is not None else 0)
+        
+    def start_async_apply(self, plan, initializer=None):
+        """接続計画をイベントループの合間に少しずつ実行する。
+        
+        QTimer (間隔 0) のたびに core.SlicedRun の1スライスを実行し、
+        その間にダイアログを再描画・操作できるようにする。キャンセル時の
+        扱いは on_cancel_combo に従い、元に戻す場合は実行済みのスライスを
+        取り消す。
+        
+        Args:
+            plan (list): 接続計画
+            initializer (WeightInitializer, optional): ウェイトの初期化
+        """
+        self.progress.process_events = False
+        self.async_initializer = initializer
+        self.async_run = core.async_apply(
+            plan, progress=self.progress, on_connected=initializer,
+            on_cancel=self.on_cancel_combo.currentData())
+        self.set_operations_enabled(False)
+        self.pause_btn.setText("一時停止")
+        self.pause_btn.setVisible(True)
+        self.async_timer.start()
+        
+    def step_async_apply(self):
+        """非同期実行のスライスを1つ実行し、終わったら結果を表示する。"""
+        run = self.async_run
+        if run is None or run.step() or run.paused:
+            return
+        self.async_timer.stop()
+        self.async_run = None
+        self.progress.process_events = True
+        self.pause_btn.setVisible(False)
+        self.set_operations_enabled(True)
+        core.flush_log()
+        self.update_profile_summary()
+        initializer = self.async_initializer
+        self.async_initializer = None
+        self.report_result(
+            run.result, initializer.written if initializer is not None else 0)
+        
+    def toggle_pause(self):
+        """非同期実行を一時停止・再開する。"""
+        run = self.async_run
+        if run is None:
+            return
+        if run.paused:
+            run.resume()
+            self.pause_btn.setText("一時停止")
+            self.async_timer.start()
+            self.update_status("再開しました", "info")
+        else:
+            run.pause()
+            self.async_timer.stop()
+            self.pause_btn.setText("再開")
+            self.update_status(
+                f"一時停止中: {run.done}/{run.total} 組", "warning")
+            
+    def cancel_operation(self):
+        """実行中の処理にキャンセルを要求する。"""
+        self.progress.cancel()
+        if self.async_run is not None:
+            self.async_run.cancel()
+            self.async_timer.start()
+        
+    def remove_deformers(self):
+        """ペアリングに一致するペアをデフォーマーから外す。"""
+        plan = self.prepare_plan()
+        if plan is None:
+            return
+        self.update_status(
+            f"{core.plan_size(plan)}組の接続を解除中...", "info")
+        result = self.run_operation(lambda: core.run_remove(
+            plan,
+            fast=self.fast_apply_cb.isChecked(),
+            progress=self.progress,
+            on_cancel=self.on_cancel_combo.currentData()))
+        self.report_remove_result(result)
+        
+    def swap_deformers(self):
+        """デフォーマーリストで選択した1つのデフォーマーに付け替える。
+        
+        選択したデフォーマー以外のデフォーマーとペアリングで組になる
+        オブジェクトを、元のデフォーマーから外して選択したデフォーマーに
+        接続する。
+        """
+        keys = self.deformers_list.selected_keys()
+        if len(keys) != 1:
+            self.update_status(
+                "付け替え先のデフォーマーを1つ選択してください", "warning")
+            return
+        replacement = self.stored_deformers.get(keys[0])
+        sources = [
+            record for record in self.stored_deformers.values()
+            if record is not replacement
+        ]
+        if not sources or not replacement.alive:
+            self.update_status(
+                "付け替え元のデフォーマーがありません", "warning")
+            return
+        plan = self.prepare_plan(sources)
+        if plan is None:
+            return
+        self.update_status(
+            f"{core.plan_size(plan)}組を '{replacement.name}' に付け替え中...", 
+            "info")
+        replacements = {
+            deformer: replacement.path for deformer, _ in plan
+        }
+        result = self.run_operation(lambda: core.run_swap(
+            plan, replacements,
+            fast=self.fast_apply_cb.isChecked(),
+            progress=self.progress,
+            on_cancel=self.on_cancel_combo.currentData()))
+        self.report_remove_result(result, swap=True)
+        
+    def report_remove_result(self, result, swap=False):
+        """解除・付け替えの結果をステータスに表示する。
+        
+        Args:
+            result (dict): core.new_apply_result の形式の実行結果
+            swap (bool, optional): 付け替えの結果かどうか
+        """
+        if swap:
+            summary = (f"{result['removed']}個を外して{result['created']}個を接続, "
+                       f"未接続 {result['absent']}個, "
+                       f"除外 {len(result['rejected'])}個")
+        else:
+            summary = (f"{result['removed']}個を外しました, "
+                       f"未接続 {result['absent']}個")
+        if result['error']:
+            summary += f", {result['error']}個失敗"
+        if result['rolled_back']:
+            self.update_status(
+                "キャンセルしました: すべての変更を元に戻しました", 
+                "warning")
+        elif result['cancelled']:
+            self.update_status(f"キャンセルしました: {summary}", "warning")
+        elif result['error'] or result['rejected']:
+            self.update_status(f"完了: {summary}", "warning")
+        else:
+            self.update_status(f"成功: {summary}", "success")
+            
+    def report_result(self, result, weights=0):
+        """実行結果をステータスに表示する。
+        
+        Args:
+            result (dict): core.new_apply_result の形式の実行結果
+            weights (int, optional): 初期化したウェイトの数
+        """
+        created_count = result['created']
+        present_count = result['present']
+        error_count = result['error']
+        rejected_count = len(result['rejected'])
+        weights_text = f", ウェイト{weights}個を初期化" if weights else ""
+        
+        if result['rolled_back']:
+            self.update_status(
+                "キャンセルしました: すべての接続を元に戻しました", 
+                "warning")
+        elif result['cancelled']:
+            self.update_status(
+                f"キャンセルしました: {created_count}個作成, "
+                f"{present_count}個接続済み, {error_count}個失敗", 
+                "warning")
+        elif error_count == 0 and rejected_count == 0:
+            self.update_status(
+                f"成功: {created_count}個の接続を作成しました "
+                f"(接続済み: {present_count}個{weights_text})", 
+                "success")
+        else:
+            self.update_status(
+                f"完了: {created_count}個作成, {present_count}個接続済み, "
+                f"{error_count}個失敗, {rejected_count}個除外{weights_text}", 
+                "warning")
+            
+    def reset_all(self):
+        """すべての選択とリストをリセットする。"""
+        self.objects_model.clear()
+        self.deformers_model.clear()
+        self.update_status(
+            "リセットしました", 
+            "info")
+        
+    def save_recipe(self):
+        """現在のリストとペアリング設定をレシピファイルに保存する。"""
+        mode = self.pairing_combo.currentData()
+        try:
+            rules = core.parse_rules(self.rules_edit.toPlainText())
+        except ValueError as e:
+            self.update_status(f"ルールエラー: {e}", "error")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "レシピを保存", "ft_connect_recipe.json",
+            "JSON (*.json);;圧縮 JSON (*.json.gz)")
+        if not path:
+            return
+        core.save_recipe(
+            path,
+            [record.data.on(record.name)
+             if isinstance(record.data, core.ComponentTarget) else record.name
+             for record in self.stored_objects.values() if record.alive],
+            [record.name for record in self.stored_deformers.values()
+             if record.alive],
+            mode, rules)
+        self.update_status(
+            f"レシピを保存しました: {path}", "success")
+        
+    def load_recipe(self):
+        """レシピファイルを読み込み、現在のシーンのノードでリストを置き換える。
+        
+        名前はシーンを1回だけ走査して作った core.SceneLookup で解決する。
+        ペアリングは core.plan_recipe と同じく保存時の名前で行うため、
+        各レコードに saved_name を設定する。
+        """
+        path, _ = QFileDialog.getOpenFileName(
+            self, "レシピを読み込む", "",
+            "レシピ (*.json *.json.gz *.gz);;すべてのファイル (*)")
+        if not path:
+            return
+        try:
+            recipe = core.load_recipe(path)
+        except (OSError, ValueError) as e:
+            self.update_status(
+                f"レシピを読み込めませんでした: {e}", "error")
+            return
+        
+        lookup = core.SceneLookup()
+        targets = core.group_components(recipe['targets'])
+        objects, missing, ambiguous = lookup.resolve(
+            [core.target_node(target) for target in targets])
+        deformers, missing_deformers, ambiguous_deformers = lookup.resolve(
+            recipe['deformers'])
+        missing += missing_deformers
+        ambiguous += ambiguous_deformers
+        
+        # デフォーマーでないと判定された名前は強制追加として扱う
+        names = list(dict.fromkeys(deformers.values()))
+        deformer_types = [
+            info['type'] if info['is_deformer'] else None
+            for _, info in core.classify_nodes(names)
+        ]
+        
+        self.objects_model.clear()
+        self.deformers_model.clear()
+        # コンポーネントは解決したノードの付加情報として持たせる
+        found = [
+            target for target in targets
+            if core.target_node(target) in objects
+        ]
+        self.objects_model.add_nodes(
+            [objects[core.target_node(target)] for target in found],
+            [target if isinstance(target, core.ComponentTarget) else None
+             for target in found],
+            [core.target_node(target) for target in found])
+        saved_deformers = {}
+        for saved, name in deformers.items():
+            saved_deformers.setdefault(name, saved)
+        self.deformers_model.add_nodes(
+            names, deformer_types, [saved_deformers[name] for name in names])
+        
+        pairing = recipe['pairing']
+        index = self.pairing_combo.findData(pairing['mode'])
+        self.pairing_combo.setCurrentIndex(max(0, index))
+        self.rules_edit.setPlainText('\n'.join(pairing['rules']))
+        
+        for name in missing:
+            core.logger.warning("'%s' がシーンに見つかりません", name)
+        for name in ambiguous:
+            core.logger.warning("'%s' に一致するノードが複数あります", name)
+        core.flush_log()
+        if missing or ambiguous:
+            self.update_status(
+                f"レシピを読み込みました: {len(missing)}個が見つからず, "
+                f"{len(ambiguous)}個が一意に決まりません", 
+                "warning")
+        else:
+            self.update_status(
+                f"レシピを読み込みました: {len(objects)}個のオブジェクト, "
+                f"{len(names)}個のデフォーマー", 
+                "success")
+        
+    def update_logging(self):
+        """ログ出力の設定をチェックボックスに合わせる。"""
+        self.debug_log_cb.setEnabled(self.log_cb.isChecked())
+        if not self.log_cb.isChecked():
+            core.disable_logging()
+            return
+        level = logging.DEBUG if self.debug_log_cb.isChecked() else logging.INFO
+        core.enable_logging(level)
+        
+    def toggle_profiling(self, enabled):
+        """プロファイリングを開始・終了する。"""
+        if enabled:
+            core.enable_profiling().clear()
+            self.profile_text.setPlainText("")
+        else:
+            core.disable_profiling()
+        self.profile_text.setVisible(enabled)
+        self.export_profile_btn.setVisible(enabled)
+        
+    def update_profile_summary(self):
+        """プロファイルの集計をダイアログに表示する。"""
+        if core.profiler is not None:
+            self.profile_text.setPlainText(core.profiler.format_summary())
+        
+    def export_profile(self):
+        """プロファイルの集計を JSON または CSV に書き出す。"""
+        if core.profiler is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "プロファイルレポートを保存", "ft_connect_profile.json",
+            "JSON (*.json);;CSV (*.csv)")
+        if not path:
+            return
+        if path.lower().endswith('.csv'):
+            core.profiler.write_csv(path)
+        else:
+            core.profiler.write_json(path)
+        self.update_status(
+            f"レポートを書き出しました: {path}", "success")
+        
+    def schedule_scene_sync(self):
+        """シーンの変更の反映をアイドル時に1回だけ行うよう予約する。"""
+        if not self._sync_scheduled:
+            self._sync_scheduled = True
+            maya.utils.executeDeferred(self.sync_scene_changes)
+        
+    def sync_scene_changes(self):
+        """溜まった削除・リネームをリストに反映する。
+        
+        変更のあった UUID だけを調べるため、処理量は変更の数に比例する。
+        """
+        if not self._sync_scheduled:
+            # 予約後にダイアログが閉じられた
+            return
+        self._sync_scheduled = False
+        removed, renamed = core.node_registry.take_changes()
+        removed_count = 0
+        for model in (self.objects_model, self.deformers_model):
+            gone = [uuid for uuid in removed if uuid in model.store]
+            if gone:
+                removed_count += len(model.remove_keys(gone))
+            if any(uuid in model.store for uuid in renamed):
+                model.refresh_labels()
+                # 名前ルールの照合結果が変わるため接続予定数も更新する
+                self.pair_count_timer.start()
+        if removed_count:
+            self.update_status(
+                f"シーンから削除された{removed_count}個のノードを"
+                f"リストから外しました", 
+                "warning")
+        
+    def done(self, result):
+        """ダイアログを閉じるときに後片付けをする。
+        
+        閉じるボタン (closeEvent から reject を経由する) だけでなく、
+        Esc キーや reject・accept の呼び出しで閉じた場合も必ず通る。
+        """
+        self.cleanup()
+        super(FTConnectDeformerGUI, self).done(result)
+        
+    def cleanup(self):
+        """コールバックを解除し、ログとプロファイリングを終える。
+        
+        2回目以降の呼び出しでは何もしない。非同期実行中の場合は
+        キャンセルし、処理済みの接続を残す。
+        """
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
+        if self.async_run is not None:
+            self.async_run.on_cancel = core.ON_CANCEL_COMMIT
+            self.async_run.cancel()
+            self.step_async_apply()
+        self._sync_scheduled = False
+        core.node_registry.remove_listener(self.schedule_scene_sync)
+        core.node_registry.remove_callbacks()
+        self.deformer_browser.stop()
+        core.disable_profiling()
+        core.disable_logging()
+        
+    def update_status(self, message, status_type="info"):
+        """ステータスメッセージを更新する。
+        
+        Args:
+            message (str): 表示するメッセージ
+            status_type (str, optional): メッセージの種類。
+                'success', 'warning', 'error', 'info'のいずれか。
+                デフォルトは'info'。
+        """
+        # ステータスタイプに応じた色の定義
+        colors = {
+            "success": "#4CAF50",  # 緑
+            "warning": "#FF9800",  # オレンジ
+            "error": "#f44336",    # 赤
+            "info": "#2196F3"      # 青
+        }
+        color = colors.get(status_type, "#333")
+        self.status_label.setText(message)
+        self.status_label.setStyleSheet(
+            f"QLabel {{ "
+            f"color: {color}; "
+            f"padding: 5px; "
+            f"font-weight: bold; "
+            f"}}")
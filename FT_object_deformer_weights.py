@@ -0,0 +1,346 @@
+"""新しく接続したジオメトリのデフォーマーウェイトをまとめて初期化する。
+
+ウェイトは NumPy の配列として頂点単位ではなく一括で計算し、
+weightList[i].weights の範囲指定の setAttr でまとめて書き込む。
+NumPy は任意の依存関係で、このモジュールの関数を呼び出したときに
+初めて読み込む (NumPy がない環境でもコアモジュールと GUI は動作する)。
+参照メッシュからのコピーは SciPy があれば cKDTree で最近傍を求める。
+Maya のコマンドは core.cmds から呼び出すため、コアモジュールの
+プロファイラーやベンチマークの FakeCmds がウェイトの書き込みも数える。
+
+    import FT_object_deformer_core as core
+    import FT_object_deformer_weights as weights
+    initializer = weights.WeightInitializer(weights.WEIGHT_FALLOFF, radius=5.0)
+    core.apply_deformers(objects, ['cluster1'], on_connected=initializer)
+"""
+import FT_object_deformer_core as core
+
+
+# ウェイトの初期化方法
+WEIGHT_CONSTANT = 'constant'
+WEIGHT_FALLOFF = 'falloff'
+WEIGHT_CLOSEST = 'closest'
+
+# 減衰カーブ
+FALLOFF_LINEAR = 'linear'
+FALLOFF_SMOOTH = 'smooth'
+
+# インデックスが weightList の要素番号と一致する1次元のコンポーネント
+POINT_COMPONENTS = ('vtx', 'cv', 'pt')
+
+# 1回の setAttr で書き込む最大要素数
+SET_ATTR_SLICE = 100000
+
+# SciPy がない場合の最近傍探索で一度に比較する要素数 (点の数 × 参照点の数)
+_BRUTE_FORCE_BLOCK = 1 << 22
+
+
+def _numpy():
+    """NumPy を読み込む。
+
+    Raises:
+        ImportError: NumPy がインストールされていない場合
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "ウェイトの初期化には NumPy が必要です。"
+            "mayapy -m pip install numpy でインストールしてください")
+    return numpy
+
+
+def _closest_indices(points, reference):
+    """points の各点に最も近い reference の点の番号を返す。
+
+    SciPy があれば cKDTree を使い、なければブロックごとの総当たりで求める。
+    """
+    np = _numpy()
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        cKDTree = None
+    if cKDTree is not None:
+        return cKDTree(reference).query(points)[1]
+    block = max(1, _BRUTE_FORCE_BLOCK // max(1, len(reference)))
+    indices = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), block):
+        chunk = points[start:start + block]
+        distances = ((chunk[:, None, :] - reference[None, :, :]) ** 2).sum(-1)
+        indices[start:start + block] = distances.argmin(axis=1)
+    return indices
+
+
+def read_points(shape):
+    """シェイプの制御点のワールド座標を (N, 3) の配列で返す。"""
+    np = _numpy()
+    values = core.cmds.xform(
+        f"{shape}.cp[*]", query=True, worldSpace=True, translation=True) or []
+    return np.asarray(values, dtype=np.float64).reshape(-1, 3)
+
+
+def point_count(shape):
+    """シェイプの制御点の数を、座標を読まずに返す。"""
+    if core.cmds.objectType(shape, isAType='mesh'):
+        return core.cmds.polyEvaluate(shape, vertex=True)
+    return core.cmds.getAttr(f"{shape}.cp", size=True)
+
+
+def geometry_indices(deformer):
+    """デフォーマーに接続されたシェイプと weightList の番号を調べる。
+
+    Returns:
+        dict: シェイプと親 transform のロングネームから、
+            (シェイプのロングネーム, weightList の番号) のリストへの辞書
+    """
+    geometry = core.cmds.deformer(deformer, query=True, geometry=True) or []
+    indices = core.cmds.deformer(
+        deformer, query=True, geometryIndices=True) or []
+    shapes = core.cmds.ls(geometry, long=True) or []
+    members = {}
+    for shape, index in zip(shapes, indices):
+        members.setdefault(shape, []).append((shape, index))
+        members.setdefault(shape.rsplit('|', 1)[0], []).append((shape, index))
+    return members
+
+
+def read_weights(deformer, index, count):
+    """weightList[index] のウェイトを長さ count の配列で返す。
+
+    値が設定されていない要素は既定値の 1.0 になる。
+    """
+    np = _numpy()
+    plug = f"{deformer}.weightList[{index}].weights"
+    weights = np.ones(count, dtype=np.float64)
+    elements = core.cmds.getAttr(plug, multiIndices=True) or []
+    if elements:
+        values = core.cmds.getAttr(plug)
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        elements = np.asarray(elements, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        inside = elements < count
+        weights[elements[inside]] = values[inside]
+    return weights
+
+
+def write_weights(deformer, index, weights, ranges=None):
+    """ウェイトを範囲指定の setAttr でまとめて書き込む。
+
+    Args:
+        deformer (str): デフォーマー名
+        index (int): weightList の番号
+        weights (numpy.ndarray): 頂点ごとのウェイト
+        ranges (iterable, optional): 書き込む (開始, 終了) の組 (終了を含む)。
+            省略時はすべての頂点。
+
+    Returns:
+        int: 書き込んだ要素数
+    """
+    if ranges is None:
+        ranges = [(0, len(weights) - 1)] if len(weights) else []
+    plug = f"{deformer}.weightList[{index}].weights"
+    written = 0
+    for start, end in ranges:
+        end = min(end, len(weights) - 1)
+        for first in range(start, end + 1, SET_ATTR_SLICE):
+            last = min(end, first + SET_ATTR_SLICE - 1)
+            values = weights[first:last + 1].tolist()
+            core.cmds.setAttr(
+                f"{plug}[{first}:{last}]", *values, size=len(values))
+            written += len(values)
+    return written
+
+
+def component_ranges(target):
+    """ComponentTarget を weightList に書き込む点番号の範囲に変換する。
+
+    頂点・CV・ラティスの点の1次元インデックスはそのまま使う。面や辺、
+    多次元のインデックスは polyListComponentConversion で頂点に変換する。
+
+    Args:
+        target (ComponentTarget): 変換するコンポーネント
+
+    Returns:
+        list: (開始, 終了) の組のリスト (終了を含む)。
+            点番号に変換できない場合は空のリスト。
+    """
+    if target.component in POINT_COMPONENTS and not target.raw:
+        ranges = target.ranges
+    else:
+        converted = core.cmds.polyListComponentConversion(
+            target.strings(), toVertex=True) or []
+        vertices = core.ComponentTarget(target.node, 'vtx', [
+            pair
+            for item in core.group_components(converted)
+            if isinstance(item, core.ComponentTarget) and not item.raw
+            for pair in zip(item.ranges[::2], item.ranges[1::2])
+        ])
+        ranges = vertices.ranges
+    return list(zip(ranges[::2], ranges[1::2]))
+
+
+def handle_position(deformer):
+    """デフォーマーのハンドルのワールド座標 (回転ピボット) を返す。
+
+    Returns:
+        tuple or None: (x, y, z)。ハンドルがない場合は None。
+    """
+    for attribute in sorted(core.HANDLE_ATTRIBUTES):
+        try:
+            sources = core.cmds.listConnections(
+                f"{deformer}.{attribute}", source=True, destination=False)
+        except (ValueError, RuntimeError):
+            continue
+        if sources:
+            return tuple(core.cmds.xform(
+                sources[0], query=True, worldSpace=True, rotatePivot=True))
+    return None
+
+
+class WeightInitializer(object):
+    """新しく接続したジオメトリのウェイトを初期化する後処理。
+
+    core.run_apply などの on_connected に渡すと、チャンクを接続する
+    たびに呼ばれ、接続と同じアンドゥチャンクの中でウェイトを書き込む。
+    ComponentTarget の場合は範囲内の頂点 (面や辺は頂点に変換したもの)
+    だけに書き込む。
+
+    - WEIGHT_CONSTANT: すべての頂点を value にする (座標は読まず、点の数だけ調べる)
+    - WEIGHT_FALLOFF: center (省略時はハンドルの位置) からの距離が
+      radius で 0 になるように value から減衰させる
+    - WEIGHT_CLOSEST: reference メッシュの最も近い頂点のウェイトを
+      コピーする。参照するウェイトは reference_deformer (省略時は
+      接続先と同じデフォーマー) のもの。
+
+    Args:
+        mode (str, optional): 初期化方法
+        value (float, optional): ウェイトの値 (減衰の場合は中心の値)
+        center (tuple, optional): 減衰の中心のワールド座標
+        radius (float, optional): 減衰の半径
+        falloff (str, optional): FALLOFF_LINEAR または FALLOFF_SMOOTH
+        reference (str, optional): WEIGHT_CLOSEST で使う参照メッシュ
+        reference_deformer (str, optional): 参照メッシュのウェイトを持つデフォーマー
+
+    Raises:
+        ValueError: 不明な初期化方法の場合、または WEIGHT_CLOSEST で
+            reference がない場合
+    """
+
+    def __init__(self, mode=WEIGHT_CONSTANT, value=1.0, center=None,
+                 radius=1.0, falloff=FALLOFF_SMOOTH, reference=None,
+                 reference_deformer=None):
+        if mode not in (WEIGHT_CONSTANT, WEIGHT_FALLOFF, WEIGHT_CLOSEST):
+            raise ValueError(f"不明なウェイトの初期化方法です: {mode}")
+        if mode == WEIGHT_CLOSEST and not reference:
+            raise ValueError("参照メッシュが指定されていません")
+        _numpy()
+        self.mode = mode
+        self.value = float(value)
+        self.center = center
+        self.radius = max(float(radius), 1e-6)
+        self.falloff = falloff
+        self.reference = reference
+        self.reference_deformer = reference_deformer
+        self.written = 0
+        self._centers = {}
+        self._references = {}
+
+    def __call__(self, deformer, objects):
+        self.apply(deformer, objects)
+
+    def _center(self, deformer):
+        """減衰の中心を返す (デフォーマーごとにキャッシュする)。"""
+        if self.center is not None:
+            return self.center
+        if deformer not in self._centers:
+            self._centers[deformer] = handle_position(deformer)
+        return self._centers[deformer]
+
+    def _reference(self, deformer):
+        """参照メッシュの点とウェイトを返す (デフォーマーごとにキャッシュする)。"""
+        source = self.reference_deformer or deformer
+        if source not in self._references:
+            members = geometry_indices(source).get(
+                core.long_names([self.reference])[self.reference], [])
+            if not members:
+                raise RuntimeError(
+                    f"参照メッシュ '{self.reference}' は "
+                    f"'{source}' に接続されていません")
+            shape, index = members[0]
+            points = read_points(shape)
+            self._references[source] = (
+                points, read_weights(source, index, len(points)))
+        return self._references[source]
+
+    def compute(self, deformer, points):
+        """頂点の座標からウェイトの配列を計算する。
+
+        Args:
+            deformer (str): デフォーマー名
+            points (numpy.ndarray): (N, 3) の座標
+
+        Returns:
+            numpy.ndarray: 長さ N のウェイト
+        """
+        np = _numpy()
+        if self.mode == WEIGHT_CONSTANT:
+            return np.full(len(points), self.value)
+        if self.mode == WEIGHT_FALLOFF:
+            center = self._center(deformer)
+            if center is None:
+                raise RuntimeError(
+                    f"'{deformer}' にハンドルがないため、減衰の中心が決まりません")
+            distances = np.linalg.norm(points - np.asarray(center), axis=1)
+            weights = np.clip(1.0 - distances / self.radius, 0.0, 1.0)
+            if self.falloff == FALLOFF_SMOOTH:
+                weights = weights * weights * (3.0 - 2.0 * weights)
+            return weights * self.value
+        reference_points, reference_weights = self._reference(deformer)
+        return reference_weights[_closest_indices(points, reference_points)]
+
+    def apply(self, deformer, objects):
+        """新しく接続したオブジェクトのウェイトを書き込む。
+
+        Args:
+            deformer (str): デフォーマー名
+            objects (list): オブジェクト名または ComponentTarget のリスト
+
+        Returns:
+            int: 書き込んだ要素数
+        """
+        if core.cmds.objectType(deformer, isAType='skinCluster'):
+            core.logger.warning(
+                "'%s' は skinCluster のため、ウェイトを初期化しません。", deformer)
+            return 0
+        members = geometry_indices(deformer)
+        paths = core.long_names(
+            list(dict.fromkeys(core.target_node(obj) for obj in objects)))
+        written = 0
+        for obj in objects:
+            ranges = None
+            if isinstance(obj, core.ComponentTarget):
+                ranges = component_ranges(obj)
+                if not ranges:
+                    core.logger.warning(
+                        "'%s' を頂点番号に変換できないため、ウェイトを"
+                        "初期化しません。", obj)
+                    continue
+            for shape, index in members.get(paths[core.target_node(obj)], []):
+                try:
+                    if self.mode == WEIGHT_CONSTANT:
+                        # 一定値は座標を使わないため、点の数だけを調べる
+                        count = (ranges[-1][1] + 1 if ranges
+                                 else point_count(shape))
+                        weights = _numpy().full(count, self.value)
+                    else:
+                        weights = self.compute(deformer, read_points(shape))
+                    written += write_weights(deformer, index, weights, ranges)
+                except RuntimeError as e:
+                    core.logger.warning(
+                        "'%s' の '%s' のウェイトを初期化できませんでした。%s",
+                        shape, deformer, e)
+        self.written += written
+        core.logger.info("'%s' の%d個のウェイトを初期化しました。",
+                         deformer, written)
+        return written
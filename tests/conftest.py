@@ -0,0 +1,27 @@
+"""テスト共通の設定。
+
+Maya がない環境でもコアモジュールを読み込めるように、ベンチマークの
+スタブ (空の maya モジュール) と FakeCmds を使う。
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import FT_object_deformer_bench as bench  # noqa: E402
+import FT_object_deformer_core as core  # noqa: E402
+
+
+@pytest.fixture
+def fake_cmds():
+    """core.cmds を FakeCmds に差し替える。"""
+    cmds = bench.FakeCmds()
+    original = core.cmds
+    core.cmds = cmds
+    core.classification_cache.clear()
+    try:
+        yield cmds
+    finally:
+        core.cmds = original
@@ -0,0 +1,91 @@
+"""時間で区切った実行 (async_apply / SlicedRun) のテスト。"""
+import FT_object_deformer_bench as bench
+import FT_object_deformer_core as core
+
+
+def run_to_end(run):
+    while run.step():
+        pass
+    return run
+
+
+def test_fixed_chunk_size_makes_slices_deterministic(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 250, 2)
+    plan = core.plan_pairs(objects, deformers)
+    run = run_to_end(core.async_apply(plan, budget=0, chunk_size=100))
+    assert run.result['created'] == 500
+    # デフォーマーごとに 100, 100, 50 のチャンクと、終了を確認するスライス
+    assert run.slices == 7
+
+
+def cancel_after(run, slices):
+    for _ in range(slices):
+        assert run.step()
+    run.cancel()
+    assert not run.step()
+    return run
+
+
+def test_rollback_undoes_every_committed_slice(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 250, 1)
+    fake_cmds.undo_queue.append('userEdit')
+    run = cancel_after(core.async_apply(
+        core.plan_pairs(objects, deformers), budget=0, chunk_size=100,
+        on_cancel=core.ON_CANCEL_ROLLBACK), 2)
+    assert run.result['cancelled']
+    assert run.result['rolled_back']
+    assert fake_cmds.calls['undo'] == 2
+    assert fake_cmds.undo_queue == ['userEdit']
+
+
+def test_rollback_stops_at_user_edits_between_slices(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 250, 1)
+    run = core.async_apply(
+        core.plan_pairs(objects, deformers), budget=0, chunk_size=100,
+        on_cancel=core.ON_CANCEL_ROLLBACK)
+    assert run.step()
+    fake_cmds.undo_queue.append('userEdit')
+    cancel_after(run, 1)
+    assert not run.result['rolled_back']
+    assert fake_cmds.calls['undo'] == 1
+
+
+def test_commit_keeps_slices_on_cancel(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 250, 1)
+    run = cancel_after(core.async_apply(
+        core.plan_pairs(objects, deformers), budget=0, chunk_size=100), 2)
+    assert run.result['cancelled']
+    assert not run.result['rolled_back']
+    assert 'undo' not in fake_cmds.calls
+
+
+class RecordingChunkSize(core.AdaptiveChunkSize):
+    """record に渡されたペア数を記録する AdaptiveChunkSize。"""
+
+    def __init__(self, *args, **kwargs):
+        super(RecordingChunkSize, self).__init__(*args, **kwargs)
+        self.counts = []
+
+    def record(self, count, seconds):
+        self.counts.append(count)
+        super(RecordingChunkSize, self).record(count, seconds)
+
+
+def test_skipped_slices_are_not_counted_or_measured(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 100, 2)
+    # 1つ目のデフォーマーには接続済みにしておく
+    core.apply_deformers(objects, deformers[:1])
+    result = core.new_apply_result()
+    chunk_size = RecordingChunkSize(initial=50, maximum=50)
+    steps = core.iter_apply_plan(
+        core.plan_pairs(objects, deformers), result, chunk_size)
+    run = core.SlicedRun(steps, result, 200, chunk_size, budget=0,
+                         on_cancel=core.ON_CANCEL_ROLLBACK)
+    # スキップだけのスライスと、50 組を接続したスライス
+    cancel_after(run, 2)
+    assert result['present'] == 100
+    assert result['created'] == 50
+    assert run.undo_chunks == 1
+    assert chunk_size.counts == [50]
+    assert result['rolled_back']
+    assert fake_cmds.calls['undo'] == 1
@@ -0,0 +1,106 @@
+"""バッチランナー (FT_object_deformer_batch) のテスト。
+
+Maya の代わりにスタブのワーカースクリプトを --worker-command で使う。
+"""
+import json
+import os
+import shlex
+import sys
+import textwrap
+
+import pytest
+
+import FT_object_deformer_batch as batch
+
+
+# シーン名に "fail" を含むシーンは失敗、"hang" を含むシーンで停止する
+STUB_WORKER = textwrap.dedent('''
+    import json
+    import sys
+    import time
+
+    args = sys.argv[1:]
+    recipe = args[args.index('--recipe') + 1]
+    scenes = [a for a in args[args.index('--recipe') + 2:] if a != '--no-save']
+    for scene in scenes:
+        if 'hang' in scene:
+            time.sleep(60)
+        result = {
+            'scene': scene, 'ok': 'fail' not in scene, 'seconds': 0.0,
+            'created': 1, 'present': 0, 'failed': [], 'rejected': [],
+            'error': None, 'recipe': recipe, 'save': '--no-save' not in args,
+        }
+        print('Maya のログ出力')
+        sys.stdout.write(%r + json.dumps(result) + '\\n')
+        sys.stdout.flush()
+''' % batch.RESULT_PREFIX)
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """スタブのワーカーコマンドを返す。"""
+    script = tmp_path / 'stub_worker.py'
+    script.write_text(STUB_WORKER, encoding='utf-8')
+    return [sys.executable, str(script)]
+
+
+def test_split_batches_balances_workers():
+    scenes = [f"s{i}" for i in range(10)]
+    assert batch.split_batches(scenes, 4) == [
+        scenes[0:3], scenes[3:6], scenes[6:9], scenes[9:]]
+    assert batch.split_batches(scenes, 1, scenes_per_worker=4) == [
+        scenes[0:4], scenes[4:8], scenes[8:]]
+    assert batch.split_batches(scenes, 0) == [scenes[0:8], scenes[8:]]
+    assert batch.split_batches([], 4) == []
+
+
+def test_run_batch_keeps_input_order(worker):
+    scenes = [f"shot{i:03d}.ma" for i in range(7)] + ['shot_fail.ma']
+    results = batch.run_batch(
+        scenes, 'recipe.json', workers=3, command=worker, save=False,
+        scenes_per_worker=2)
+    assert [r['scene'] for r in results] == scenes
+    assert [r['ok'] for r in results] == [True] * 7 + [False]
+    # レシピは絶対パスにしてワーカーに渡す
+    assert results[0]['recipe'] == os.path.abspath('recipe.json')
+    assert all(r['save'] is False for r in results)
+
+
+def test_worker_without_result_is_reported(tmp_path):
+    script = tmp_path / 'crash.py'
+    script.write_text("import sys\nsys.stderr.write('boom\\n')\nsys.exit(3)\n",
+                      encoding='utf-8')
+    results = batch.run_worker_batch(
+        [sys.executable, str(script)], 'recipe.json', ['a.ma'])
+    assert not results[0]['ok']
+    assert '終了コード 3' in results[0]['error']
+    assert 'boom' in results[0]['error']
+
+
+def test_timeout_keeps_finished_scenes(worker):
+    results = batch.run_worker_batch(
+        worker, 'recipe.json', ['a.ma', 'b_hang.ma', 'c.ma'], timeout=2)
+    assert [r['ok'] for r in results] == [True, False, False]
+    assert results[0]['created'] == 1
+    assert 'タイムアウト' in results[1]['error']
+    assert 'タイムアウト' in results[2]['error']
+
+
+def test_parse_results_skips_partial_lines():
+    output = (batch.RESULT_PREFIX + json.dumps({'scene': 'a.ma'}) + '\n'
+              + 'log\n' + batch.RESULT_PREFIX + '{"scene": "b.')
+    assert list(batch.parse_results(output.encode('utf-8'))) == ['a.ma']
+    assert batch.parse_results(None) == {}
+
+
+def test_main_with_worker_command(worker, tmp_path):
+    scene_list = tmp_path / 'scenes.txt'
+    scene_list.write_text('a.ma\n\nb_fail.ma\n', encoding='utf-8')
+    output = tmp_path / 'results.json'
+    code = batch.main([
+        '--recipe', 'recipe.json', '--workers', '2', '--no-save',
+        '--worker-command', ' '.join(shlex.quote(arg) for arg in worker),
+        '--output', str(output), 'c.ma', f"@{scene_list}"])
+    results = json.loads(output.read_text(encoding='utf-8'))
+    assert code == 1
+    assert [r['scene'] for r in results] == ['c.ma', 'a.ma', 'b_fail.ma']
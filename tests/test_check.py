@@ -0,0 +1,55 @@
+"""実行前の検証 (check_plan) と名前の解決のテスト。"""
+import FT_object_deformer_bench as bench
+import FT_object_deformer_core as core
+
+
+def test_missing_name_does_not_requery_every_node(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 2000, 1)
+    fake_cmds.reset_calls()
+    result = core.apply_deformers(objects + ['missing_geo'], deformers)
+    assert result['created'] == 2000
+    assert [pair[1] for pair in result['rejected']] == ['missing_geo']
+    assert fake_cmds.calls['ls'] <= 10
+
+
+def test_long_names_matches_by_name_not_position(fake_cmds):
+    bench.build_scene(fake_cmds, 3, 1)
+    names = core.long_names(['geo_2', 'missing', 'geo_0', '|rig|geo_1'])
+    assert names == {
+        'geo_2': '|rig|geo_2',
+        'missing': 'missing',
+        'geo_0': '|rig|geo_0',
+        '|rig|geo_1': '|rig|geo_1',
+    }
+
+
+def test_shape_subtypes_are_deformable(fake_cmds):
+    bench.build_scene(fake_cmds, 1, 1)
+    fake_cmds.create('curve1', 'transform')
+    fake_cmds.create('curveShape1', 'bezierCurve', 'curve1')
+    check = core.check_plan([('cluster_0', ['curve1', 'curveShape1'])])
+    assert check['rejected'] == []
+    assert check['targets']['curve1'][1] == ('nurbsCurve',)
+
+
+def test_geometry_restricted_deformer_rejects_curves(fake_cmds):
+    bench.build_scene(fake_cmds, 1, 0)
+    fake_cmds.create('deltaMush1', 'deltaMush')
+    fake_cmds.create('curve1', 'transform')
+    fake_cmds.create('curveShape1', 'bezierCurve', 'curve1')
+    check = core.check_plan([('deltaMush1', ['geo_0', 'curve1'])])
+    assert [(obj, reason) for _, obj, reason in check['rejected']] == [
+        ('curve1', "deltaMush は nurbsCurve に対応していません")]
+
+
+def test_skin_owner_only_blocks_other_skin_clusters(fake_cmds, monkeypatch):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 1, 1)
+    fake_cmds.create('skinCluster1', 'skinCluster')
+    fake_cmds.create('skinCluster2', 'skinCluster')
+    monkeypatch.setattr(core, '_skin_owners', lambda: {
+        '|rig|geo_0': 'skinCluster1', '|rig|geo_0|geo_0Shape': 'skinCluster1'})
+    check = core.check_plan([
+        ('skinCluster2', objects), (deformers[0], objects)])
+    assert check['plan'] == [(deformers[0], objects)]
+    assert check['rejected'] == [
+        ('skinCluster2', 'geo_0', "既に skinCluster1 にバインドされています")]
@@ -0,0 +1,17 @@
+"""選択したデフォーマーの判定 (collect_selected_deformers) のテスト。"""
+import FT_object_deformer_bench as bench
+import FT_object_deformer_core as core
+
+
+def test_selected_handles_resolve_to_deformers(fake_cmds, monkeypatch):
+    monkeypatch.setattr(core, 'om', bench.FakeOpenMaya(fake_cmds))
+    objects, deformers, handles = bench.build_scene(fake_cmds, 2, 2)
+    fake_cmds.selection = [handles[0], deformers[1], objects[0]]
+
+    classified = core.collect_selected_deformers()
+
+    assert [name for name, _ in classified] == [
+        'cluster_0', 'cluster_1', 'geo_0']
+    assert [result['is_deformer'] for _, result in classified] == [
+        True, True, False]
+    assert fake_cmds.calls['om.MGlobal.getActiveSelectionList'] == 1
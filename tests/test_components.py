@@ -0,0 +1,68 @@
+"""コンポーネント単位の接続 (ComponentTarget) のテスト。"""
+import FT_object_deformer_bench as bench
+import FT_object_deformer_core as core
+
+
+def test_reapplying_components_counts_them_as_present(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 3, 1)
+    components = [core.ComponentTarget(name, 'vtx', [(0, 9), (20, 29)])
+                  for name in objects]
+    connected = []
+
+    def on_connected(deformer, targets):
+        connected.extend(targets)
+
+    first = core.apply_deformers(components, deformers,
+                                 on_connected=on_connected)
+    assert first['created'] == 3
+    assert first['present'] == 0
+    assert len(connected) == 3
+
+    # 既存の範囲に含まれる部分だけを選び直しても接続済みとして扱う
+    subset = [core.ComponentTarget(name, 'vtx', [(2, 5)]) for name in objects]
+    second = core.apply_deformers(components + subset[:1], deformers,
+                                  on_connected=on_connected)
+    assert second['created'] == 0
+    assert second['present'] == 4
+    assert len(connected) == 3
+
+
+def test_components_outside_the_set_are_added(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 1, 1)
+    core.apply_deformers([core.ComponentTarget(objects[0], 'vtx', [(0, 9)])],
+                         deformers)
+    result = core.apply_deformers(
+        [core.ComponentTarget(objects[0], 'vtx', [(5, 14)])], deformers)
+    assert result['created'] == 1
+    assert result['present'] == 0
+
+
+def test_contains_checks_every_range():
+    outer = core.ComponentTarget('geo', 'vtx', [(0, 9), (20, 29)])
+    assert outer.contains(core.ComponentTarget('geo', 'vtx', [(3, 4), (25, 29)]))
+    assert not outer.contains(core.ComponentTarget('geo', 'vtx', [(8, 12)]))
+    assert not outer.contains(core.ComponentTarget('geo', 'cv', [(0, 1)]))
+
+
+def test_merge_ranges_sorts_and_joins_adjacent_ranges():
+    merged = core._merge_ranges([(10, 12), (0, 3), (4, 5), (11, 20), (30, 30)])
+    assert list(merged) == [0, 5, 10, 20, 30, 30]
+    assert list(core._merge_ranges([])) == []
+
+
+def test_group_components_keeps_order_and_node_names():
+    existing = core.ComponentTarget('geo_9', 'vtx', [(0, 1)])
+    grouped = core.group_components([
+        'geo_0', 'geo_1.vtx[5]', 'geo_1.vtx[0:4]', existing,
+        'surf.cv[0:2][1]', 'geo_1.f[3]', 'geo_2',
+    ])
+    assert grouped == [
+        'geo_0',
+        core.ComponentTarget('geo_1', 'vtx', [(0, 5)]),
+        existing,
+        core.ComponentTarget('surf', 'cv', raw=['[0:2][1]']),
+        core.ComponentTarget('geo_1', 'f', [(3, 3)]),
+        'geo_2',
+    ]
+    assert grouped[1].strings() == ['geo_1.vtx[0:5]']
+    assert grouped[3].strings() == ['surf.cv[0:2][1]']
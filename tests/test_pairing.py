@@ -0,0 +1,118 @@
+"""名前ルールによるペアリングのテスト。"""
+import fnmatch
+
+import pytest
+
+import FT_object_deformer_core as core
+
+
+NAMES = [
+    'geo_0', 'geo_1', 'geo_12', 'geo_a', 'L_arm', 'R_arm', 'C_arm',
+    'L_brm', 'L_crm', 'body_L_arm_geo', 'body_R_leg_geo', 'x1', 'x2',
+    '|rig|L_hand|L_handShape', 'ns:L_arm', 'a[b',
+]
+
+PATTERNS = [
+    'geo_[0-9]', '*[12]', '[LR]_arm', 'L_[ab]rm', '[!L]_arm', '*_[LR]_*',
+    'geo_*', '*_arm', '*_L_*', 'x?', '*', 'L_*Shape', '*[]]*', 'a[b',
+    'geo_[0-9]*', '[]a]*',
+]
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_match_glob_agrees_with_fnmatch(pattern):
+    index = core.NameIndex(NAMES)
+    expected = [
+        i for i, name in enumerate(NAMES)
+        if any(fnmatch.fnmatchcase(short, pattern)
+               for short in core._match_names(name))
+    ]
+    assert index.match_glob(pattern) == expected
+
+
+def test_parse_rules_and_plan_pairs():
+    rules = core.parse_rules(
+        "# コメント\nL_* -> L_bend\nre: ^([LR])_.*_geo$ -> \\1_bend\n")
+    objects = ['L_arm_geo', 'R_leg_geo', 'C_body']
+    deformers = ['L_bend', 'R_bend']
+    plan = core.plan_pairs(objects, deformers, core.PAIRING_RULES, rules)
+    assert plan == [('L_bend', ['L_arm_geo']), ('R_bend', ['R_leg_geo'])]
+
+
+def test_plan_pairs_modes():
+    assert core.plan_pairs(['a', 'b'], ['d1', 'd2']) == [
+        ('d1', ['a', 'b']), ('d2', ['a', 'b'])]
+    assert core.plan_pairs(['a', 'b'], ['d1', 'd2'],
+                           core.PAIRING_INDEX) == [('d1', ['a']), ('d2', ['b'])]
+    with pytest.raises(ValueError):
+        core.plan_pairs(['a'], ['d'], 'unknown')
+
+
+def test_parse_rules_reports_invalid_lines():
+    with pytest.raises(ValueError):
+        core.parse_rules("no arrow here")
+
+
+class StubRecord(object):
+    """plan_records に渡す NodeRecord の代わり (OpenMaya を使わない)。"""
+
+    def __init__(self, name, saved_name=None, data=None):
+        self.name = name
+        self.path = '|' + name
+        self.saved_name = saved_name
+        self.data = data
+        self.alive = True
+
+    @property
+    def pairing_name(self):
+        return self.saved_name or self.name
+
+
+def test_plan_records_pairs_recipe_records_by_saved_name():
+    # 名前空間が変わったシーンで読み込んだレシピ
+    objects = [StubRecord('new:body_L_geo', 'old:body_L_geo'),
+               StubRecord('new:body_R_geo', 'old:body_R_geo')]
+    deformers = [StubRecord('new:L_cluster', 'old:L_cluster'),
+                 StubRecord('new:R_cluster', 'old:R_cluster')]
+    rules = core.parse_rules('old:*_L_* -> old:L_*\nold:*_R_* -> old:R_*')
+    plan = core.plan_records(objects, deformers, core.PAIRING_RULES, rules)
+    assert plan == [('|new:L_cluster', ['|new:body_L_geo']),
+                    ('|new:R_cluster', ['|new:body_R_geo'])]
+
+
+def test_regex_rule_skips_missing_deformers():
+    rules = core.parse_rules(r"re: ^(\w+)_geo$ -> \1_bend")
+    plan = core.plan_pairs(['arm_geo', 'leg_geo', 'arm_geo_old'],
+                           ['arm_bend'], core.PAIRING_RULES, rules)
+    assert plan == [('arm_bend', ['arm_geo'])]
+
+
+def test_rules_round_trip_through_text():
+    text = "L_* -> L_bend\nre: ^([LR])_.*$ -> \\1_bend"
+    rules = core.parse_rules(text)
+    assert [rule.kind for rule in rules] == [
+        core.PairingRule.GLOB, core.PairingRule.REGEX]
+    assert '\n'.join(rule.to_text() for rule in rules) == text
+
+
+@pytest.mark.parametrize('text', ['L_* ->', 're: ([ -> x', '-> L_bend'])
+def test_parse_rules_rejects_empty_or_invalid_patterns(text):
+    with pytest.raises(ValueError, match='1行目'):
+        core.parse_rules(text)
+
+
+def test_rules_pair_components_by_node_name():
+    targets = core.group_components(['L_arm.vtx[0:9]', 'R_arm'])
+    rules = core.parse_rules('L_* -> L_bend\nR_* -> R_bend')
+    plan = core.plan_pairs(targets, ['L_bend', 'R_bend'],
+                           core.PAIRING_RULES, rules)
+    assert plan == [('L_bend', [targets[0]]), ('R_bend', ['R_arm'])]
+
+
+@pytest.mark.parametrize('objects, deformers', [
+    (['a', 'b', 'c'], ['d1', 'd2']),
+    (['a'], ['d1', 'd2']),
+])
+def test_index_pairing_rejects_different_lengths(objects, deformers):
+    with pytest.raises(ValueError, match='同じ数'):
+        core.plan_pairs(objects, deformers, core.PAIRING_INDEX)
@@ -0,0 +1,56 @@
+"""レシピの名前の解決 (SceneLookup / plan_recipe) のテスト。"""
+import FT_object_deformer_core as core
+
+
+NODES = [
+    '|rig|geo_0', '|rig|geo_1', '|old:rig|old:body', '|ns:grp|ns:arm',
+    '|a|dup', '|b|dup', 'cluster1',
+]
+
+
+def test_scene_lookup_resolves_names():
+    lookup = core.SceneLookup(NODES)
+    resolved, missing, ambiguous = lookup.resolve([
+        '|rig|geo_0', 'geo_1', 'rig|geo_0', 'body', 'other:arm',
+        'grp|arm', 'dup', 'a|dup', 'cluster1', 'nothing',
+    ])
+    assert resolved == {
+        '|rig|geo_0': '|rig|geo_0',
+        'geo_1': '|rig|geo_1',
+        'rig|geo_0': '|rig|geo_0',
+        'body': '|old:rig|old:body',
+        'other:arm': '|ns:grp|ns:arm',
+        'grp|arm': '|ns:grp|ns:arm',
+        'a|dup': '|a|dup',
+        'cluster1': 'cluster1',
+    }
+    assert missing == ['nothing']
+    assert ambiguous == ['dup']
+
+
+def test_scene_lookup_scans_the_scene_once(fake_cmds):
+    fake_cmds.create('rig', 'transform')
+    fake_cmds.create('geo_0', 'transform', 'rig')
+    fake_cmds.reset_calls()
+    lookup = core.SceneLookup()
+    lookup.resolve(['geo_0', 'rig', 'missing'])
+    assert fake_cmds.calls == {'ls': 1}
+    assert len(lookup) == 2
+
+
+def test_plan_recipe_pairs_on_saved_names():
+    recipe = {
+        'targets': ['old:L_arm.vtx[0:3]', 'old:R_arm', 'old:gone'],
+        'deformers': ['old:L_bend', 'old:R_bend'],
+        'pairing': {'mode': core.PAIRING_RULES,
+                    'rules': ['old:L_* -> old:L_*', 'old:R_* -> old:R_*',
+                              'old:gone -> old:R_*']},
+    }
+    lookup = core.SceneLookup(
+        ['|new:L_arm', '|new:R_arm', 'new:L_bend', 'new:R_bend'])
+    plan, unresolved = core.plan_recipe(recipe, lookup)
+    assert plan == [
+        ('new:L_bend', [core.ComponentTarget('|new:L_arm', 'vtx', [(0, 3)])]),
+        ('new:R_bend', ['|new:R_arm']),
+    ]
+    assert unresolved == [('old:R_bend', 'old:gone', "シーンに見つかりません")]
@@ -0,0 +1,21 @@
+"""付け替え (iter_swap_plan / run_swap) のテスト。"""
+import FT_object_deformer_bench as bench
+import FT_object_deformer_core as core
+
+
+def test_swap_progress_counts_only_pairs_that_move(fake_cmds):
+    objects, deformers, _ = bench.build_scene(fake_cmds, 10, 3)
+    # 前半だけが元のデフォーマーに接続されている (後半は付け替え済み)
+    core.apply_deformers(objects[:5], deformers[:1])
+    core.apply_deformers(objects[5:], deformers[1:2])
+    plan = core.plan_pairs(objects, [deformers[0], deformers[2]])
+    result = core.new_apply_result()
+    steps = list(core.iter_swap_plan(
+        plan, {deformers[0]: deformers[1]}, result, chunk_size=4))
+    # 付け替えの対象でない deformers[2] のペアは総数に含めない
+    assert steps[0][1] == 20
+    assert steps[-1] == (15, 15)
+    assert all(done <= total for done, total in steps)
+    assert result['removed'] == 5
+    assert result['absent'] == 5
+    assert result['created'] == 5
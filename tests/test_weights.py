@@ -0,0 +1,41 @@
+"""ウェイトの初期化 (FT_object_deformer_weights) のテスト。
+
+NumPy を使わない部分だけを対象にする。
+"""
+import FT_object_deformer_core as core
+import FT_object_deformer_weights as weights
+
+
+def test_point_components_use_their_indices(fake_cmds):
+    target = core.ComponentTarget('geo', 'vtx', [(0, 9), (20, 29)])
+    assert weights.component_ranges(target) == [(0, 9), (20, 29)]
+    assert 'polyListComponentConversion' not in fake_cmds.calls
+
+
+def test_faces_are_converted_to_vertices(fake_cmds, monkeypatch):
+    requested = []
+
+    def convert(components, toVertex=False):
+        requested.append((components, toVertex))
+        return ['geoShape.vtx[0:3]', 'geoShape.vtx[8:11]', 'geoShape.vtx[4]']
+    monkeypatch.setattr(fake_cmds, 'polyListComponentConversion', convert,
+                        raising=False)
+    target = core.ComponentTarget('geo', 'f', [(0, 0), (2, 2)])
+    assert weights.component_ranges(target) == [(0, 4), (8, 11)]
+    assert requested == [(['geo.f[0]', 'geo.f[2]'], True)]
+
+
+def test_point_count_does_not_read_positions(fake_cmds, monkeypatch):
+    calls = []
+    monkeypatch.setattr(fake_cmds, 'objectType',
+                        lambda node, isAType=None: isAType == 'mesh'
+                        and node == 'geoShape', raising=False)
+    monkeypatch.setattr(fake_cmds, 'polyEvaluate',
+                        lambda shape, vertex=False: calls.append(shape) or 482,
+                        raising=False)
+    monkeypatch.setattr(fake_cmds, 'getAttr',
+                        lambda plug, size=False: calls.append(plug) or 16,
+                        raising=False)
+    assert weights.point_count('geoShape') == 482
+    assert weights.point_count('curveShape') == 16
+    assert calls == ['geoShape', 'curveShape.cp']